@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Compare :class:`tkfilebrowser.constants.DateFormatter` with the babel
+formatting previously made for each modification date.
+
+Usage: python benchmarks/bench_dates.py [nb_dates]
+"""
+
+import sys
+from datetime import datetime
+from time import time
+from timeit import default_timer
+
+from babel.dates import format_date, format_datetime
+from tkfilebrowser import constants as cst
+
+
+def old_format(mtime):
+    tps = datetime.fromtimestamp(mtime)
+    date = format_date(tps, 'short', locale=cst.LANG)
+    if date == cst.TODAY:
+        date = cst._("Today") + tps.strftime(" %H:%M")
+    elif tps.year == cst.YEAR and (cst.DAY - int(tps.strftime("%j"))) < 7:
+        date = format_datetime(tps, 'EEEE HH:mm', locale=cst.LANG)
+    return date
+
+
+if __name__ == '__main__':
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    now = time()
+    # spread over two years
+    mtimes = [now - (i * 7919) % (730 * 86400) for i in range(nb)]
+    t0 = default_timer()
+    old = [old_format(mtime) for mtime in mtimes]
+    t1 = default_timer()
+    new = cst.DateFormatter().format_many(mtimes)
+    t2 = default_timer()
+    assert old == new
+    print('babel        %8.1f ms' % (1000 * (t1 - t0)))
+    print('format_many  %8.1f ms' % (1000 * (t2 - t1)))
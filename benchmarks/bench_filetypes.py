@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Compare :class:`tkfilebrowser.filetypes.FiletypeMatcher` with the regexp
+search previously made for each file name.
+
+Usage: python benchmarks/bench_filetypes.py [nb_names]
+"""
+
+import sys
+from re import search
+from timeit import default_timer
+
+from tkfilebrowser.filetypes import FiletypeMatcher
+
+
+PATTERN = "*.png|*.jpg|*.JPG|*.gif"
+
+
+if __name__ == '__main__':
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    exts = ['.png', '.txt', '.jpg', '.py', '.tar.gz', '']
+    names = ['file%i%s' % (i, exts[i % len(exts)]) for i in range(nb)]
+    regex = r'%s$' % PATTERN.replace('.', r'\.').replace('*', '.*')
+    t0 = default_timer()
+    old = [search(regex, name) is not None for name in names]
+    t1 = default_timer()
+    matcher = FiletypeMatcher(PATTERN)
+    new = matcher.match_many(names)
+    t2 = default_timer()
+    assert old == new
+    print('re.search    %8.1f ms' % (1000 * (t1 - t0)))
+    print('match_many   %8.1f ms' % (1000 * (t2 - t1)))
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the number of rows inserted per second in a ttk.Treeview with one
+Tcl call per row and with :func:`tkfilebrowser.bulk.insert_rows`.
+
+Usage: python benchmarks/bench_insert.py [nb_rows]
+"""
+
+import sys
+from timeit import default_timer
+
+from tkfilebrowser.constants import tk, ttk
+from tkfilebrowser import bulk
+
+
+def make_rows(nb):
+    return [('/tmp/file%i' % i, 'file%i' % i, ('file', str(i % 2)),
+             ('', '%i B' % i, '12:00')) for i in range(nb)]
+
+
+def per_row(tree, rows):
+    for iid, text, tags, values in rows:
+        tree.insert('', 'end', iid, text=text, tags=tags, values=values)
+
+
+def run(tree, func, rows):
+    tree.delete(*tree.get_children(''))
+    tree.update_idletasks()
+    t0 = default_timer()
+    func(tree, rows)
+    tree.update_idletasks()
+    return len(rows) / (default_timer() - t0)
+
+
+if __name__ == '__main__':
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    root = tk.Tk()
+    tree = ttk.Treeview(root, columns=('location', 'size', 'date'))
+    tree.pack()
+    rows = make_rows(nb)
+    print('%i rows' % nb)
+    print('per row insert: %10.0f rows/s' % run(tree, per_row, rows))
+    print('bulk insert:    %10.0f rows/s' % run(tree, bulk.insert_rows, rows))
+    root.destroy()
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the folder enumeration backends of :mod:`tkfilebrowser.model`
+(no display needed).
+
+Usage: python benchmarks/bench_listing.py [folder]
+"""
+
+import sys
+from os.path import expanduser
+from timeit import default_timer
+
+from tkfilebrowser.model import BACKENDS
+
+
+if __name__ == '__main__':
+    folder = sys.argv[1] if len(sys.argv) > 1 else expanduser('~')
+    for name, backend in sorted(BACKENDS.items()):
+        t0 = default_timer()
+        nb = len(list(backend(folder)))
+        t = default_timer() - t0
+        print('%-8s %8i entries %10.0f entries/s' % (name, nb, nb / t))
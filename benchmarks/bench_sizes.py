@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Compare :class:`tkfilebrowser.constants.SizeFormatter` with the babel
+formatting previously made for each file size.
+
+Usage: python benchmarks/bench_sizes.py [nb_sizes]
+"""
+
+import sys
+from math import log, floor
+from random import Random
+from timeit import default_timer
+
+from babel.numbers import format_number
+from tkfilebrowser import constants as cst
+
+
+def old_display_size(size_o):
+    if size_o > 0:
+        m = int(floor(log(size_o) / log(1024)))
+        if m < len(cst.SIZES):
+            unit = cst.SIZES[m]
+            s = size_o / (1024 ** m)
+        else:
+            unit = cst.SIZES[-1]
+            s = size_o / (1024**(len(cst.SIZES) - 1))
+        size = "%s %s" % (format_number("%.1f" % s, locale=cst.LANG), unit)
+    else:
+        size = "0 " + cst._("B")
+    return size
+
+
+if __name__ == '__main__':
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rand = Random(0)
+    # log-uniform sizes up to 100 GB
+    sizes = [int(10 ** rand.uniform(0, 11)) for i in range(nb)]
+    t0 = default_timer()
+    old = [old_display_size(size) for size in sizes]
+    t1 = default_timer()
+    formatter = cst.SizeFormatter()
+    new = [formatter(size) for size in sizes]
+    t2 = default_timer()
+    formatter.clear()
+    batch = formatter.format_many(sizes)
+    t3 = default_timer()
+    assert old == new == batch
+    print('babel        %8.1f ms' % (1000 * (t1 - t0)))
+    print('__call__     %8.1f ms' % (1000 * (t2 - t1)))
+    print('format_many  %8.1f ms%s' % (1000 * (t3 - t2),
+                                       '' if cst._numpy() is not None else ' (without numpy)'))
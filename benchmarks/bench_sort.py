@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Time the sort engine of :class:`tkfilebrowser.model.DirectoryModel` on a
+synthetic folder (no display needed).
+
+Usage: python benchmarks/bench_sort.py [nb_entries]
+"""
+
+import sys
+from timeit import default_timer
+
+from tkfilebrowser.model import DirectoryModel, Entry
+
+
+if __name__ == '__main__':
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    model = DirectoryModel()
+    model.clear('/tmp')
+    model.extend(Entry('file%i' % i, 'file', (i * 7919) % nb, (i * 104729) % nb)
+                 for i in range(nb))
+    model.rows()
+    for key in ('name', 'size', 'date'):
+        for reverse in (False, True):
+            t0 = default_timer()
+            model.sort(key, reverse)
+            print('%-4s reverse=%-5s %8.1f ms' % (key, reverse,
+                                                  1000 * (default_timer() - t0)))
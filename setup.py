@@ -37,14 +37,28 @@ setup(name='tkfilebrowser',
                    'Operating System :: POSIX :: Linux',
                    'Operating System :: Microsoft :: Windows'],
       py_modules=["tkfilebrowser.autoscrollbar",
+                  "tkfilebrowser.bulk",
+                  "tkfilebrowser.cache",
+                  "tkfilebrowser.columns",
                   "tkfilebrowser.constants",
+                  "tkfilebrowser.diskcache",
                   "tkfilebrowser.filebrowser",
+                  "tkfilebrowser.filetypes",
                   "tkfilebrowser.functions",
+                  "tkfilebrowser.icons",
+                  "tkfilebrowser.model",
                   "tkfilebrowser.path_button",
+                  "tkfilebrowser.prefetch",
                   "tkfilebrowser.recent_files",
-                  "tkfilebrowser.tooltip"],
+                  "tkfilebrowser.registry",
+                  "tkfilebrowser.scanner",
+                  "tkfilebrowser.statpool",
+                  "tkfilebrowser.styles",
+                  "tkfilebrowser.tooltip",
+                  "tkfilebrowser.virtual_tree",
+                  "tkfilebrowser.watcher"],
       keywords=['tkinter', 'filedialog', 'filebrowser'],
       packages=["tkfilebrowser"],
       package_data={"tkfilebrowser": ["images/*"]},
       install_requires=["psutil", "babel"] + (['pypiwin32'] if name == 'nt' else []),
-      extras_require={'tk<8.6.0': 'Pillow'})
+      extras_require={'tk<8.6.0': 'Pillow', 'numpy': 'numpy'})
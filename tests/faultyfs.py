@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Local stand-in for a slow or unreachable network file system."""
+
+from tkfilebrowser.model import BACKENDS, DEFAULT_BACKEND, stat_item
+from threading import Event
+from errno import errorcode
+import time
+import os
+
+
+class FaultyFS:
+    """
+    Wrap the local file system and inject faults in the calls.
+
+    Options:
+        * delays: {name: seconds} calls on name are delayed
+        * hang: names whose calls block until :meth:`release` is called
+        * errors: {name: errno} calls on name raise OSError(errno)
+    """
+    def __init__(self, delays=None, hang=(), errors=None):
+        self.delays = dict(delays or {})
+        self.hang = set(hang)
+        self.errors = dict(errors or {})
+        self.calls = []
+        self._released = Event()
+
+    def release(self):
+        """Unblock the hanging calls."""
+        self._released.set()
+
+    def _fault(self, path):
+        name = os.path.basename(path)
+        self.calls.append(name)
+        if name in self.hang:
+            self._released.wait()
+        if name in self.delays:
+            time.sleep(self.delays[name])
+        if name in self.errors:
+            errno = self.errors[name]
+            raise OSError(errno, errorcode.get(errno, 'error'), path)
+
+    def stat(self, path):
+        self._fault(path)
+        return os.stat(path)
+
+    def stat_item(self, path):
+        self._fault(path)
+        return stat_item(path)
+
+    def backend(self, folder, cancel=None):
+        """Enumeration backend, see :func:`tkfilebrowser.model.get_backend`."""
+        self._fault(folder)
+        return BACKENDS[DEFAULT_BACKEND](folder, cancel)
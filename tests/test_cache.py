@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.cache import ListingCache
+from tkfilebrowser.model import Entry
+from tkfilebrowser.constants import DATE_FORMATTER
+import unittest
+import time
+
+
+def listing(n):
+    return tuple(Entry('file%i' % i, 'file', i, 0, '%i B' % i, 'Today')
+                 for i in range(n))
+
+
+class TestListingCache(unittest.TestCase):
+    def test_lru(self):
+        cache = ListingCache(maxentries=10)
+        cache.put((0, 1, 0), listing(4))
+        cache.put((0, 2, 0), listing(4))
+        self.assertEqual(cache.nb_entries, 8)
+        self.assertEqual(cache.get((0, 1, 0)), listing(4))
+        cache.put((0, 3, 0), listing(4))
+        # (0, 2, 0) is the least recently used
+        self.assertIsNone(cache.get((0, 2, 0)))
+        self.assertEqual(cache.get((0, 1, 0)), listing(4))
+        self.assertEqual(cache.get((0, 3, 0)), listing(4))
+        self.assertEqual(cache.nb_entries, 8)
+        # replace listing
+        cache.put((0, 3, 0), listing(2))
+        self.assertEqual(cache.nb_entries, 6)
+        # too large
+        cache.put((0, 4, 0), listing(11))
+        self.assertIsNone(cache.get((0, 4, 0)))
+        self.assertEqual(len(cache), 2)
+        # budget change
+        cache.resize(maxentries=3)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get((0, 3, 0)), listing(2))
+        cache.clear()
+        self.assertEqual((len(cache), cache.nb_entries, cache.nb_bytes), (0, 0, 0))
+
+    def test_bytes_budget(self):
+        size = ListingCache.estimate_size(listing(10))
+        cache = ListingCache(maxbytes=2 * size)
+        for i in range(3):
+            cache.put((0, i, 0), listing(10))
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.nb_bytes, 2 * size)
+        self.assertIsNone(cache.get((0, 0, 0)))
+
+    def test_racy(self):
+        cache = ListingCache()
+        cache.put((0, 1, int(time.time() * 1e9)), listing(2))
+        self.assertIsNone(cache.get((0, 1, int(time.time() * 1e9))))
+
+    def test_day(self):
+        # the formatted dates of the listings are only valid during the day
+        now = [time.time()]
+        clock = DATE_FORMATTER.clock
+        DATE_FORMATTER.clock = lambda: now[0]
+        DATE_FORMATTER.clear()
+        try:
+            cache = ListingCache()
+            cache.put((0, 1, 0), listing(2))
+            self.assertEqual(cache.get((0, 1, 0)), listing(2))
+            now[0] += 2 * 86400
+            self.assertIsNone(cache.get((0, 1, 0)))
+            self.assertEqual((len(cache), cache.nb_entries, cache.nb_bytes), (0, 0, 0))
+        finally:
+            DATE_FORMATTER.clock = clock
+            DATE_FORMATTER.clear()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser import columns
+from tkfilebrowser.columns import ColumnStore, FOLDER, LINK, HIDDEN, BROKEN, \
+    FILTERED, flags_tag
+from tkfilebrowser.model import Entry
+import unittest
+
+
+ENTRIES = [Entry('.config', 'folder', 0, 2.5),
+           Entry('docs', 'folder_link', 0, 1),
+           Entry('broken', 'link_broken', -1, -1, '??', '??'),
+           Entry('a.txt', 'file', 10, 3),
+           Entry('Archive.zip', 'file_link', 20, 4)]
+
+
+class TestColumnStore(unittest.TestCase):
+    def test_store(self):
+        store = ColumnStore(ENTRIES[:2])
+        self.assertEqual(store.index('docs'), 1)
+        store.extend(ENTRIES[2:])
+        self.assertEqual(len(store), 5)
+        self.assertEqual(store.index('a.txt'), 3)
+        self.assertEqual(list(store.sizes), [0, 0, -1, 10, 20])
+        self.assertEqual(list(store.mtimes), [2500000000, 1000000000, -1,
+                                              3000000000, 4000000000])
+        self.assertEqual(list(store.flags), [FOLDER | HIDDEN, FOLDER | LINK,
+                                             LINK | BROKEN, 0, LINK])
+        self.assertEqual([store.tag(i) for i in range(5)],
+                         [e.tag for e in ENTRIES])
+        self.assertEqual(store.get('a.txt'), 0)
+        self.assertIsNone(store.get('missing'))
+        self.assertGreater(store.nbytes(), 0)
+        store.clear()
+        self.assertEqual(len(store), 0)
+        self.assertIsNone(store.get('a.txt'))
+
+    def test_select(self):
+        store = ColumnStore(ENTRIES)
+        self.assertEqual(store.select(FOLDER), [0, 1])
+        self.assertEqual(store.select(FOLDER | BROKEN, 0), [3, 4])
+        self.assertEqual(store.select(FOLDER, exclude=HIDDEN), [1])
+        store.set_flag(FILTERED, [3])
+        self.assertEqual(store.select(FOLDER | BROKEN, 0, FILTERED), [4])
+        store.set_flag(FILTERED, [3], False)
+        self.assertEqual(store.flags[3], 0)
+        self.assertEqual(store.startswith('A'), [3, 4])
+        self.assertEqual(store.startswith('a', [0, 4]), [4])
+        self.assertEqual(flags_tag(FOLDER | LINK), 'folder_link')
+
+    def test_sort(self):
+        store = ColumnStore(ENTRIES)
+        self.assertEqual(store.sort([0, 1, 3, 4], "mtimes"), [1, 0, 3, 4])
+        self.assertEqual(store.sort([0, 1, 3, 4], "sizes", True), [4, 3, 0, 1])
+        self.assertEqual(store.sort([0, 1, 3, 4], "names"), [0, 4, 3, 1])
+
+    @unittest.skipIf(columns.numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        threshold = columns.NUMPY_THRESHOLD
+        columns.NUMPY_THRESHOLD = 2
+        try:
+            store = ColumnStore(ENTRIES)
+            self.assertEqual(store.select(FOLDER | BROKEN, 0), [3, 4])
+            self.assertEqual(store.select(FOLDER, exclude=HIDDEN), [1])
+            self.assertEqual(store.sort([0, 1, 3, 4], "mtimes", True), [4, 3, 0, 1])
+        finally:
+            columns.NUMPY_THRESHOLD = threshold
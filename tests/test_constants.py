@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser import constants as cst
+from tkfilebrowser.constants import DateFormatter, SizeFormatter
+from babel.dates import format_date, format_datetime
+from babel.numbers import format_number
+from datetime import datetime, timedelta
+from math import log, floor
+import unittest
+import time
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+
+def reference_date(mtime, now=None):
+    """Modification date formatted with babel for each call."""
+    now = datetime.fromtimestamp(time.time() if now is None else now)
+    tps = datetime.fromtimestamp(mtime)
+    date = format_date(tps, 'short', locale=cst.LANG)
+    if date == format_date(now, 'short', locale=cst.LANG):
+        return cst._("Today") + tps.strftime(" %H:%M")
+    elif tps.year == now.year and (int(now.strftime("%j")) - int(tps.strftime("%j"))) < 7:
+        return format_datetime(tps, 'EEEE HH:mm', locale=cst.LANG)
+    return date
+
+
+def sample_mtimes(now):
+    return [now, now - 3600, now - 86400, now - 3 * 86400 + 61, now - 6 * 86400,
+            now - 7 * 86400, now - 8 * 86400, now - 400 * 86400, now + 86400, 0]
+
+
+def reference_size(size):
+    """Size formatted with babel for each call."""
+    if size <= 0:
+        return "0 " + cst._("B")
+    m = min(int(floor(log(size) / log(1024))), len(cst.SIZES) - 1)
+    s = size / float(1024 ** m)
+    return "%s %s" % (format_number("%.1f" % s, locale=cst.LANG), cst.SIZES[m])
+
+
+class TestSizeFormatter(unittest.TestCase):
+    sizes = [0, -1, 1, 10, 1023, 1024, 1075, 1126, 1280, 1331, 10 ** 6,
+             1024 ** 2 - 1, 1024 ** 2, 5 * 1024 ** 3 + 7, 3 * 1024 ** 4,
+             2000 * 1024 ** 4, 123456789]
+
+    def test_format(self):
+        formatter = SizeFormatter()
+        for size in self.sizes:
+            self.assertEqual(formatter(size), reference_size(size))
+        self.assertEqual(formatter("??"), "??")
+        self.assertEqual(formatter.format_many(self.sizes + [""]),
+                         [reference_size(size) for size in self.sizes] + [""])
+
+    @unittest.skipIf(cst._numpy() is None, "numpy is not installed")
+    def test_format_array(self):
+        sizes = self.sizes * 10 + list(range(0, 10 ** 7, 9973))
+        self.assertEqual(SizeFormatter().format_many(sizes),
+                         [reference_size(size) for size in sizes])
+
+
+class TestDateFormatter(unittest.TestCase):
+    def test_format(self):
+        now = time.time()
+        mtimes = sample_mtimes(now)
+        formatter = DateFormatter()
+        for mtime in mtimes:
+            self.assertEqual(formatter(mtime), reference_date(mtime))
+        self.assertEqual(formatter.format_many(mtimes + ["??"]),
+                         [reference_date(mtime) for mtime in mtimes] + ["??"])
+        self.assertEqual(formatter("??"), "??")
+        self.assertEqual(cst.display_modification_dates(mtimes),
+                         [cst.display_modification_date(m) for m in mtimes])
+
+    def test_memo(self):
+        formatter = DateFormatter()
+        formatter.maxdays = 3
+        for i in range(5):
+            formatter(i * 86400 * 30)
+        self.assertLessEqual(len(formatter._days), 3)
+        formatter.clear()
+        self.assertEqual(len(formatter._days), 0)
+
+    def test_rollover(self):
+        clock = [time.mktime((2024, 12, 31, 23, 59, 0, 0, 0, -1))]
+        formatter = DateFormatter(clock=lambda: clock[0])
+        mtime = clock[0] - 60
+        self.assertEqual(formatter(mtime), reference_date(mtime, clock[0]))
+        self.assertTrue(formatter(mtime).startswith(cst._("Today")))
+        self.assertEqual(formatter.current_day(),
+                         format_date(datetime.fromtimestamp(clock[0]), 'short', locale=cst.LANG))
+        # new day, new year
+        for day in range(1, 10):
+            clock[0] = time.mktime((2025, 1, day, 0, 1, 0, 0, 0, -1))
+            mtimes = sample_mtimes(clock[0]) + [mtime]
+            self.assertEqual(formatter.format_many(mtimes),
+                             [reference_date(m, clock[0]) for m in mtimes])
+            self.assertEqual(formatter.current_day(),
+                             format_date(datetime.fromtimestamp(clock[0]), 'short', locale=cst.LANG))
+
+    @unittest.skipIf(not hasattr(time, 'tzset'), "time.tzset is not available")
+    def test_dst(self):
+        tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'Europe/Paris'
+        time.tzset()
+        try:
+            # daylight saving time starts on 2025-03-30 at 2:00
+            now = time.mktime((2025, 3, 31, 12, 0, 0, 0, 0, -1))
+            formatter = DateFormatter(clock=lambda: now)
+            mtimes = sample_mtimes(now) + [now - 86400 + 3600 * i for i in range(-12, 12)]
+            self.assertEqual(formatter.format_many(mtimes),
+                             [reference_date(m, now) for m in mtimes])
+        finally:
+            if tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = tz
+            time.tzset()
+
+
+
+class TestBuiltinLocales(unittest.TestCase):
+    def test_babel(self):
+        lang = cst.LANG
+        day = datetime(2024, 1, 1, 9, 5)
+        try:
+            for cst.LANG in cst.BUILTIN_LOCALES:
+                for i in range(0, 800, 3):
+                    date = day + timedelta(days=i, minutes=7 * i)
+                    self.assertEqual(cst.locale_date(date),
+                                     format_date(date, 'short', locale=cst.LANG))
+                    self.assertEqual(cst.locale_datetime(date),
+                                     format_datetime(date, 'EEEE HH:mm', locale=cst.LANG))
+                for nb in ["0.0", "12.0", "12.3", "1023.9", "1024.0", "-5.5",
+                           "123456.7", "1234567", 0.125]:
+                    self.assertEqual(cst.locale_number(nb),
+                                     format_number(nb, locale=cst.LANG))
+        finally:
+            cst.LANG = lang
+
+    def test_lazy_settings(self):
+        self.assertEqual(cst.YEAR, datetime.now().year)
+        self.assertEqual(cst.DAY, int(time.strftime("%j")))
+        self.assertEqual(cst.TODAY, cst.locale_date())
+        with self.assertRaises(AttributeError):
+            cst.UNKNOWN
+
+
+
+class TestImport(unittest.TestCase):
+    def test_import(self):
+        """Importing the package is lazy and does not write files."""
+        home = tempfile.mkdtemp()
+        env = dict(os.environ, HOME=home, USERPROFILE=home)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join([root, env.get('PYTHONPATH', '')])
+        code = ("import sys, tkfilebrowser; "
+                "from tkfilebrowser import askopenfilename; "
+                "print(sorted(m for m in ('tkfilebrowser.filebrowser', 'babel', 'psutil', "
+                "'tkinter', 'Tkinter', 'subprocess') if m in sys.modules))")
+        try:
+            out = subprocess.check_output([sys.executable, '-c', code], env=env)
+            if sys.version_info >= (3, 7):
+                self.assertEqual(out.decode().strip(), '[]')
+            self.assertEqual(os.listdir(home), [])
+        finally:
+            shutil.rmtree(home)
+
+
+if __name__ == '__main__':
+    unittest.main()
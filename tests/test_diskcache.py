@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.cache import ListingCache, folder_key
+from tkfilebrowser.diskcache import DiskCache, dumps, loads
+from tkfilebrowser.model import Entry, list_folder, backend_name
+import unittest
+import tempfile
+import shutil
+import time
+import os
+
+
+def listing(n):
+    return tuple(Entry(u'fïle%i' % i, 'file', i, 1000. + i, '%i B' % i, 'Today')
+                 for i in range(n))
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'listings')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_format(self):
+        entries = listing(3) + (Entry('d', 'folder'),
+                                Entry('l', 'link_broken', -1, -1),
+                                Entry('p', 'file_link', None, None, u'…', u'…'))
+        data = dumps('/folder', (1, 2, 3), entries)
+        self.assertEqual(loads(data, '/folder', (1, 2, 3)), entries)
+        self.assertEqual(loads(dumps('/folder', (1, 2, 3), ()), '/folder', (1, 2, 3)), ())
+        # invalid
+        self.assertIsNone(loads(data, '/folder', (1, 2, 4)))
+        self.assertIsNone(loads(data, '/other', (1, 2, 3)))
+        self.assertIsNone(loads(data[:-1], '/folder', (1, 2, 3)))
+        self.assertIsNone(loads(data[:10]))
+        self.assertIsNone(loads(b'x' * len(data)))
+
+    def test_put_get(self):
+        cache = DiskCache(self.path, min_entries=10)
+        key = (1, 2, 3)
+        # too small and fast
+        self.assertFalse(cache.put('/folder', key, listing(3)))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(cache.get('/folder', key))
+        # slow
+        self.assertTrue(cache.put('/folder', key, listing(3), cost=1))
+        self.assertEqual(cache.get('/folder', key), listing(3))
+        # large, replaces the previous listing
+        self.assertTrue(cache.put('/folder', key, listing(10)))
+        self.assertEqual(cache.get('/folder', key), listing(10))
+        self.assertEqual(len(cache.files()), 1)
+        # folder modified
+        self.assertIsNone(cache.get('/folder', (1, 2, 4)))
+        # corrupted file
+        with open(cache.files()[0][2], 'r+b') as f:
+            f.truncate(20)
+        self.assertIsNone(cache.get('/folder', key))
+        cache.clear()
+        self.assertEqual(cache.files(), [])
+
+    def test_evict(self):
+        cache = DiskCache(self.path, min_entries=0)
+        cache.put('/a', (1, 1, 0), listing(100))
+        size = cache.files()[0][1]
+        cache.maxbytes = 2 * size
+        cache.put('/b', (1, 2, 0), listing(100))
+        # make /a the most recently used
+        t = time.time()
+        os.utime(cache._file((1, 2, 0)), (t - 10, t - 10))
+        self.assertEqual(cache.get('/a', (1, 1, 0)), listing(100))
+        cache.put('/c', (1, 3, 0), listing(100))
+        self.assertEqual(len(cache.files()), 2)
+        self.assertIsNone(cache.get('/b', (1, 2, 0)))
+        self.assertIsNotNone(cache.get('/a', (1, 1, 0)))
+        self.assertIsNotNone(cache.get('/c', (1, 3, 0)))
+
+    def test_listing_cache(self):
+        folder = os.path.join(self.tmpdir, 'folder')
+        os.mkdir(folder)
+        for i in range(5):
+            open(os.path.join(folder, 'f%i' % i), 'w').close()
+        t = time.time() - 10
+        os.utime(folder, (t, t))
+        disk = DiskCache(self.path, min_entries=5)
+        entries = list_folder(folder, ListingCache(disk=disk))
+        self.assertEqual(len(disk.files()), 1)
+        # new process: empty memory cache
+        cache = ListingCache(disk=disk)
+        key, cached = cache.lookup(folder, backend_name())
+        self.assertEqual(key, folder_key(folder) + (backend_name(),))
+        self.assertEqual(cached, entries)
+        self.assertEqual(len(cache), 1)
+        # the folder changed
+        open(os.path.join(folder, 'f5'), 'w').close()
+        os.utime(folder, (t + 1, t + 1))
+        self.assertIsNone(ListingCache(disk=disk).lookup(folder, backend_name())[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
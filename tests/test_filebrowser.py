@@ -5,6 +5,9 @@ try:
 except ImportError:
     from tkinter import ttk
 import os
+import shutil
+import tempfile
+import time
 from pynput.keyboard import Key, Controller
 
 
@@ -506,3 +509,299 @@ class TestFileBrowser(BaseWidgetTest):
             self.window.update()
             self.assertEqual(fb.entry.get(),
                              ch[0], 'text')
+
+    def test_filebrowser_background_scan(self):
+        path = os.path.expanduser('~')
+        fb = FileBrowser(self.window, initialdir=path, mode="openpath")
+        self.window.update()
+        items = fb.right_tree.get_children('')
+        fb = FileBrowser(self.window, initialdir=path, mode="openpath",
+                         background_scan=True)
+        while fb._scanner is not None:
+            self.window.update()
+        self.assertEqual(fb.right_tree.get_children(''), items)
+        # navigating away during the scan
+        fb.display_folder('/')
+        scanner = fb._scanner
+        fb.display_folder(path)
+        self.assertTrue(scanner.cancelled())
+        self.assertEqual(fb._scanner.generation, fb._generation)
+        fb.left_tree.selection_clear()
+        fb.left_tree.selection_set('recent')
+        self.window.update()
+        self.assertIsNone(fb._scanner)
+
+    def test_filebrowser_virtual_list(self):
+        path = os.path.expanduser('~')
+        fb = FileBrowser(self.window, initialdir=path, mode="openpath")
+        self.window.update()
+        items = fb.right_tree.get_children('')
+        fb = FileBrowser(self.window, initialdir=path, mode="openpath",
+                         virtual_list=True)
+        self.window.update()
+        self.assertEqual(fb.right_tree.get_children(''), items)
+        # only the visible rows exist in Tk
+        shown = ttk.Treeview.get_children(fb.right_tree, '')
+        self.assertLessEqual(len(shown), len(items))
+        self.assertEqual(shown, items[:len(shown)])
+        if items:
+            fb.right_tree.see(items[-1])
+            self.window.update()
+            shown = ttk.Treeview.get_children(fb.right_tree, '')
+            self.assertEqual(shown[-1], items[-1])
+            fb.right_tree.selection_set(items[0], items[-1])
+            self.window.update()
+            self.assertEqual(fb.right_tree.selection(), (items[0], items[-1]))
+        fb.toggle_hidden()
+        self.window.update()
+        self.assertEqual(fb.right_tree.tag_has('hidden'), ())
+        fb.toggle_hidden()
+        self.window.update()
+        self.assertEqual(set(fb.right_tree.get_children('')), set(items))
+        fb._sort_files_by_name(True)
+        self.window.update()
+        self.assertEqual(set(fb.right_tree.get_children('')), set(items))
+
+    def test_filebrowser_lazy_stat(self):
+        path = os.path.expanduser('~')
+        fb = FileBrowser(self.window, initialdir=path, mode="openpath")
+        self.window.update()
+        items = fb.right_tree.get_children('')
+        values = [fb.right_tree.item(i, 'values') for i in items]
+        fb = FileBrowser(self.window, initialdir=path, mode="openpath",
+                         lazy_stat=True)
+        self.window.update()
+        self.assertEqual(fb.right_tree.get_children(''), items)
+        # the visible rows are stat'ed in the background
+        visible = fb._visible_items()
+        while fb._stat_calls or fb._stat_visible_id is not None:
+            self.window.update()
+        for item in visible:
+            self.assertEqual(fb.right_tree.item(item, 'values'),
+                             values[items.index(item)])
+        # sorting by size needs all the stats
+        fb._sort_by_size(False)
+        while fb._after_stats is not None:
+            self.window.update()
+        self.assertEqual(fb._model.pending_rows(fb.hide), [])
+
+    def test_filebrowser_live_refresh(self):
+        folder = tempfile.mkdtemp()
+        try:
+            for name in ['a.txt', 'b.txt']:
+                with open(os.path.join(folder, name), 'w') as f:
+                    f.write('test')
+            fb = FileBrowser(self.window, initialdir=folder, live_refresh=True)
+            self.window.update()
+            if fb._watcher is None:
+                self.skipTest('inotify is not available')
+            a_txt = os.path.join(folder, 'a.txt')
+            b_txt = os.path.join(folder, 'b.txt')
+            c_txt = os.path.join(folder, 'c.txt')
+            self.assertEqual(fb.right_tree.get_children(''), (a_txt, b_txt))
+            os.remove(a_txt)
+            with open(b_txt, 'w') as f:
+                f.write('modified')
+            with open(c_txt, 'w') as f:
+                f.write('test')
+            t0 = time.time()
+            while fb.right_tree.get_children('') != (b_txt, c_txt) and time.time() - t0 < 2:
+                self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''), (b_txt, c_txt))
+            self.assertEqual(fb.right_tree.item(b_txt, 'values')[1],
+                             fb._model.entries[1].size_str)
+            self.assertEqual(fb.right_tree.item(c_txt, 'tags'), ('file', '1'))
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_filebrowser_live_refresh_poll(self):
+        folder = tempfile.mkdtemp()
+        try:
+            a_txt = os.path.join(folder, 'a.txt')
+            b_txt = os.path.join(folder, 'b.txt')
+            with open(a_txt, 'w') as f:
+                f.write('test')
+            fb = FileBrowser(self.window, initialdir=folder, live_refresh="poll")
+            self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''), (a_txt,))
+            os.rename(a_txt, b_txt)
+            t0 = time.time()
+            while fb.right_tree.get_children('') != (b_txt,) and time.time() - t0 < 3:
+                self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''), (b_txt,))
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_filebrowser_redisplay(self):
+        folder = tempfile.mkdtemp()
+        try:
+            paths = [os.path.join(folder, name) for name in ['a.txt', 'b.txt', 'c.txt']]
+            for path in paths[::2]:
+                with open(path, 'w') as f:
+                    f.write('test')
+            fb = FileBrowser(self.window, initialdir=folder)
+            self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''), (paths[0], paths[2]))
+            fb.right_tree.selection_set(paths[2])
+            fb.right_tree.focus(paths[2])
+            with open(paths[1], 'w') as f:
+                f.write('test')
+            os.remove(paths[0])
+            fb.display_folder(folder, reset=False)
+            self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''), tuple(paths[1:]))
+            self.assertEqual(fb.right_tree.selection(), (paths[2],))
+            self.assertEqual(fb.right_tree.focus(), paths[2])
+            self.assertEqual([fb.right_tree.item(p, 'tags')[-1] for p in paths[1:]],
+                             ['0', '1'])
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_filebrowser_redisplay_background_scan(self):
+        folder = tempfile.mkdtemp()
+        try:
+            paths = [os.path.join(folder, name) for name in ['a.txt', 'b.txt', 'c.txt']]
+            for path in paths[::2]:
+                with open(path, 'w') as f:
+                    f.write('test')
+            fb = FileBrowser(self.window, initialdir=folder, background_scan=True)
+            while fb._scanner is not None:
+                self.window.update()
+            fb.right_tree.selection_set(paths[2])
+            with open(paths[1], 'w') as f:
+                f.write('test')
+            fb.display_folder(folder, reset=False)
+            # the rows are not removed during the scan
+            self.assertEqual(fb.right_tree.get_children(''), (paths[0], paths[2]))
+            while fb._scanner is not None:
+                self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''), tuple(paths))
+            self.assertEqual(fb.right_tree.selection(), (paths[2],))
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_filebrowser_redisplay_sorted(self):
+        folder = tempfile.mkdtemp()
+        try:
+            paths = [os.path.join(folder, name) for name in ['a.txt', 'b.txt', 'c.txt']]
+            for i, path in enumerate(paths):
+                with open(path, 'w') as f:
+                    f.write('test' * (i + 1))
+            fb = FileBrowser(self.window, initialdir=folder)
+            self.window.update()
+            fb._sort_by_size(True)
+            self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''), tuple(paths[::-1]))
+            big = os.path.join(folder, 'big.txt')
+            with open(big, 'w') as f:
+                f.write('test' * 10)
+            fb.display_folder(folder, reset=False)
+            self.window.update()
+            # the folder is still sorted by decreasing size
+            self.assertEqual(fb._model.sorting, ('size', True))
+            self.assertEqual(fb.right_tree.get_children(''),
+                             (big,) + tuple(paths[::-1]))
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_filebrowser_filetype(self):
+        folder = tempfile.mkdtemp()
+        try:
+            paths = [os.path.join(folder, name)
+                     for name in ['a.png', 'b.txt', 'c.PNG', 'dir']]
+            os.mkdir(paths[3])
+            for path in paths[:3]:
+                with open(path, 'w') as f:
+                    f.write('test')
+            fb = FileBrowser(self.window, initialdir=folder,
+                             filetypes=[("PNG", '*.png|*.PNG'), ('ALL', '*')])
+            self.window.update()
+            entries = fb._model.entries
+            self.assertEqual(fb.right_tree.get_children(''),
+                             (paths[3], paths[0], paths[2]))
+            fb.right_tree.selection_set(paths[0])
+            fb.filetype.set('ALL')
+            self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''),
+                             (paths[3], paths[0], paths[1], paths[2]))
+            self.assertEqual([fb.right_tree.item(p, 'tags')[-1] for p in paths[:3]],
+                             ['1', '0', '1'])
+            self.assertEqual(fb.right_tree.selection(), (paths[0],))
+            fb.filetype.set('PNG')
+            self.window.update()
+            self.assertEqual(fb.right_tree.get_children(''),
+                             (paths[3], paths[0], paths[2]))
+            self.assertTrue(fb.right_tree.exists(paths[1]))
+            # the folder was not listed again
+            self.assertIs(fb._model.entries, entries)
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_filebrowser_stripes(self):
+        folder = tempfile.mkdtemp()
+        try:
+            for i in range(300):
+                name = ('.h%03i' if i % 3 == 0 else 'f%03i') % i
+                with open(os.path.join(folder, name), 'w') as f:
+                    f.write('test')
+            fb = FileBrowser(self.window, initialdir=folder)
+            self.window.update()
+
+            def check_view():
+                items = fb._visible_items()
+                self.assertTrue(items)
+                start = fb.right_tree.index(items[0])
+                self.assertEqual([fb.right_tree.item(item, 'tags')[-1] for item in items],
+                                 [str((start + i) % 2) for i in range(len(items))])
+
+            fb.toggle_hidden()
+            self.window.update()
+            check_view()
+            fb.right_tree.yview_moveto(1)
+            self.window.update()
+            check_view()
+            fb.toggle_hidden()
+            fb._sort_files_by_name(True)
+            self.window.update()
+            check_view()
+            fb.right_tree.yview_moveto(0)
+            self.window.update()
+            check_view()
+            self.assertTrue(fb._stripes_dirty)
+            # the stripes are clean once all the rows have been in view
+            while fb.right_tree.yview()[1] < 1:
+                fb.right_tree.yview_scroll(1, 'units')
+                self.window.update()
+            check_view()
+            self.assertFalse(fb._stripes_dirty)
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_filebrowser_prefetch(self):
+        folder = tempfile.mkdtemp()
+        try:
+            sub = os.path.join(folder, 'sub')
+            os.mkdir(sub)
+            old = time.time() - 10
+            os.utime(sub, (old, old))
+            fb = FileBrowser(self.window, initialdir=folder, prefetch=100)
+            self.window.update()
+            self.assertIsNotNone(fb._prefetch_after_id)
+            t0 = time.time()
+            while sub not in fb._prefetcher.listed and time.time() - t0 < 3:
+                self.window.update()
+            self.assertIn(sub, fb._prefetcher.listed)
+            # navigation cancels the prefetching
+            fb._stop_scan()
+            self.assertIsNone(fb._prefetch_after_id)
+            self.assertIsNone(fb._prefetcher._cancel)
+            fb.destroy()
+        finally:
+            shutil.rmtree(folder)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.filetypes import FiletypeMatcher, ALL_FILES, get_matcher
+import unittest
+
+
+NAMES = ['a.png', 'b.PNG', 'c.jpg', 'archive.tar.gz', 'gz', '.png',
+         'a.png.txt', 'image_01.bmp', 'noext']
+
+
+class TestFiletypeMatcher(unittest.TestCase):
+    def test_suffixes(self):
+        matcher = FiletypeMatcher("*.png|*.jpg|*.tar.gz")
+        self.assertFalse(matcher.all)
+        self.assertEqual(matcher.extensions, ['.png', '.jpg', '.tar.gz'])
+        self.assertEqual([n for n in NAMES if matcher(n)],
+                         ['a.png', 'c.jpg', 'archive.tar.gz', '.png'])
+        self.assertEqual(matcher.match_many(NAMES), [matcher(n) for n in NAMES])
+
+    def test_ignorecase(self):
+        matcher = FiletypeMatcher("*.png|image_*", ignorecase=True)
+        self.assertEqual(matcher.extensions, ['.png'])
+        self.assertEqual([n for n in NAMES if matcher(n)],
+                         ['a.png', 'b.PNG', '.png', 'image_01.bmp'])
+        self.assertEqual(matcher.match_many(NAMES), [matcher(n) for n in NAMES])
+        self.assertFalse(FiletypeMatcher("image_*")('IMAGE_01.bmp'))
+
+    def test_all(self):
+        for pattern in ["*", "*.png|*"]:
+            matcher = FiletypeMatcher(pattern)
+            self.assertTrue(matcher.all)
+            self.assertEqual(matcher.match_many(NAMES), [True] * len(NAMES))
+        self.assertTrue(ALL_FILES('noext'))
+        matcher = FiletypeMatcher("*.*")
+        self.assertEqual([n for n in NAMES if not matcher(n)], ['gz', 'noext'])
+
+    def test_get_matcher(self):
+        self.assertIs(get_matcher(None), ALL_FILES)
+        matcher = FiletypeMatcher("*.png")
+        self.assertIs(get_matcher(matcher), matcher)
+        self.assertTrue(get_matcher(r".*$").all)
+        regex = get_matcher(r".*\.jpg$")
+        self.assertEqual([n for n in NAMES if regex(n)], ['c.jpg'])
+        self.assertEqual(regex.match_many(NAMES), [regex(n) for n in NAMES])
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.icons import get_icons, ICON_FILES, _REGISTRY
+from tests import BaseWidgetTest
+try:
+    import Tkinter as tk
+except ImportError:
+    import tkinter as tk
+
+
+class TestIcons(BaseWidgetTest):
+    def test_shared(self):
+        icons = get_icons(self.window)
+        self.assertIs(get_icons(self.window), icons)
+        self.assertIs(get_icons(self.window._root()), icons)
+        image = icons["file"]
+        self.assertIs(icons["file"], image)
+        self.assertEqual(len(icons), 1)
+        for name in ICON_FILES:
+            self.assertIn(str(icons[name]), self.window.image_names())
+        # destroying a child window does not release the icons
+        top = tk.Toplevel(self.window)
+        top.update()
+        top.destroy()
+        self.window.update()
+        self.assertIs(get_icons(self.window), icons)
+
+    def test_release(self):
+        root = tk.Tk()
+        root.withdraw()
+        icons = get_icons(root)
+        icons["folder"]
+        self.assertIn(root, _REGISTRY)
+        root.destroy()
+        self.assertNotIn(root, _REGISTRY)
+        self.assertEqual(len(icons), 0)
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.model import DirectoryModel, Entry, BACKENDS, get_backend, \
+    PLACEHOLDER
+from tkfilebrowser.cache import ListingCache
+from tkfilebrowser.columns import FOLDER, FILTERED, PENDING
+import unittest
+import tempfile
+import shutil
+import os
+
+
+class TestDirectoryModel(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.folder, 'b_dir'))
+        os.mkdir(os.path.join(self.folder, '.hidden_dir'))
+        for name in ['a.png', 'C.txt', '.hidden.png']:
+            with open(os.path.join(self.folder, name), 'w') as f:
+                f.write('test')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_entry(self):
+        e = Entry('.a', 'file', 2, 3, '2 B', 'Today')
+        self.assertTrue(e.hidden)
+        self.assertTrue(e.is_file)
+        self.assertFalse(e.is_folder)
+        self.assertEqual(e, Entry('.a', 'file', 2, 3, '2 B', 'Today'))
+        self.assertNotEqual(e, Entry('.a', 'file', 4, 3, '4 B', 'Today'))
+        self.assertRaises(AttributeError, setattr, e, 'other', 1)
+
+    def test_backends(self):
+        listings = [list(backend(self.folder)) for name, backend in BACKENDS.items()
+                    if name != 'scandir_lazy']
+        for listing in listings[1:]:
+            self.assertEqual(listing, listings[0])
+        self.assertEqual([e.name for e in listings[0]],
+                         ['.hidden_dir', 'b_dir', '.hidden.png', 'a.png', 'C.txt'])
+        self.assertRaises(ValueError, get_backend, 'unknown')
+        missing = os.path.join(self.folder, 'missing')
+        for backend in BACKENDS.values():
+            self.assertRaises(OSError, lambda: list(backend(missing)))
+
+    def test_rows(self):
+        model = DirectoryModel(backend='listdir', cache=ListingCache())
+        entries = model.load(self.folder)
+        self.assertEqual(len(model), 5)
+        rows, hidden, nb = model.rows(0, r".*\.png$", hide=True)
+        self.assertEqual([r[1] for r in rows],
+                         ['.hidden_dir', 'b_dir', '.hidden.png', 'a.png'])
+        self.assertEqual(hidden, [os.path.join(self.folder, '.hidden_dir'),
+                                  os.path.join(self.folder, '.hidden.png')])
+        self.assertEqual(nb, 2)
+        self.assertEqual(rows[1], (os.path.join(self.folder, 'b_dir'), 'b_dir',
+                                   ('folder', '0'), ('', '', entries[1].date_str)))
+        self.assertEqual(rows[3][2], ('file', '1'))
+        # metadata
+        txt = os.path.join(self.folder, 'C.txt')
+        self.assertEqual(model.flags(txt), FILTERED)
+        self.assertEqual(model.row(txt), 4)
+        self.assertIsNone(model.flags(os.path.join(self.folder, 'missing')))
+        self.assertEqual(model.select(FOLDER), [os.path.join(self.folder, '.hidden_dir'),
+                                                os.path.join(self.folder, 'b_dir')])
+        self.assertEqual(model.select(FOLDER, 0, hide=True),
+                         [os.path.join(self.folder, 'a.png')])
+        rows, hidden, nb = model.rows(start=1)
+        self.assertEqual(hidden, [])
+        self.assertEqual(nb, 6)
+        self.assertEqual(rows[0][2], ('folder', 'hidden', '1'))
+
+    def test_sort(self):
+        os.symlink(os.path.join(self.folder, 'missing'),
+                   os.path.join(self.folder, '0_broken'))
+        with open(os.path.join(self.folder, 'big.png'), 'w') as f:
+            f.write('test' * 10)
+        os.utime(os.path.join(self.folder, 'a.png'), (10, 10))
+        os.utime(os.path.join(self.folder, 'b_dir'), (10, 10))
+        model = DirectoryModel(backend='listdir', cache=ListingCache())
+        model.load(self.folder)
+        model.rows(0, r".*\.png$")
+
+        def names(paths):
+            return [os.path.basename(p) for p in paths]
+
+        self.assertEqual(names(model.sort("name", True, hide=True)),
+                         ['b_dir', 'big.png', 'a.png', '0_broken'])
+        # folders keep their order, the hidden one was not displayed
+        self.assertEqual(names(model.sort("size", True)),
+                         ['.hidden_dir', 'b_dir', 'big.png', '.hidden.png',
+                          'a.png', '0_broken'])
+        self.assertEqual(names(model.sort("date")),
+                         ['b_dir', '.hidden_dir', 'a.png', '.hidden.png',
+                          'big.png', '0_broken'])
+        self.assertRaises(ValueError, model.sort, "location")
+
+    @unittest.skipIf('scandir_lazy' not in BACKENDS, 'os.scandir is not available')
+    def test_lazy(self):
+        os.symlink(os.path.join(self.folder, 'missing'),
+                   os.path.join(self.folder, 'z_broken'))
+        model = DirectoryModel(backend='scandir_lazy', cache=ListingCache())
+        entries = model.load(self.folder)
+        full = list(BACKENDS['scandir'](self.folder))
+        self.assertEqual([(e.name, e.tag) for e in entries],
+                         [(e.name, e.tag) for e in full])
+        self.assertEqual(model.nb_pending, 5)
+        self.assertEqual(entries[0].date_str, PLACEHOLDER)
+        self.assertEqual(entries[2].astuple()[2:], (-1, -1, '??', '??'))
+        rows, hidden, nb = model.rows()
+        self.assertEqual(rows[4][3], ('', PLACEHOLDER, PLACEHOLDER))
+        self.assertEqual(rows[1][3], ('', '', PLACEHOLDER))
+        a_png = os.path.join(self.folder, 'a.png')
+        self.assertEqual(model.pending([a_png, '/other/path']), [4])
+        self.assertEqual(model.pending_rows(hide=True), [1, 4, 5])
+        st = os.stat(a_png)
+        path, values = model.set_stat(4, st.st_size, st.st_mtime)
+        self.assertEqual(path, a_png)
+        self.assertEqual(values, ('', full[4].size_str, full[4].date_str))
+        self.assertEqual(entries[4], full[4])
+        self.assertFalse(model.columns.flags[4] & PENDING)
+        self.assertEqual(model.columns.sizes[4], 4)
+        path, values = model.set_stat(5, None, None)
+        self.assertEqual(values, ('', '??', '??'))
+        self.assertEqual(model.columns.sizes[5], -1)
+        self.assertEqual(model.nb_pending, 3)
+        # the failure is not stored in the cached listing
+        self.assertEqual(entries[5].astuple()[2:], (None, None, PLACEHOLDER, PLACEHOLDER))
+        self.assertEqual(model.render([5])[0][3], ('', '??', '??'))
+
+    def test_apply_changes(self):
+        model = DirectoryModel(cache=ListingCache())
+        model.load(self.folder)
+        model.sort("name")
+        join = os.path.join
+        os.remove(join(self.folder, 'a.png'))
+        with open(join(self.folder, 'C.txt'), 'w') as f:
+            f.write('modified')
+        os.rename(join(self.folder, 'b_dir'), join(self.folder, 'd_dir'))
+        with open(join(self.folder, 'new.png'), 'w') as f:
+            f.write('new')
+        first, removed, updated = model.apply_changes(['a.png', 'C.txt', 'b_dir',
+                                                       'd_dir', 'new.png', 'missing'])
+        self.assertEqual(first, 5)
+        self.assertEqual(sorted(removed), [join(self.folder, 'a.png'),
+                                           join(self.folder, 'b_dir')])
+        self.assertEqual(len(updated), 1)
+        path, values = updated[0]
+        self.assertEqual(path, join(self.folder, 'C.txt'))
+        self.assertEqual(values[1], model.entries[4].size_str)
+        self.assertEqual(model.columns.sizes[4], 8)
+        # the rows of the other items do not change
+        self.assertEqual(len(model), 7)
+        self.assertEqual(model.row(join(self.folder, 'C.txt')), 4)
+        self.assertEqual(model.row(join(self.folder, 'd_dir')), 5)
+        self.assertRaises(KeyError, model.row, join(self.folder, 'a.png'))
+        self.assertEqual(model.names(), {'.hidden_dir', '.hidden.png', 'C.txt',
+                                         'd_dir', 'new.png'})
+        model.rows(0, r".*\.png$")
+        self.assertEqual(sorted(model.displayed()), ['.hidden.png', '.hidden_dir',
+                                                     'd_dir', 'new.png'])
+        rows, hidden, nb = model.rows(first)
+        self.assertEqual([r[1] for r in rows], ['d_dir', 'new.png'])
+        rows, hidden, nb = model.rows()
+        self.assertEqual([r[1] for r in rows], ['.hidden_dir', '.hidden.png',
+                                                'C.txt', 'd_dir', 'new.png'])
+        self.assertEqual(model.select(FOLDER, hide=True), [join(self.folder, 'd_dir')])
+        self.assertEqual([os.path.basename(p) for p in model.sort("name")],
+                         ['.hidden_dir', 'd_dir', '.hidden.png', 'C.txt', 'new.png'])
+        self.assertEqual(model.apply_changes(['missing']), (None, [], []))
+
+    def test_apply_changes_order(self):
+        model = DirectoryModel(cache=ListingCache())
+        model.load(self.folder)
+        join = os.path.join
+
+        def names():
+            return [model.entries[row].name for row in model.visible_rows()]
+
+        os.mkdir(join(self.folder, 'a_dir'))
+        with open(join(self.folder, 'b.png'), 'w') as f:
+            f.write('test')
+        first = model.apply_changes(['b.png', 'a_dir'])[0]
+        # folders first, then in the order of the listing
+        self.assertEqual(names(), ['.hidden_dir', 'a_dir', 'b_dir', '.hidden.png',
+                                   'a.png', 'b.png', 'C.txt'])
+        self.assertEqual(model.placements(first),
+                         [(join(self.folder, 'b.png'), join(self.folder, 'C.txt')),
+                          (join(self.folder, 'a_dir'), join(self.folder, 'b_dir'))])
+        # active sort
+        model.sort("size", True)
+        os.mkdir(join(self.folder, '0_dir'))
+        with open(join(self.folder, 'big.txt'), 'w') as f:
+            f.write('big file')
+        first = model.apply_changes(['big.txt', '0_dir'])[0]
+        self.assertEqual(names()[:5], ['.hidden_dir', 'a_dir', 'b_dir', '0_dir',
+                                       'big.txt'])
+        self.assertEqual(model.placements(first, hide=True),
+                         [(join(self.folder, 'big.txt'), join(self.folder, 'a.png')),
+                          (join(self.folder, '0_dir'), join(self.folder, 'big.txt'))])
+        # renamed item
+        os.rename(join(self.folder, 'big.txt'), join(self.folder, 'Z.txt'))
+        model.sort("name")
+        first = model.apply_changes(['big.txt', 'Z.txt'])[0]
+        self.assertEqual(names(), ['.hidden_dir', '0_dir', 'a_dir', 'b_dir',
+                                   '.hidden.png', 'C.txt', 'Z.txt', 'a.png', 'b.png'])
+        self.assertEqual(model.placements(first),
+                         [(join(self.folder, 'Z.txt'), join(self.folder, 'a.png'))])
+
+    def test_filter(self):
+        model = DirectoryModel(cache=ListingCache())
+        model.load(self.folder)
+        rows, hidden, nb = model.rows(0, r".*\.png$")
+        self.assertEqual([r[1] for r in rows], ['.hidden_dir', 'b_dir',
+                                                '.hidden.png', 'a.png'])
+        self.assertEqual(model.filter(r".*\.png$"), ([], []))
+        self.assertEqual(model.filter(r".*\.txt$"), ([4], [2, 3]))
+        self.assertEqual(model.visible_rows(), [0, 1, 4])
+        self.assertEqual(model.visible_rows(hide=True), [1, 4])
+        self.assertEqual(model.filter(), ([2, 3], []))
+        self.assertEqual(model.render([2, 4]),
+                         [(os.path.join(self.folder, '.hidden.png'), '.hidden.png',
+                           ('file', 'hidden'), ('', model.entries[2].size_str,
+                                                model.entries[2].date_str)),
+                          (os.path.join(self.folder, 'C.txt'), 'C.txt', ('file',),
+                           ('', model.entries[4].size_str, model.entries[4].date_str))])
+        model.sort("name", True)
+        self.assertEqual(model.sorting, ("name", True))
+        self.assertEqual(model.visible_rows(), [1, 0, 3, 4, 2])
+        model.clear()
+        self.assertIsNone(model.sorting)
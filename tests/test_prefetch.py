@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.prefetch import Prefetcher
+from tkfilebrowser.cache import ListingCache
+from tkfilebrowser.model import list_folder, backend_name
+from tests.faultyfs import FaultyFS
+import unittest
+import tempfile
+import shutil
+import time
+import os
+
+
+class TestPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        old = time.time() - 10
+        for name, nb in [('a', 3), ('b', 5), ('c', 2)]:
+            folder = os.path.join(self.folder, name)
+            os.mkdir(folder)
+            for i in range(nb):
+                with open(os.path.join(folder, 'f%i' % i), 'w') as f:
+                    f.write('test')
+            # listings of recently modified folders are not cached
+            os.utime(folder, (old, old))
+        self.cache = ListingCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def paths(self, *names):
+        return [os.path.join(self.folder, name) for name in names]
+
+    def test_budget(self):
+        prefetcher = Prefetcher(budget=8, cache=self.cache)
+        a, b, c = self.paths('a', 'b', 'c')
+        self.assertTrue(prefetcher.start([a, b, self.paths('missing')[0], c]))
+        prefetcher.wait(2)
+        self.assertFalse(prefetcher.running)
+        # c does not fit in the budget
+        self.assertEqual(prefetcher.listed, [a, b])
+        self.assertEqual(len(self.cache), 2)
+        self.assertIs(list_folder(a, self.cache), self.cache.lookup(a, backend_name())[1])
+        # cached folders are skipped
+        prefetcher.start([a, c])
+        prefetcher.wait(2)
+        self.assertEqual(prefetcher.listed, [c])
+
+    def test_cancel(self):
+        a, b, c = self.paths('a', 'b', 'c')
+        fs = FaultyFS(hang=['a'])
+        try:
+            prefetcher = Prefetcher(budget=100, cache=self.cache, backend=fs.backend)
+            prefetcher.start([a, b, c])
+            time.sleep(0.1)
+            self.assertTrue(prefetcher.running)
+            # the blocked round prevents a new one
+            self.assertFalse(prefetcher.start([c]))
+            fs.release()
+            prefetcher.wait(2)
+            self.assertFalse(prefetcher.running)
+            # the round was cancelled by start()
+            self.assertEqual(prefetcher.listed, [])
+            self.assertEqual(len(self.cache), 0)
+        finally:
+            fs.release()
@@ -4,6 +4,7 @@ from tkfilebrowser.recent_files import RecentFiles
 import unittest
 import tempfile
 import os
+import shutil
 
 
 class TestRecentFiles(unittest.TestCase):
@@ -29,3 +30,14 @@ class TestRecentFiles(unittest.TestCase):
         self.assertEqual(rf.get(), ['test3', 'test'])
 
         os.remove(filename)
+
+    def test_create_folder(self):
+        tmpdir = tempfile.mkdtemp()
+        filename = os.path.join(tmpdir, 'config', 'recent_files')
+        rf = RecentFiles(filename, 2)
+        self.assertEqual(rf.get(), [])
+        self.assertFalse(os.path.exists(os.path.dirname(filename)))
+        rf.add('test')
+        with open(filename) as f:
+            self.assertEqual(f.read(), 'test')
+        shutil.rmtree(tmpdir)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.registry import InterpreterRegistry
+from tests import BaseWidgetTest
+try:
+    import Tkinter as tk
+except ImportError:
+    import tkinter as tk
+
+
+class TestInterpreterRegistry(BaseWidgetTest):
+    def test_get(self):
+        registry = InterpreterRegistry(lambda root: [root])
+        value = registry.get(self.window)
+        self.assertEqual(value, [self.window._root()])
+        self.assertIs(registry.get(self.window._root()), value)
+        self.assertIn(self.window._root(), registry)
+        # destroying a child window does not release the value
+        top = tk.Toplevel(self.window)
+        top.update()
+        top.destroy()
+        self.window.update()
+        self.assertIs(registry.get(self.window), value)
+
+    def test_release(self):
+        released = []
+        registry = InterpreterRegistry(lambda root: [root], released.append)
+        root = tk.Tk()
+        root.withdraw()
+        value = registry.get(root)
+        self.assertEqual(len(registry), 1)
+        root.destroy()
+        self.assertNotIn(root, registry)
+        self.assertEqual(released, [value])
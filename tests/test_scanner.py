@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.scanner import FolderScanner, Empty
+from tkfilebrowser.model import scan_folder, list_folder, backend_name
+from tkfilebrowser.cache import ListingCache
+import unittest
+import tempfile
+import shutil
+import time
+import os
+
+
+class TestFolderScanner(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.folder, 'b_dir'))
+        os.mkdir(os.path.join(self.folder, '.hidden_dir'))
+        for name in ['a.png', 'C.txt', '.hidden.png']:
+            with open(os.path.join(self.folder, name), 'w') as f:
+                f.write('test')
+        os.symlink(os.path.join(self.folder, 'missing'),
+                   os.path.join(self.folder, 'z_broken'))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def scan(self, scanner):
+        scanner.start()
+        scanner.join()
+        rows = []
+        while True:
+            batch = scanner.get_batch()
+            if batch is None:
+                break
+            rows.extend(batch)
+        return rows
+
+    def test_scan_folder(self):
+        rows = list(scan_folder(self.folder))
+        names = [r.name for r in rows]
+        # folders (and broken links) first, then files
+        self.assertEqual(names, ['.hidden_dir', 'b_dir', 'z_broken',
+                                 '.hidden.png', 'a.png', 'C.txt'])
+        tags = {r.name: r.tag for r in rows}
+        self.assertEqual(tags['b_dir'], 'folder')
+        self.assertEqual(tags['a.png'], 'file')
+        self.assertEqual(tags['z_broken'], 'link_broken')
+        self.assertEqual(rows[1].size_str, '')
+        self.assertEqual(rows[2].astuple()[2:], (-1, -1, '??', '??'))
+        self.assertEqual(rows[4].size, 4)
+
+    def test_scanner(self):
+        cache = ListingCache()
+        rows = self.scan(FolderScanner(self.folder, firstbatch=2, batchsize=2,
+                                       cache=cache))
+        self.assertEqual(rows, list(scan_folder(self.folder)))
+
+    def test_scanner_error(self):
+        scanner = FolderScanner(os.path.join(self.folder, 'missing'))
+        scanner.start()
+        scanner.join()
+        self.assertIsInstance(scanner.get_batch(), OSError)
+        self.assertIsNone(scanner.get_batch())
+
+    def test_list_folder_cache(self):
+        cache = ListingCache()
+        # the folder has just been modified, its listing is not cached
+        rows = list_folder(self.folder, cache)
+        self.assertEqual(len(cache), 0)
+        past = time.time() - 60
+        os.utime(self.folder, (past, past))
+        self.assertEqual(list_folder(self.folder, cache), rows)
+        self.assertEqual(len(cache), 1)
+        self.assertIs(list_folder(self.folder, cache), cache.lookup(self.folder, backend_name())[1])
+        # the listings of the other backends are cached separately
+        lazy = list_folder(self.folder, cache, backend='listdir')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNot(lazy, list_folder(self.folder, cache))
+        self.assertIs(lazy, cache.lookup(self.folder, backend_name('listdir'))[1])
+        # the scanner uses the cached listing
+        rows2 = self.scan(FolderScanner(self.folder, cache=cache))
+        self.assertEqual(tuple(rows2), rows)
+        # modification of the folder
+        os.mkdir(os.path.join(self.folder, 'new'))
+        os.utime(self.folder, (past + 1, past + 1))
+        self.assertIsNone(cache.lookup(self.folder, backend_name())[1])
+        self.assertIn('new', [r.name for r in list_folder(self.folder, cache)])
+
+    def test_scanner_cancel(self):
+        for i in range(2000):
+            open(os.path.join(self.folder, 'file%i' % i), 'w').close()
+        scanner = FolderScanner(self.folder, firstbatch=10, batchsize=10,
+                                cache=ListingCache(), generation=3)
+        self.assertEqual(scanner.generation, 3)
+        scanner.cancel()
+        self.assertTrue(scanner.cancelled())
+        scanner.start()
+        scanner.join()
+        # no batch is sent after cancellation, not even the end of the scan
+        self.assertRaises(Empty, scanner.get_batch)
+        self.assertEqual(len(scanner.cache), 0)
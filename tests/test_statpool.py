@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.statpool import StatPool, StatTimeout, StatCancelled
+from tkfilebrowser.model import DirectoryModel
+from tkfilebrowser.cache import ListingCache
+from tests.faultyfs import FaultyFS
+from errno import EIO, ETIMEDOUT
+import unittest
+import tempfile
+import shutil
+import time
+import os
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
+class TestStatPool(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        for name in ['fast', 'slow', 'dead', 'broken']:
+            with open(os.path.join(self.folder, name), 'w') as f:
+                f.write('test')
+        self.fs = FaultyFS(delays={'slow': 0.05}, hang=['dead'],
+                           errors={'broken': EIO})
+
+    def tearDown(self):
+        self.fs.release()
+        shutil.rmtree(self.folder)
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def test_call(self):
+        pool = StatPool(max_workers=2, timeout=1)
+        self.assertEqual(pool.call(self.fs.stat_item, self.path('slow'))[0], 4)
+        t0 = time.time()
+        with self.assertRaises(StatTimeout) as cm:
+            pool.call(self.fs.stat, self.path('dead'), timeout=0.1)
+        self.assertLess(time.time() - t0, 1)
+        self.assertEqual(cm.exception.errno, ETIMEDOUT)
+        self.assertEqual(cm.exception.filename, self.path('dead'))
+        self.assertRaises(OSError, pool.call, self.fs.stat, self.path('broken'))
+        # a blocked call does not prevent the others
+        self.assertEqual(pool.call(self.fs.stat, self.path('fast')).st_size, 4)
+        self.assertLessEqual(pool.nb_workers, 2)
+
+    def test_submit(self):
+        pool = StatPool(max_workers=3, timeout=0.2)
+        queue = Queue()
+        calls = [pool.submit(self.fs.stat_item, self.path(name), key=name,
+                             queue=queue)
+                 for name in ['dead', 'slow', 'fast', 'broken']]
+        for i in range(3):
+            call = queue.get(timeout=1)
+            self.assertTrue(call.done())
+            self.assertIn(call.key, ['slow', 'fast', 'broken'])
+        self.assertIsInstance(calls[3].error, OSError)
+        self.assertFalse(calls[0].done())
+        time.sleep(0.25)
+        self.assertTrue(calls[0].expired())
+        self.assertFalse(calls[1].expired())
+        self.assertRaises(StatTimeout, calls[0].wait)
+        self.fs.release()
+        self.assertEqual(calls[0].wait(1)[0], 4)
+        self.assertRaises(TypeError, pool.submit, os.stat, self.folder, other=1)
+
+    def test_cancel(self):
+        pool = StatPool(max_workers=1)
+        first = pool.submit(self.fs.stat, self.path('dead'))
+        second = pool.submit(self.fs.stat, self.path('fast'))
+        self.assertTrue(second.cancel())
+        # the cancelled call is done at once
+        self.assertTrue(second.done())
+        self.assertRaises(StatCancelled, second.wait)
+        # a running call goes on
+        t0 = time.time()
+        while not self.fs.calls and time.time() - t0 < 1:
+            time.sleep(0.01)
+        self.assertFalse(first.cancel())
+        self.fs.release()
+        first.wait(1)
+        time.sleep(0.05)
+        self.assertEqual(self.fs.calls, ['dead'])
+
+    def test_hung_workers(self):
+        pool = StatPool(max_workers=2, max_hung=2)
+        dead = [pool.submit(self.fs.stat, self.path('dead'), timeout=0.05)
+                for i in range(2)]
+        # the hung workers are replaced
+        self.assertEqual(pool.call(self.fs.stat, self.path('fast'),
+                                   timeout=1).st_size, 4)
+        time.sleep(0.05)
+        self.assertEqual(pool.nb_hung, 2)
+        self.assertLessEqual(pool.nb_workers, 2)
+        # but only up to max_hung
+        more = [pool.submit(self.fs.stat, self.path('dead'), timeout=0.05)
+                for i in range(2)]
+        self.assertRaises(StatTimeout, pool.call, self.fs.stat,
+                          self.path('fast'), timeout=0.3)
+        self.fs.release()
+        for call in dead + more:
+            call.wait(1)
+        self.assertEqual(pool.call(self.fs.stat, self.path('fast')).st_size, 4)
+        time.sleep(0.05)
+        self.assertEqual(pool.nb_hung, 0)
+        self.assertLessEqual(pool.nb_workers, 2)
+
+    def test_model_load(self):
+        fs = FaultyFS(hang=[os.path.basename(self.folder)])
+        model = DirectoryModel(backend=fs.backend, cache=ListingCache())
+        pool = StatPool()
+        with self.assertRaises(StatTimeout) as cm:
+            model.load(self.folder, pool, 0.05)
+        self.assertIsNone(model.folder)
+        fs.release()
+        # the listing goes on and is not made again
+        call = cm.exception.call
+        call.wait(1)
+        self.assertEqual(len(model.load_call(call)), 4)
+        self.assertEqual(model.folder, self.folder)
+        self.assertEqual(fs.calls, [os.path.basename(self.folder)])
+        self.assertEqual(len(model.load(self.folder, pool, 1)), 4)
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.styles import setup_styles, _REGISTRY
+from tests import BaseWidgetTest
+try:
+    import ttk
+except ImportError:
+    from tkinter import ttk
+
+
+class TestStyles(BaseWidgetTest):
+    def test_setup_styles(self):
+        style = ttk.Style(self.window)
+        theme = style.theme_use()
+        colors = setup_styles(self.window)
+        self.assertEqual(colors["bg"], style.lookup("TFrame", "background"))
+        self.assertEqual(style.lookup("right.tkfilebrowser.Treeview.Item", "padding"), "2")
+        self.assertIs(setup_styles(self.window), colors)
+        # theme change
+        other = [t for t in style.theme_names() if t != theme][0]
+        style.theme_use(other)
+        self.window.update()
+        other_colors = setup_styles(self.window)
+        self.assertEqual(_REGISTRY[self.window._root()][0], other)
+        self.assertEqual(style.lookup("right.tkfilebrowser.Treeview.Item", "padding"), "2")
+        style.theme_use(theme)
+        self.window.update()
+        self.assertIs(setup_styles(self.window), colors)
+        self.assertIsNot(colors, other_colors)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+from tkfilebrowser.watcher import InotifyWatcher, PollingWatcher, \
+    WatcherError, inotify_available
+import unittest
+import tempfile
+import shutil
+import time
+import os
+
+
+@unittest.skipIf(not inotify_available(), 'inotify is not available')
+class TestInotifyWatcher(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        with open(os.path.join(self.folder, 'old.txt'), 'w') as f:
+            f.write('test')
+        self.watcher = InotifyWatcher()
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def wait_changes(self, nb=1):
+        names = set()
+        reset = False
+        for i in range(50):
+            n, r = self.watcher.changes()
+            names |= n
+            reset |= r
+            if len(names) >= nb or reset:
+                break
+            time.sleep(0.01)
+        return names, reset
+
+    def test_changes(self):
+        self.watcher.watch(self.folder)
+        self.assertEqual(self.watcher.folder, self.folder)
+        self.assertEqual(self.watcher.changes(), (set(), False))
+        join = os.path.join
+        with open(join(self.folder, 'new.txt'), 'w') as f:
+            f.write('test')
+        os.rename(join(self.folder, 'old.txt'), join(self.folder, 'renamed.txt'))
+        os.mkdir(join(self.folder, 'dir'))
+        self.assertEqual(self.wait_changes(4),
+                         ({'new.txt', 'old.txt', 'renamed.txt', 'dir'}, False))
+        os.remove(join(self.folder, 'new.txt'))
+        self.assertEqual(self.wait_changes(), ({'new.txt'}, False))
+        # changes inside subfolders are not reported
+        with open(join(self.folder, 'dir', 'file'), 'w') as f:
+            f.write('test')
+        time.sleep(0.05)
+        self.assertEqual(self.watcher.changes(), (set(), False))
+        # watched folder deleted
+        shutil.rmtree(self.folder)
+        names, reset = self.wait_changes(10)
+        self.assertTrue(reset)
+
+    def test_watch(self):
+        other = tempfile.mkdtemp()
+        try:
+            self.watcher.watch(self.folder)
+            with open(os.path.join(self.folder, 'new.txt'), 'w') as f:
+                f.write('test')
+            # the events of the previously watched folder are discarded
+            self.watcher.watch(other)
+            self.assertEqual(self.watcher.changes(), (set(), False))
+            with open(os.path.join(other, 'file'), 'w') as f:
+                f.write('test')
+            self.assertEqual(self.wait_changes(), ({'file'}, False))
+            # the events that follow the watch are kept
+            self.watcher.watch(self.folder)
+            os.remove(os.path.join(self.folder, 'new.txt'))
+            self.assertEqual(self.wait_changes(), ({'new.txt'}, False))
+            self.watcher.unwatch()
+            self.assertIsNone(self.watcher.folder)
+            with open(os.path.join(other, 'file2'), 'w') as f:
+                f.write('test')
+            self.assertEqual(self.wait_changes(), (set(), False))
+            self.assertRaises(OSError, self.watcher.watch,
+                              os.path.join(other, 'missing'))
+        finally:
+            shutil.rmtree(other)
+
+
+class TestPollingWatcher(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.known = set(['old.txt'])
+        with open(os.path.join(self.folder, 'old.txt'), 'w') as f:
+            f.write('test')
+        # long interval: the folder is polled by the test
+        self.watcher = PollingWatcher(lambda: self.known, min_interval=60,
+                                      max_interval=600)
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_changes(self):
+        join = os.path.join
+        self.watcher.watch(self.folder)
+        self.assertEqual(self.watcher.folder, self.folder)
+        self.watcher.poll()
+        self.assertEqual(self.watcher.changes(), (set(), False))
+        self.assertGreater(self.watcher.interval, 60)
+        time.sleep(0.01)
+        with open(join(self.folder, 'new.txt'), 'w') as f:
+            f.write('test')
+        os.rename(join(self.folder, 'old.txt'), join(self.folder, 'renamed.txt'))
+        self.watcher.poll()
+        self.assertEqual(self.watcher.interval, 60)
+        self.assertEqual(self.watcher.changes(),
+                         ({'new.txt', 'old.txt', 'renamed.txt'}, False))
+        self.assertEqual(self.watcher.changes(), (set(), False))
+        # the folder is only listed again when it changes
+        self.known = set(['new.txt', 'renamed.txt'])
+        self.watcher.poll()
+        self.assertEqual(self.watcher.changes(), (set(), False))
+        # backoff
+        for i in range(20):
+            self.watcher.poll()
+        self.assertEqual(self.watcher.interval, 600)
+        self.watcher.unwatch()
+        self.assertIsNone(self.watcher.folder)
+        self.watcher.watch(self.folder)
+        shutil.rmtree(self.folder)
+        self.watcher.poll()
+        self.assertEqual(self.watcher.changes(), (set(), True))
+        self.assertRaises(WatcherError, self.watcher.watch, self.folder)
@@ -18,7 +18,21 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
-from tkfilebrowser.filebrowser import FileBrowser
+import sys
 from tkfilebrowser.functions import askopendirname, askopendirnames, \
     askopenfilename, askopenfilenames, askopenpathname, askopenpathnames, \
     asksaveasfilename
+
+__all__ = ["FileBrowser", "askopendirname", "askopendirnames",
+           "askopenfilename", "askopenfilenames", "askopenpathname",
+           "askopenpathnames", "asksaveasfilename"]
+
+# the filebrowser module (tkinter, psutil, ...) is imported on first access
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name == "FileBrowser":
+            from tkfilebrowser.filebrowser import FileBrowser
+            return FileBrowser
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+else:
+    from tkfilebrowser.filebrowser import FileBrowser
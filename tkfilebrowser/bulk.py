@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Bulk Treeview operations
+
+Inserting rows one by one in a ttk.Treeview costs one Python -> Tcl round
+trip per row. The functions of this module send thousands of rows at once
+to small Tcl procedures that loop over them inside the interpreter.
+
+The "0"/"1" stripe tags are only updated for the rows in view: the rows
+scrolled into view are restriped by the FileBrowser, so the cost of a
+reordering does not depend on the number of rows.
+"""
+
+
+from tkfilebrowser.constants import tk
+from tkfilebrowser.virtual_tree import VirtualTreeview
+
+
+# number of rows sent to Tcl at once
+CHUNKSIZE = 5000
+
+_TCL_PROCS = r"""
+namespace eval ::tkfilebrowser {}
+
+proc ::tkfilebrowser::insert {w rows} {
+    foreach {iid text tags values} $rows {
+        $w insert {} end -id $iid -text $text -tags $tags -values $values
+    }
+}
+
+proc ::tkfilebrowser::restripe {w} {
+    set item {}
+    for {set y 0} {$y < 80} {incr y 4} {
+        set item [$w identify item 0 $y]
+        if {$item ne {}} break
+    }
+    if {$item eq {}} return
+    set i [$w index $item]
+    while {$item ne {} && [llength [$w bbox $item]]} {
+        set tags [lsearch -all -inline -not -regexp [$w item $item -tags] {^[01]$}]
+        lappend tags [expr {$i % 2}]
+        $w item $item -tags $tags
+        set item [$w next $item]
+        incr i
+    }
+}
+
+proc ::tkfilebrowser::reorder {w items} {
+    $w children {} $items
+    ::tkfilebrowser::restripe $w
+}
+"""
+
+
+def _call(tree, proc, *args):
+    """Call the Tcl procedure proc, defining the procedures if needed."""
+    try:
+        return tree.tk.call('::tkfilebrowser::' + proc, tree._w, *args)
+    except tk.TclError as e:
+        if 'invalid command name' not in str(e):
+            raise
+        tree.tk.eval(_TCL_PROCS)
+        return tree.tk.call('::tkfilebrowser::' + proc, tree._w, *args)
+
+
+def insert_rows(tree, rows, chunksize=CHUNKSIZE):
+    """
+    Insert rows at the end of tree.
+
+    Arguments:
+        * tree: ttk.Treeview
+        * rows: iterable of (iid, text, tags, values) tuples
+        * chunksize: number of rows sent to Tcl at once
+    """
+    if isinstance(tree, VirtualTreeview):
+        # rows are only added to the model
+        tree.insert_rows(rows)
+        return
+    chunk = []
+    for row in rows:
+        chunk.extend(row)
+        if len(chunk) >= 4 * chunksize:
+            _call(tree, 'insert', tuple(chunk))
+            chunk = []
+    if chunk:
+        _call(tree, 'insert', tuple(chunk))
+
+
+def restripe(tree):
+    """
+    Restore the "0"/"1" tags alternance of the rows of tree that are in view.
+
+    Only the stripe tag of the rows is replaced, their other tags are kept.
+    """
+    if isinstance(tree, VirtualTreeview):
+        # the stripes are applied at display time
+        return
+    _call(tree, 'restripe')
+
+
+def reorder(tree, items):
+    """
+    Display items in tree in the given order and restore the "0"/"1" tags
+    alternance of the rows in view.
+
+    The items missing from items are detached.
+    """
+    if isinstance(tree, VirtualTreeview):
+        tree.set_children("", *items)
+    else:
+        _call(tree, 'reorder', tuple(items))
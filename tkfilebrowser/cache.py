@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Folder listing cache
+"""
+
+
+from collections import OrderedDict
+from threading import Lock
+from os import stat
+from time import time
+from tkfilebrowser.constants import DATE_FORMATTER
+
+
+def folder_key(folder):
+    """Return the (st_dev, st_ino, st_mtime_ns) key of folder."""
+    st = stat(folder)
+    try:
+        mtime = st.st_mtime_ns
+    except AttributeError:
+        mtime = int(st.st_mtime * 1e9)
+    return st.st_dev, st.st_ino, mtime
+
+
+class ListingCache:
+    """
+    Thread-safe LRU cache of folder listings.
+
+    The listings are stored under the (st_dev, st_ino, st_mtime_ns) key of
+    the folder so that any change in the folder content (which updates its
+    modification time) invalidates them, while checking the validity of a
+    listing only costs one stat() call. The name of the backend that made
+    the listing is added to the key since the entries of a lazy backend are
+    not stat'ed.
+
+    A listing is a sequence of :class:`model.Entry`. Since their formatted
+    dates ("Today", weekdays) depend on the current day, the listings are
+    only valid during the day they were stored.
+
+    If :attr:`disk` is a :class:`diskcache.DiskCache`, the listings of large
+    or slow folders are also stored on disk and looked up there when they
+    are not in memory.
+    """
+    # folders modified less than RACY seconds before being listed are not
+    # cached: on file systems with a coarse mtime resolution a later change
+    # could keep the same key
+    RACY = 2
+
+    def __init__(self, maxentries=500000, maxbytes=128 * 1024 * 1024, disk=None):
+        """
+        Create a listing cache.
+
+        Options:
+            * maxentries: maximum total number of rows kept in the cache
+            * maxbytes: approximate maximum memory used by the cached rows
+            * disk: persistent DiskCache or None
+        """
+        self._lock = Lock()
+        self._listings = OrderedDict()  # key -> (listing, nb_bytes, day)
+        self.maxentries = maxentries
+        self.maxbytes = maxbytes
+        self.nb_entries = 0
+        self.nb_bytes = 0
+        self.disk = disk
+
+    def __len__(self):
+        return len(self._listings)
+
+    @staticmethod
+    def estimate_size(listing):
+        """Return the approximate memory footprint of listing in bytes."""
+        # tuple, Entry object, two numbers and the strings overhead
+        size = 64 + 8 * len(listing)
+        for entry in listing:
+            size += 280 + len(entry.name) + len(entry.size_str) + len(entry.date_str)
+        return size
+
+    def resize(self, maxentries=None, maxbytes=None):
+        """Change the cache budget, evicting listings if needed."""
+        with self._lock:
+            if maxentries is not None:
+                self.maxentries = maxentries
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+            self.nb_entries = 0
+            self.nb_bytes = 0
+
+    def get(self, key):
+        """Return the listing stored under key or None."""
+        today = DATE_FORMATTER.current_day()
+        with self._lock:
+            value = self._listings.pop(key, None)
+            if value is None:
+                return None
+            listing, nb_bytes, day = value
+            if day != today:
+                # stored before the day rolled over
+                self.nb_entries -= len(listing)
+                self.nb_bytes -= nb_bytes
+                return None
+            self._listings[key] = value  # most recently used
+            return listing
+
+    def lookup(self, folder, backend=None):
+        """
+        Return (key, listing) where listing is None if folder is not cached.
+
+        backend is the name of the backend making the listings, see
+        :func:`model.backend_name`.
+
+        Raise OSError if folder cannot be accessed.
+        """
+        key = folder_key(folder) + (backend,)
+        listing = self.get(key)
+        disk = self.disk
+        if listing is None and disk is not None:
+            listing = disk.get(folder, key)
+            if listing is not None:
+                self._store(key, listing)
+        return key, listing
+
+    def put(self, key, listing, folder=None, cost=None):
+        """
+        Store listing under key (see :meth:`lookup`).
+
+        If folder is given, the listing is also stored in :attr:`disk`
+        when it has enough entries or when it took more than cost seconds
+        to make (see :meth:`diskcache.DiskCache.put`).
+        """
+        if time() - key[2] / 1e9 < self.RACY:
+            return
+        listing = tuple(listing)
+        disk = self.disk
+        if disk is not None and folder is not None:
+            disk.put(folder, key, listing, cost)
+        self._store(key, listing)
+
+    def _store(self, key, listing):
+        nb_bytes = self.estimate_size(listing)
+        if len(listing) > self.maxentries or nb_bytes > self.maxbytes:
+            return
+        day = DATE_FORMATTER.current_day()
+        with self._lock:
+            old = self._listings.pop(key, None)
+            if old is not None:
+                self.nb_entries -= len(old[0])
+                self.nb_bytes -= old[1]
+            self._listings[key] = (listing, nb_bytes, day)
+            self.nb_entries += len(listing)
+            self.nb_bytes += nb_bytes
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently used listings until the budget is met."""
+        while self._listings and (self.nb_entries > self.maxentries
+                                  or self.nb_bytes > self.maxbytes):
+            key, (listing, nb_bytes, day) = self._listings.popitem(last=False)
+            self.nb_entries -= len(listing)
+            self.nb_bytes -= nb_bytes
+
+
+# shared by all the FileBrowser instances
+LISTING_CACHE = ListingCache()
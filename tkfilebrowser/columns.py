@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Columnar metadata store
+
+The metadata of the displayed folder is kept in parallel arrays so that
+sorting, filtering and selection checks are done in memory, without asking
+the Treeview or the disk. NumPy is used when it is installed.
+"""
+
+
+from array import array
+from sys import getsizeof
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# flags
+FOLDER = 1
+LINK = 2
+HIDDEN = 4
+BROKEN = 8
+FILTERED = 16  # file not matching the current filetype
+PENDING = 32  # size and modification time not known yet
+DELETED = 64  # item removed from the folder since it was listed
+
+# use numpy above this number of rows
+NUMPY_THRESHOLD = 10000
+
+_TAGS = {"folder": FOLDER, "folder_link": FOLDER | LINK, "file": 0,
+         "file_link": LINK, "link_broken": LINK | BROKEN}
+
+
+def tag_flags(tag, name):
+    """Return the flags corresponding to the tag of the item name."""
+    flags = _TAGS[tag]
+    if name[:1] == ".":
+        flags |= HIDDEN
+    return flags
+
+
+def flags_tag(flags):
+    """Return the tag corresponding to flags."""
+    if flags & BROKEN:
+        return "link_broken"
+    tag = "folder" if flags & FOLDER else "file"
+    if flags & LINK:
+        tag += "_link"
+    return tag
+
+
+class ColumnStore(object):
+    """
+    Metadata of the items of a folder, stored by column.
+
+    Attributes:
+        * names: list of item names
+        * sizes: array('q') of sizes in bytes (0 for folders, -1 for broken links)
+        * mtimes: array('q') of modification times in nanoseconds (-1 if unknown)
+        * flags: bytearray of FOLDER, LINK, HIDDEN, BROKEN, FILTERED, PENDING
+                 and DELETED flags
+        * nb_pending: number of PENDING rows
+
+    The row i of the store describes the i-th entry of the folder. Removed
+    items are flagged DELETED instead of being dropped so that the rows
+    of the other items do not change.
+    """
+    def __init__(self, entries=()):
+        self.names = []
+        self.sizes = array('q')
+        self.mtimes = array('q')
+        self.flags = bytearray()
+        self.nb_pending = 0
+        self._index = None
+        self.extend(entries)
+
+    def __len__(self):
+        return len(self.names)
+
+    def clear(self):
+        self.names = []
+        self.sizes = array('q')
+        self.mtimes = array('q')
+        self.flags = bytearray()
+        self.nb_pending = 0
+        self._index = None
+
+    def extend(self, entries):
+        """
+        Append the rows describing entries (:class:`model.Entry`).
+
+        The entries whose mtime is None are flagged PENDING.
+        """
+        names = self.names
+        sizes = self.sizes
+        mtimes = self.mtimes
+        flags = self.flags
+        start = len(names)
+        for entry in entries:
+            name = entry.name
+            names.append(name)
+            mtime = entry.mtime
+            if mtime is None:
+                sizes.append(-1 if entry.size is None else entry.size)
+                mtimes.append(-1)
+                flags.append(tag_flags(entry.tag, name) | PENDING)
+                self.nb_pending += 1
+                continue
+            sizes.append(entry.size)
+            mtimes.append(-1 if mtime < 0 else int(mtime * 1e9))
+            flags.append(tag_flags(entry.tag, name))
+        if self._index is not None:
+            index = self._index
+            for i in range(start, len(names)):
+                index[names[i]] = i
+
+    def nbytes(self):
+        """Return the approximate memory footprint of the store in bytes."""
+        n = len(self.names)
+        size = getsizeof(self.names) + 8 * len(self.sizes) + 8 * len(self.mtimes) + n
+        size += sum(getsizeof(name) for name in self.names)
+        if self._index is not None:
+            size += getsizeof(self._index)
+        return size
+
+    def index(self, name):
+        """Return the row of name, raise KeyError if name is not in the store."""
+        if self._index is None:
+            flags = self.flags
+            self._index = {name: i for i, name in enumerate(self.names)
+                           if not flags[i] & DELETED}
+        return self._index[name]
+
+    def get(self, name, default=None):
+        """Return the flags of the item name or default."""
+        try:
+            return self.flags[self.index(name)]
+        except KeyError:
+            return default
+
+    def tag(self, i):
+        return flags_tag(self.flags[i])
+
+    def set_stat(self, i, size, mtime):
+        """Set the size and modification time of row i and clear its PENDING flag."""
+        self.sizes[i] = size
+        self.mtimes[i] = -1 if mtime < 0 else int(mtime * 1e9)
+        if self.flags[i] & PENDING:
+            self.flags[i] &= ~PENDING & 0xff
+            self.nb_pending -= 1
+
+    def delete(self, i):
+        """Flag row i DELETED: it is then ignored by :meth:`index` and :meth:`select`."""
+        if self.flags[i] & PENDING:
+            self.nb_pending -= 1
+        self.flags[i] = DELETED
+        if self._index is not None and self._index.get(self.names[i]) == i:
+            del self._index[self.names[i]]
+
+    def set_flag(self, flag, rows, value=True):
+        """Set (or unset if not value) flag for the given rows."""
+        flags = self.flags
+        if value:
+            for i in rows:
+                flags[i] |= flag
+        else:
+            flag = ~flag & 0xff
+            for i in rows:
+                flags[i] &= flag
+
+    def select(self, mask, value=None, exclude=0):
+        """
+        Return the list of the rows i such that flags[i] & mask == value
+        and flags[i] & exclude == 0.
+
+        value defaults to mask (all flags of mask are set). DELETED rows
+        are always excluded.
+        """
+        if value is None:
+            value = mask
+        exclude |= DELETED
+        flags = self.flags
+        if numpy is not None and len(flags) > NUMPY_THRESHOLD:
+            f = numpy.frombuffer(flags, dtype=numpy.uint8)
+            sel = (f & mask) == value
+            if exclude:
+                sel &= (f & exclude) == 0
+            return numpy.flatnonzero(sel).tolist()
+        return [i for i, f in enumerate(flags)
+                if f & mask == value and not f & exclude]
+
+    def startswith(self, prefix, rows=None):
+        """Return the rows whose name starts with prefix (case insensitive)."""
+        prefix = prefix.lower()
+        names = self.names
+        l = len(prefix)
+        if rows is None:
+            rows = range(len(names))
+        return [i for i in rows if names[i][:l].lower() == prefix]
+
+    def sort(self, rows, column, reverse=False):
+        """
+        Return rows sorted by column: "names", "sizes" or "mtimes".
+
+        The sort is stable, also in reverse order.
+        """
+        values = getattr(self, column)
+        if column != "names" and numpy is not None and len(rows) > NUMPY_THRESHOLD:
+            rows = numpy.asarray(rows, dtype=numpy.intp)
+            keys = numpy.frombuffer(values, dtype=numpy.int64)[rows]
+            if reverse:
+                keys = -keys
+            return rows[numpy.argsort(keys, kind="stable")].tolist()
+        return sorted(rows, key=values.__getitem__, reverse=reverse)
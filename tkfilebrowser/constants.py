@@ -25,11 +25,12 @@ Copyright 2007-2013 elementary LLC.
 Constants and functions
 """
 import locale
-from babel.numbers import format_number
-from babel.dates import format_date, format_datetime
-from datetime import datetime
+import re
+import sys
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from time import time, mktime
 import os
-from math import log, floor
 
 try:
     import tkinter as tk
@@ -41,23 +42,14 @@ except ImportError:
     import ttk
     from tkMessageBox import askyesnocancel, showerror
     from urllib import unquote
-    import sys
     reload(sys)
     sys.setdefaultencoding('utf8')
 
 PATH = os.path.dirname(__file__)
 
+# created when the first file is written in it
 LOCAL_PATH = os.path.join(os.path.expanduser('~'), '.config', 'tkfilebrowser')
 
-if not os.path.exists(LOCAL_PATH):
-    try:
-        if not os.path.exists(os.path.join(os.path.expanduser('~'), '.config')):
-            os.mkdir(os.path.join(os.path.expanduser('~'), '.config'))
-        os.mkdir(LOCAL_PATH)
-    except Exception:
-        # avoid raising error if the path is not writtable
-        pass
-
 RECENT_FILES = os.path.join(LOCAL_PATH, 'recent_files')
 
 # ---  images
@@ -79,10 +71,19 @@ IM_RECENT = os.path.join(PATH, "images", "recent.png")
 IM_RECENT_24 = os.path.join(PATH, "images", "recent_24.png")
 
 # ---  translation
-try:
-    LANG = locale.getdefaultlocale()[0]
-except ValueError:
-    LANG = 'en'
+def get_lang():
+    """Return LANG, the language of the locale, read on first call."""
+    try:
+        return globals()["LANG"]
+    except KeyError:
+        pass
+    try:
+        lang = locale.getdefaultlocale()[0] or 'en'
+    except ValueError:
+        lang = 'en'
+    globals()["LANG"] = lang
+    return lang
+
 
 EN = {}
 FR = {"B": "octets", "MB": "Mo", "kB": "ko", "GB": "Go", "TB": "To",
@@ -95,38 +96,165 @@ FR = {"B": "octets", "MB": "Mo", "kB": "ko", "GB": "Go", "TB": "To",
       "Shortcuts": "Raccourcis", "Save As": "Enregistrer sous",
       "Recent": "Récents", "Recently used": "Récemment utilisés"}
 LANGUAGES = {"fr": FR, "en": EN}
-if LANG[:2] == "fr":
-    TR = LANGUAGES["fr"]
-else:
-    TR = LANGUAGES["en"]
+
+
+def get_translations():
+    """Return TR, the translations for the language of the locale."""
+    try:
+        return globals()["TR"]
+    except KeyError:
+        pass
+    if get_lang()[:2] == "fr":
+        tr = LANGUAGES["fr"]
+    else:
+        tr = LANGUAGES["en"]
+    globals()["TR"] = tr
+    return tr
 
 
 def _(text):
     """ translation function """
-    return TR.get(text, text)
+    return get_translations().get(text, text)
 
 
 fromtimestamp = datetime.fromtimestamp
 
 
-def locale_date(date=None):
-    return format_date(date, 'short', locale=LANG)
+# ---  locale formatting
+# babel and its locale data are only imported when a date or a number is
+# formatted for a locale that is not built in
+
+def _group_digits(integer, group):
+    """Return the digits of integer (str) separated in groups of 3 by group."""
+    i = len(integer) % 3 or 3
+    parts = [integer[:i]]
+    while i < len(integer):
+        parts.append(integer[i:i + 3])
+        i += 3
+    return group.join(parts)
+
+
+class _BuiltinLocale(object):
+    """Fast formatting of dates and numbers for a locale, without babel."""
+    def __init__(self, date_format, weekdays, group, decimal):
+        """
+        Create a built-in locale.
+
+        Arguments:
+            * date_format: short date format, with the day, month, year and
+                           two digit year as {d}, {m}, {y} and {yy}
+            * weekdays: weekday names, starting with monday
+            * group, decimal: number grouping and decimal symbols
+        """
+        self.date_format = date_format
+        self.weekdays = weekdays
+        self.group = group
+        self.decimal = decimal
+
+    def date(self, date):
+        return self.date_format.format(d=date.day, m=date.month, y=date.year,
+                                       yy=date.year % 100)
+
+    def weekday(self, date):
+        return self.weekdays[date.weekday()]
+
+    def number(self, nb):
+        """Format nb like babel with the "#,##0.###" pattern."""
+        nb = "%.3f" % float(nb)
+        sign = ""
+        if nb[0] == "-":
+            sign, nb = "-", nb[1:]
+        integer, decimals = nb.split(".")
+        decimals = decimals.rstrip("0")
+        if integer == "0" and not decimals:
+            sign = ""
+        nb = sign + _group_digits(integer, self.group)
+        if decimals:
+            nb += self.decimal + decimals
+        return nb
+
+
+_EN = _BuiltinLocale("{m}/{d}/{yy:02d}",
+                     ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday",
+                      "Saturday", "Sunday"), ",", ".")
+_FR = _BuiltinLocale("{d:02d}/{m:02d}/{y}",
+                     ("lundi", "mardi", "mercredi", "jeudi", "vendredi",
+                      "samedi", "dimanche"), u"\u202f", ",")
+BUILTIN_LOCALES = {"en": _EN, "en_US": _EN, "fr": _FR, "fr_FR": _FR}
+
+
+def _builtin_locale():
+    """Return the built-in locale for LANG or None."""
+    return BUILTIN_LOCALES.get(get_lang())
 
 
-def locale_datetime(date=None):
-    return format_datetime(date, 'EEEE HH:mm', locale=LANG)
+def locale_date(date=None):
+    if date is None:
+        date = datetime.now()
+    builtin = _builtin_locale()
+    if builtin is not None:
+        return builtin.date(date)
+    from babel.dates import format_date
+    return format_date(date, 'short', locale=get_lang())
 
 
-def locale_number(nb):
-    return format_number(nb, locale=LANG)
+def locale_weekday(date=None):
+    if date is None:
+        date = datetime.now()
+    builtin = _builtin_locale()
+    if builtin is not None:
+        return builtin.weekday(date)
+    from babel.dates import format_date
+    return format_date(date, 'EEEE', locale=get_lang())
+
 
+def locale_datetime(date=None):
+    if date is None:
+        date = datetime.now()
+    return "%s %02d:%02d" % (locale_weekday(date), date.hour, date.minute)
 
-SIZES = [_("B"), _("kB"), _("MB"), _("GB"), _("TB")]
 
-# ---  locale settings for dates
-TODAY = locale_date()
-YEAR = datetime.now().year
-DAY = int(format_date(None, 'D', locale=LANG))
+def locale_number(nb):
+    builtin = _builtin_locale()
+    if builtin is not None:
+        return builtin.number(nb)
+    from babel.numbers import format_decimal
+    return format_decimal(nb, locale=get_lang())
+
+
+UNITS = ("B", "kB", "MB", "GB", "TB")
+
+
+# ---  locale settings, computed when first accessed
+# (see DATE_FORMATTER.current_day() for the current day)
+def _locale_setting(name):
+    if name == "LANG":
+        return get_lang()
+    elif name == "TR":
+        return get_translations()
+    elif name == "SIZES":
+        return [_(unit) for unit in UNITS]
+    elif name == "TODAY":
+        return locale_date()
+    elif name == "YEAR":
+        return datetime.now().year
+    elif name == "DAY":
+        return datetime.now().timetuple().tm_yday
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        value = _locale_setting(name)
+        globals()[name] = value
+        return value
+else:
+    LANG = _locale_setting("LANG")
+    TR = _locale_setting("TR")
+    SIZES = _locale_setting("SIZES")
+    TODAY = _locale_setting("TODAY")
+    YEAR = _locale_setting("YEAR")
+    DAY = _locale_setting("DAY")
 
 
 # ---  functions
@@ -158,49 +286,309 @@ def remove_trace(variable, mode, cbname):
         variable.trace_vdelete(mode[0], cbname)
 
 
+def _local_epoch(day):
+    """Return the timestamp of the local midnight starting the date day."""
+    return mktime(day.timetuple())
+
+
+class DateFormatter(object):
+    """
+    Modification date formatter.
+
+    The dates are displayed as "Today HH:MM" for today, "weekday HH:MM"
+    during the last week of the current year and with the locale short date
+    format before.
+
+    The boundaries of the days of the last week are computed once as
+    timestamps, so the dates of this week are formatted with comparisons
+    and integer arithmetic only. The locale dependent part of the older
+    dates (the short date) is formatted once per calendar day and memoized.
+    The boundaries are computed again when the day rolls over, which is
+    checked once per call (or per batch) with the clock.
+    """
+    # the memoized days are cleared beyond this number
+    maxdays = 10000
+
+    def __init__(self, clock=time):
+        """
+        Create a date formatter.
+
+        Options:
+            * clock: function returning the current timestamp
+        """
+        self.clock = clock
+        # (tomorrow, today, today in the locale short format, week, days),
+        # see refresh(): the state is replaced at once when the day rolls
+        # over so that the threads formatting dates never mix two days
+        self._state = None
+
+    @property
+    def today(self):
+        """Current date in the locale short format."""
+        return self._current()[2]
+
+    @property
+    def _days(self):
+        """Memoized days: date ordinal -> (prefix, whether to add the time)."""
+        state = self._state
+        return {} if state is None else state[4]
+
+    def clear(self):
+        """Forget the memoized days and refresh the formatter."""
+        self._state = None
+
+    def refresh(self, now=None):
+        """
+        Compute the day boundaries for the current day (or for the timestamp
+        now) and return the new state of the formatter.
+        """
+        if now is None:
+            now = self.clock()
+        today = datetime.fromtimestamp(now).date()
+        tomorrow = _local_epoch(today + timedelta(1))
+        # days of the current year during the last week, oldest first:
+        # (start, prefix, whether the day lasts 24 h)
+        days = []
+        for i in range(6, -1, -1):
+            day = today - timedelta(i)
+            if day.year != today.year:
+                continue
+            start = _local_epoch(day)
+            end = tomorrow if i == 0 else _local_epoch(day + timedelta(1))
+            if i:
+                prefix = locale_weekday(day) + " "
+            else:
+                prefix = _("Today") + " "
+            days.append((start, prefix, end - start == 86400))
+        starts = [day[0] for day in days]
+        week = (starts[0], tomorrow, starts, days)
+        state = (tomorrow, today, locale_date(today), week, {})
+        self._state = state
+        return state
+
+    def _current(self):
+        """Return the state of the formatter, refreshed if the day rolled over."""
+        state = self._state
+        if state is None or self.clock() >= state[0]:
+            state = self.refresh()
+        return state
+
+    def check(self):
+        """Refresh the formatter if the day rolled over."""
+        self._current()
+
+    def current_day(self):
+        """Return the current date in the locale short format."""
+        return self._current()[2]
+
+    def _day(self, tps, state):
+        """Return (prefix, timed) for the day of the datetime tps."""
+        day = tps.date()
+        today = state[1]
+        if day == today:
+            value = _("Today") + " ", True
+        elif day.year == today.year and (today - day).days < 7:
+            value = locale_weekday(day) + " ", True
+        else:
+            value = locale_date(day), False
+        days = state[4]
+        if len(days) >= self.maxdays:
+            days.clear()
+        days[tps.toordinal()] = value
+        return value
+
+    def _format(self, mtime, state):
+        """Return the string displayed for mtime (not a string)."""
+        start, end, starts, days = state[3]
+        if start <= mtime < end:
+            day_start, prefix, regular = days[bisect_right(starts, mtime) - 1]
+            if regular:
+                minutes = int(mtime - day_start) // 60
+                return "%s%02d:%02d" % ((prefix,) + divmod(minutes, 60))
+            # daylight saving time change
+        tps = fromtimestamp(mtime)
+        value = state[4].get(tps.toordinal())
+        if value is None:
+            value = self._day(tps, state)
+        if value[1]:
+            return "%s%02d:%02d" % (value[0], tps.hour, tps.minute)
+        return value[0]
+
+    def __call__(self, mtime):
+        """Return the string displayed for the modification time mtime."""
+        if isinstance(mtime, str):
+            return mtime
+        return self._format(mtime, self._current())
+
+    def format_many(self, mtimes):
+        """Return the list of the strings displayed for the modification times mtimes."""
+        state = self._current()
+        fmt = self._format
+        return [mtime if isinstance(mtime, str) else fmt(mtime, state)
+                for mtime in mtimes]
+
+
+# shared by all the dialogs
+DATE_FORMATTER = DateFormatter()
+
+
 def get_modification_date(file):
     """Return the modification date of file."""
     try:
-        tps = fromtimestamp(os.path.getmtime(file))
+        mtime = os.path.getmtime(file)
     except OSError:
-        tps = TODAY
-    date = locale_date(tps)
-    if date == TODAY:
-        date = _("Today") + tps.strftime(" %H:%M")
-    elif tps.year == YEAR and (DAY - int(tps.strftime("%j"))) < 7:
-        date = locale_datetime(tps)
-    return date
+        mtime = time()
+    return DATE_FORMATTER(mtime)
 
 
 def display_modification_date(mtime):
-    """Return the modDification date of file."""
-    if isinstance(mtime, str):
-        return mtime
-    tps = fromtimestamp(mtime)
-    date = locale_date(tps)
-    if date == TODAY:
-        date = _("Today") + tps.strftime(" %H:%M")
-    elif tps.year == YEAR and (DAY - int(tps.strftime("%j"))) < 7:
-        date = locale_datetime(tps)
-    return date
+    """Return the modification date string of mtime."""
+    return DATE_FORMATTER(mtime)
 
 
-def display_size(size_o):
-    """Return the size of file."""
-    if isinstance(size_o, str):
-        return size_o
-    if size_o > 0:
-        m = int(floor(log(size_o) / log(1024)))
-        if m < len(SIZES):
-            unit = SIZES[m]
-            s = size_o / (1024 ** m)
+def display_modification_dates(mtimes):
+    """Return the modification date strings of mtimes."""
+    return DATE_FORMATTER.format_many(mtimes)
+
+
+_np = False
+
+
+def _numpy():
+    """Return the numpy module, None if it is not installed (imported on first call)."""
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+class SizeFormatter(object):
+    """
+    File size formatter.
+
+    The sizes are displayed with one decimal in the largest unit (B, kB, ...)
+    in which they are at least 1. The unit is chosen from the bit length of
+    the size and the number of tenths of unit is computed with integer
+    arithmetic (rounded half to even like "%.1f"). The locale decimal and
+    grouping symbols are looked up once and the formatting of each
+    (unit, tenths) pair is memoized.
+    """
+    # the memoized strings are cleared beyond this number
+    maxsize = 100000
+
+    def __init__(self):
+        self._strings = {}  # (unit index, tenths) -> displayed string
+        self._zero = None
+        self._symbols = False  # (group, decimal) symbols, None if unknown
+
+    def clear(self):
+        self._strings.clear()
+        self._zero = None
+        self._symbols = False
+
+    def _get_symbols(self):
+        """Return the (group, decimal) symbols of the locale, None if they cannot be used."""
+        if self._symbols is False:
+            self._symbols = None
+            match = re.match(r"1(\D*)234(\D+)5$", locale_number("1234.5"))
+            if match is not None and locale_number("12.0") == "12":
+                self._symbols = match.groups()
+        return self._symbols
+
+    def _format(self, m, tenths):
+        """Return the string displayed for tenths tenths of the m-th unit."""
+        integer, decimal = divmod(tenths, 10)
+        symbols = self._get_symbols()
+        if symbols is None or integer >= 10000:
+            nb = locale_number("%i.%i" % (integer, decimal))
         else:
-            unit = SIZES[-1]
-            s = size_o / (1024**(len(SIZES) - 1))
-        size = "%s %s" % (locale_number("%.1f" % s), unit)
-    else:
-        size = "0 " + _("B")
-    return size
+            nb = str(integer)
+            if integer >= 1000:
+                nb = nb[0] + symbols[0] + nb[1:]
+            if decimal:
+                nb += symbols[1] + str(decimal)
+        size = "%s %s" % (nb, _(UNITS[m]))
+        if len(self._strings) >= self.maxsize:
+            self._strings.clear()
+        self._strings[m, tenths] = size
+        return size
+
+    def __call__(self, size):
+        """Return the string displayed for size (in bytes)."""
+        if isinstance(size, str):
+            return size
+        if size <= 0:
+            if self._zero is None:
+                self._zero = "0 " + _("B")
+            return self._zero
+        m = min((int(size).bit_length() - 1) // 10, len(UNITS) - 1)
+        unit = 1 << (10 * m)
+        tenths, rem = divmod(size * 10, unit)
+        if 2 * rem > unit or (2 * rem == unit and tenths & 1):
+            tenths += 1
+        try:
+            return self._strings[m, tenths]
+        except KeyError:
+            return self._format(m, tenths)
+
+    def format_many(self, sizes):
+        """
+        Return the list of the strings displayed for sizes.
+
+        The computation is vectorized with numpy if it is installed.
+        """
+        np = _numpy() if len(sizes) > 64 else None
+        if np is not None:
+            try:
+                array = np.array(sizes, dtype=np.int64)
+            except (TypeError, ValueError, OverflowError):
+                # strings like "??" or huge sizes
+                pass
+            else:
+                return self._format_array(np, array)
+        return [self(size) for size in sizes]
+
+    def _format_array(self, np, sizes):
+        positive = sizes > 0
+        m = np.zeros(len(sizes), dtype=np.int64)
+        for i in range(1, len(UNITS)):
+            m += sizes >= (1 << (10 * i))
+        units = np.left_shift(1, 10 * m)
+        tenths, rem = np.divmod(np.where(positive, sizes, 0) * 10, units)
+        tenths += (2 * rem > units) | ((2 * rem == units) & (tenths % 2 == 1))
+        # one key per displayed string
+        keys = np.where(positive, tenths * len(UNITS) + m, -1)
+        uniques, inverse = np.unique(keys, return_inverse=True)
+        strings = self._strings
+        formatted = []
+        for key in uniques.tolist():
+            if key < 0:
+                formatted.append(self(0))
+                continue
+            t, i = divmod(key, len(UNITS))
+            size = strings.get((i, t))
+            if size is None:
+                size = self._format(i, t)
+            formatted.append(size)
+        formatted = np.array(formatted, dtype=object)
+        return formatted[inverse.reshape(-1)].tolist()
+
+
+SIZE_FORMATTER = SizeFormatter()
+
+
+def display_size(size_o):
+    """Return the size string of size_o (in bytes)."""
+    return SIZE_FORMATTER(size_o)
+
+
+def display_sizes(sizes):
+    """Return the size strings of sizes (in bytes)."""
+    return SIZE_FORMATTER.format_many(sizes)
 
 
 def key_sort_files(file):
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Persistent folder listing cache
+
+The listings of large or slow folders are stored on disk so that they
+survive the process. Each listing is a file named after the (st_dev, st_ino)
+of the folder and the backend that made it, in a columnar binary format:
+
+    header (see _HEADER)
+    folder path, utf-8
+    tags: one byte per entry
+    sizes: int64 per entry
+    mtimes: float64 per entry
+    names, size strings, date strings: utf-8, separated by NUL bytes
+
+The file is memory-mapped and each column is loaded at once (array.frombytes
+or a single decode and split), without parsing the entries one by one.
+The files are written to a temporary file and then renamed so that several
+processes can share the cache.
+"""
+
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+from time import time
+from tempfile import mkstemp
+from zlib import crc32
+from tkfilebrowser.constants import LOCAL_PATH, DATE_FORMATTER, get_lang
+
+if sys.version_info[0] < 3:
+    def _encode(text):
+        return text.encode("utf-8")
+
+    def _decode(data):
+        return data.decode("utf-8")
+else:
+    def _encode(text):
+        return text.encode("utf-8", "surrogateescape")
+
+    def _decode(data):
+        return data.decode("utf-8", "surrogateescape")
+
+
+MAGIC = b"TKFBLST1"
+# magic, byte order, dev, ino, mtime_ns, nb of entries, lengths of the
+# path, names, size strings and date strings, locale and day of the strings
+_HEADER = struct.Struct("<8sBQQqIIIII16s16s")
+
+_TAGS = ("folder", "folder_link", "file", "file_link", "link_broken")
+_TAG_CODES = {tag: i for i, tag in enumerate(_TAGS)}
+_BYTEORDER = 0 if sys.byteorder == "little" else 1
+
+NAN = float("nan")
+
+try:
+    _tobytes = array.tobytes
+    _frombytes = array.frombytes
+except AttributeError:
+    # python 2
+    _tobytes = array.tostring
+    _frombytes = array.fromstring
+
+
+def _replace(src, dst):
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        # python 2
+        if os.name == "nt" and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def dumps(folder, key, listing):
+    """Return the binary representation of listing (sequence of :class:`model.Entry`)."""
+    tags = bytearray(_TAG_CODES[e.tag] for e in listing)
+    sizes = array("q", [-2 if e.size is None else e.size for e in listing])
+    mtimes = array("d", [NAN if e.mtime is None else e.mtime for e in listing])
+    path = _encode(folder or "")
+    names = _encode("\0".join([e.name for e in listing]))
+    size_strs = _encode("\0".join([e.size_str for e in listing]))
+    date_strs = _encode("\0".join([e.date_str for e in listing]))
+    today = _encode(DATE_FORMATTER.current_day())[:16]
+    header = _HEADER.pack(MAGIC, _BYTEORDER, key[0], key[1], key[2], len(listing),
+                          len(path), len(names), len(size_strs), len(date_strs),
+                          _encode(get_lang())[:16], today)
+    return b"".join([header, path, bytes(tags), _tobytes(sizes), _tobytes(mtimes),
+                     names, size_strs, date_strs])
+
+
+def loads(data, folder=None, key=None):
+    """
+    Return the listing stored in data (bytes or mmap), None if it is not valid.
+
+    If given, folder and key must be the ones of the listing.
+    """
+    from tkfilebrowser.model import Entry
+    h = _HEADER.size
+    if len(data) < h:
+        return None
+    magic, order, dev, ino, mtime_ns, n, lpath, lnames, lsizes, ldates, lang, day = \
+        _HEADER.unpack(data[:h])
+    if magic != MAGIC or order != _BYTEORDER:
+        return None
+    if key is not None and (dev, ino, mtime_ns) != tuple(key[:3]):
+        return None
+    # the size and date strings depend on the locale and on the current day
+    if lang.rstrip(b"\0") != _encode(get_lang())[:16]:
+        return None
+    if day.rstrip(b"\0") != _encode(DATE_FORMATTER.current_day())[:16]:
+        return None
+    if len(data) != h + lpath + 17 * n + lnames + lsizes + ldates:
+        # truncated
+        return None
+    i = h + lpath
+    if folder is not None and lpath and _decode(data[h:i]) != folder:
+        return None
+    tags = bytearray(data[i:i + n])
+    i += n
+    sizes = array("q")
+    _frombytes(sizes, data[i:i + 8 * n])
+    i += 8 * n
+    mtimes = array("d")
+    _frombytes(mtimes, data[i:i + 8 * n])
+    i += 8 * n
+    if not n:
+        return ()
+    names = _decode(data[i:i + lnames]).split("\0")
+    i += lnames
+    size_strs = _decode(data[i:i + lsizes]).split("\0")
+    i += lsizes
+    date_strs = _decode(data[i:i + ldates]).split("\0")
+    return tuple(Entry(name, _TAGS[tag], None if size == -2 else size,
+                       None if mtime != mtime else mtime, size_str, date_str)
+                 for name, tag, size, mtime, size_str, date_str
+                 in zip(names, tags, sizes, mtimes, size_strs, date_strs))
+
+
+class DiskCache(object):
+    """
+    Persistent cache of the listings of large or slow folders.
+
+    Only the listings with at least min_entries entries, or that took at
+    least min_cost seconds to make, are stored. The least recently used
+    files are removed when the cache exceeds maxbytes.
+    """
+    def __init__(self, path, maxbytes=64 * 1024 * 1024, min_entries=1000,
+                 min_cost=0.5):
+        """
+        Create a disk cache.
+
+        The directory path is only created when the first listing is stored.
+
+        Options:
+            * path: cache directory
+            * maxbytes: maximum size of the cache
+            * min_entries: minimum number of entries of the stored listings
+            * min_cost: minimum listing time (in seconds) of the stored listings
+        """
+        self.path = path
+        self.maxbytes = maxbytes
+        self.min_entries = min_entries
+        self.min_cost = min_cost
+
+    def _file(self, key):
+        if len(key) > 3 and key[3] is not None:
+            # listings of another backend, see ListingCache.lookup
+            name = "%x-%x-%08x.lst" % (key[0], key[1], crc32(_encode(key[3])) & 0xffffffff)
+        else:
+            name = "%x-%x.lst" % (key[0], key[1])
+        return os.path.join(self.path, name)
+
+    def get(self, folder, key):
+        """Return the listing of folder stored under key or None."""
+        filename = self._file(key)
+        try:
+            with open(filename, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    listing = loads(data, folder, key)
+                finally:
+                    data.close()
+        except (OSError, IOError, ValueError):
+            # missing, empty or unreadable file
+            return None
+        if listing is not None:
+            try:
+                os.utime(filename, None)  # most recently used
+            except OSError:
+                pass
+        return listing
+
+    def put(self, folder, key, listing, cost=None):
+        """
+        Store the listing of folder under key, if it is large or slow enough.
+
+        Return whether it was stored.
+        """
+        if len(listing) < self.min_entries and (cost is None or cost < self.min_cost):
+            return False
+        data = dumps(folder, key, listing)
+        if len(data) > self.maxbytes:
+            return False
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            fd, tmp = mkstemp(prefix=".tmp", dir=self.path)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                _replace(tmp, self._file(key))
+            except Exception:
+                os.remove(tmp)
+                raise
+        except (OSError, IOError):
+            # read-only or full file system
+            return False
+        self.evict()
+        return True
+
+    def files(self):
+        """Return the list of the (mtime, size, path) of the cache files."""
+        files = []
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return files
+        for name in names:
+            path = os.path.join(self.path, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                # removed by another process
+                continue
+            if name.endswith(".lst"):
+                files.append((st.st_mtime, st.st_size, path))
+            elif name.startswith(".tmp") and st.st_mtime < time() - 3600:
+                # left by a process killed while writing
+                files.append((0, st.st_size, path))
+        return files
+
+    def evict(self):
+        """Remove the least recently used files until the cache fits in maxbytes."""
+        files = self.files()
+        total = sum(size for mtime, size, path in files)
+        if total <= self.maxbytes:
+            return
+        files.sort()
+        for mtime, size, path in files:
+            if total <= self.maxbytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for mtime, size, path in self.files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# persistent cache used by the FileBrowser instances with the
+# persistent_cache option
+DISK_CACHE = DiskCache(os.path.join(LOCAL_PATH, "listings"))
@@ -24,24 +24,39 @@ Main class
 import psutil
 from re import search
 from subprocess import check_output
-from os import walk, mkdir, stat, access, W_OK, listdir
+from os import walk, mkdir, access, W_OK
 from os import name as OSNAME
 from os.path import sep as SEP
 from os.path import exists, join, getmtime, realpath, split, expanduser, \
-    abspath, isabs, splitext, dirname, getsize, isdir, isfile, islink
+    abspath, isabs, splitext, dirname, getsize, isdir, isfile
+import traceback
+from errno import ENOSPC
+from time import time
+from collections import deque
 try:
-    from os import scandir
-    SCANDIR = True
+    from queue import Queue
 except ImportError:
-    SCANDIR = False
-import traceback
+    from Queue import Queue
 import tkfilebrowser.constants as cst
-from tkfilebrowser.constants import unquote, tk, ttk, key_sort_files, \
-    get_modification_date, display_modification_date, display_size
+from tkfilebrowser.constants import unquote, tk, ttk, \
+    display_modification_dates, display_sizes
 from tkfilebrowser.autoscrollbar import AutoScrollbar
 from tkfilebrowser.path_button import PathButton
 from tkfilebrowser.tooltip import TooltipTreeWrapper
 from tkfilebrowser.recent_files import RecentFiles
+from tkfilebrowser.scanner import FolderScanner, Empty
+from tkfilebrowser.model import DirectoryModel, BACKENDS, stat_item, path_info
+from tkfilebrowser.statpool import STAT_POOL, StatTimeout
+from tkfilebrowser.columns import FOLDER, BROKEN, flags_tag
+from tkfilebrowser.filetypes import FiletypeMatcher, ALL_FILES
+from tkfilebrowser.prefetch import Prefetcher
+from tkfilebrowser.icons import get_icons
+from tkfilebrowser.styles import setup_styles
+from tkfilebrowser.diskcache import DISK_CACHE
+from tkfilebrowser.virtual_tree import VirtualTreeview
+from tkfilebrowser.watcher import InotifyWatcher, PollingWatcher, \
+    WatcherError, inotify_available
+from tkfilebrowser import bulk
 
 if OSNAME == 'nt':
     from win32com.shell import shell, shellcon
@@ -49,16 +64,20 @@ if OSNAME == 'nt':
 _ = cst._
 
 
-class Stats:
-    """Fake stats class to create dummy stats for broken links."""
-    def __init__(self, **kwargs):
-        self._prop = kwargs
+def _recent_file_info(path):
+    """Return (path, tag, size, mtime) for the recent files view."""
+    return (path,) + path_info(path)
 
-    def __getattr__(self, attr):
-        if attr not in self._prop:
-            raise AttributeError("Stats has no attribute %s." % attr)
-        else:
-            return self._prop[attr]
+
+def _recent_folder_info(path):
+    """Return (folder, tag, size, mtime) for the recent folders view."""
+    tag, size, mtime = path_info(path)
+    if tag is not None and tag[:4] == "file":
+        path = dirname(path)
+        tag, size, mtime = path_info(path)
+    if tag is not None and tag[:6] != "folder":
+        tag = None
+    return path, tag, size, mtime
 
 
 class FileBrowser(tk.Toplevel):
@@ -66,7 +85,9 @@ class FileBrowser(tk.Toplevel):
     def __init__(self, parent, initialdir="", initialfile="", mode="openfile",
                  multiple_selection=False, defaultext="", title="Filebrowser",
                  filetypes=[], okbuttontext=None, cancelbuttontext=_("Cancel"),
-                 foldercreation=True, **kw):
+                 foldercreation=True, background_scan=False, virtual_list=False,
+                 lazy_stat=False, stat_timeout=5, live_refresh=False, prefetch=0,
+                 persistent_cache=False, **kw):
         """
         Create a filebrowser dialog.
 
@@ -107,6 +128,49 @@ class FileBrowser(tk.Toplevel):
 
         foldercreation : bool
             enable the user to create new folders if True (default)
+
+        background_scan : bool
+            list and stat the folder content in a background thread and
+            display it progressively so that the dialog stays responsive
+            with very large folders (default is False)
+
+        virtual_list : bool
+            keep the folder content in memory and only create the rows that
+            are visible, to browse folders with millions of entries
+            (default is False)
+
+        lazy_stat : bool
+            list the folder content without stat'ing the items, the size
+            and modification date of the visible rows are then fetched in a
+            background thread (default is False)
+
+        stat_timeout : float
+            maximum time in seconds to wait for the file system (e.g. an
+            unreachable network mount): the cells whose data did not arrive
+            in time display "??" and a folder that cannot be listed in time
+            is listed in the background (default is 5)
+
+        live_refresh : bool or str
+            watch the displayed folder and update the rows of the items that
+            are created, deleted, renamed or modified (default is False).
+            With True, inotify is used on Linux and the folder is polled
+            elsewhere. Use "poll" to always poll the folder (e.g. on network
+            file systems where inotify does not report remote changes): it
+            is only listed again when its modification time changes, and
+            changes of the content of the files are not reported.
+
+        prefetch : int
+            once a folder is displayed and the dialog is idle, list in the
+            background up to this number of entries of the folders the user
+            is likely to open next (parent, history neighbours and subfolders)
+            so that they are displayed from the cache (default is 0, disabled)
+
+        persistent_cache : bool
+            also store the listings of large or slow folders on disk, in the
+            tkfilebrowser configuration folder, so that they are displayed
+            from the cache after a restart while they did not change. This
+            applies to the listing cache shared by all the dialogs
+            (default is False)
         """
         # compatibility with tkinter.filedialog arguments: the parent window is called 'master'
         if 'master' in kw and parent is None:
@@ -115,11 +179,15 @@ class FileBrowser(tk.Toplevel):
             defaultext = kw.pop('defaultextension')
         tk.Toplevel.__init__(self, parent, **kw)
 
-        # python version compatibility
-        if SCANDIR:
-            self.display_folder = self._display_folder_scandir
+        # content of the displayed folder
+        if lazy_stat and "scandir_lazy" in BACKENDS:
+            self._model = DirectoryModel(backend="scandir_lazy")
         else:
-            self.display_folder = self._display_folder_walk
+            self._model = DirectoryModel()
+        if persistent_cache and self._model.cache.disk is None:
+            self._model.cache.disk = DISK_CACHE
+        self._background_scan = background_scan
+        self._stat_timeout = stat_timeout
 
         # keep track of folders to be able to move backward/foreward in history
         if initialdir:
@@ -144,89 +212,85 @@ class FileBrowser(tk.Toplevel):
         self.hide = False
         # hidden items
         self.hidden = ()
-
-        # ---  style
-        style = ttk.Style(self)
-        bg = style.lookup("TFrame", "background")
-        style.layout("right.tkfilebrowser.Treeview.Item",
-                     [('Treeitem.padding',
-                       {'children':
-                           [('Treeitem.image', {'side': 'left', 'sticky': ''}),
-                            ('Treeitem.focus',
-                             {'children':
-                                 [('Treeitem.text',
-                                   {'side': 'left', 'sticky': ''})],
-                              'side': 'left',
-                              'sticky': ''})],
-                        'sticky': 'nswe'})])
-        style.layout("left.tkfilebrowser.Treeview.Item",
-                     [('Treeitem.padding',
-                       {'children':
-                           [('Treeitem.image', {'side': 'left', 'sticky': ''}),
-                            ('Treeitem.focus',
-                             {'children':
-                                 [('Treeitem.text', {'side': 'left', 'sticky': ''})],
-                              'side': 'left',
-                              'sticky': ''})],
-                        'sticky': 'nswe'})])
-        style.configure("right.tkfilebrowser.Treeview", font="TkDefaultFont")
-        style.configure("right.tkfilebrowser.Treeview.Item", padding=2)
-        style.configure("right.tkfilebrowser.Treeview.Heading",
-                        font="TkDefaultFont")
-        style.configure("left.tkfilebrowser.Treeview.Heading",
-                        font="TkDefaultFont")
-        style.configure("left.tkfilebrowser.Treeview.Item", padding=2)
-        style.configure("listbox.tkfilebrowser.TFrame", background="white", relief="sunken")
-        field_bg = style.lookup("TEntry", "fieldbackground", default='white')
-        tree_field_bg = style.lookup("ttk.Treeview", "fieldbackground",
-                                     default='white')
-        fg = style.lookup('TLabel', 'foreground', default='black')
-        active_bg = style.lookup('TButton', 'background', ('active',))
-        sel_bg = style.lookup('Treeview', 'background', ('selected',))
-        sel_fg = style.lookup('Treeview', 'foreground', ('selected',))
-        self.option_add('*TCombobox*Listbox.selectBackground', sel_bg)
-        self.option_add('*TCombobox*Listbox.selectForeground', sel_fg)
-        style.map('types.tkfilebrowser.TCombobox', foreground=[], fieldbackground=[])
-        style.configure('types.tkfilebrowser.TCombobox', lightcolor=bg,
-                        fieldbackground=bg)
-        style.configure('types.tkfilebrowser.TCombobox.Item', background='red')
-        style.configure("left.tkfilebrowser.Treeview", background=active_bg,
-                        font="TkDefaultFont",
-                        fieldbackground=active_bg)
+        # whether the rows out of view may have the wrong stripe tag
+        self._stripes_dirty = False
+        # (first, last) fractions of the tree restriped since it is dirty
+        self._striped = None
+        # items detached because they do not match the filetype
+        self._filtered = set()
+
+        # background scanning
+        self._generation = 0  # id of the current navigation
+        self._scanner = None
+        self._listing_call = None    # listing that did not return in time
+        self._redisplay = None       # (previous, sorting) arguments of _update_rows
+        self._scan_after_id = None
+        self._scan_selection = None  # item to select once it is displayed
+        self._access_call = None     # write access check of the displayed folder
+        self._access_after_id = None
+        # background stat of the visible rows
+        self._stat_queue = Queue()    # returned stat calls
+        self._stat_calls = deque()    # pending stat calls, in submission order
+        self._stat_late = set()       # stat calls that did not return in time
+        self._stat_after_id = None
+        self._stat_visible_id = None
+        self._stat_requested = set()  # rows whose stats were requested
+        self._after_stats = None      # called once the rows in _stats_waited are stat'ed
+        self._stats_waited = set()
+        # live refresh of the displayed folder
+        self._watcher = None
+        if live_refresh:
+            if live_refresh != "poll" and inotify_available():
+                try:
+                    self._watcher = InotifyWatcher()
+                except WatcherError:
+                    pass
+            if self._watcher is None:
+                self._watcher = PollingWatcher(self._model.names)
+        self._watch_after_id = None
+        self._watch_call = None      # pending watch of the displayed folder
+        self._watch_changes = set()  # names of the changed items, not applied yet
+        # speculative listing of the next folders
+        if prefetch:
+            self._prefetcher = Prefetcher(prefetch, cache=self._model.cache,
+                                          backend=self._model.backend)
+            self.bind("<KeyPress>", self._schedule_prefetch, add=True)
+            self.bind("<ButtonPress>", self._schedule_prefetch, add=True)
+        else:
+            self._prefetcher = None
+        self._prefetch_after_id = None
+
+        # ---  style, registered once per interpreter and theme
+        colors = setup_styles(self)
+        bg = colors["bg"]
+        field_bg = colors["field_bg"]
+        tree_field_bg = colors["tree_field_bg"]
+        fg = colors["fg"]
+        active_bg = colors["active_bg"]
+        sel_bg = colors["sel_bg"]
+        sel_fg = colors["sel_fg"]
         self.configure(background=bg)
-        # path button style
-        style.configure("path.tkfilebrowser.TButton", padding=2)
-        selected_bg = style.lookup("TButton", "background", ("pressed",))
-        map_bg = style.map("TButton", "background")
-        map_bg.append(("selected", selected_bg))
-        style.map("path.tkfilebrowser.TButton",
-                  background=map_bg,
-                  font=[("selected", "TkDefaultFont 9 bold")])
-        # tooltip style
-        style.configure('tooltip.tkfilebrowser.TLabel', background='black',
-                        foreground='white')
-
-        # ---  images
-        self.im_file = cst.PhotoImage(file=cst.IM_FILE, master=self)
-        self.im_folder = cst.PhotoImage(file=cst.IM_FOLDER, master=self)
-        self.im_desktop = cst.PhotoImage(file=cst.IM_DESKTOP, master=self)
-        self.im_file_link = cst.PhotoImage(file=cst.IM_FILE_LINK, master=self)
-        self.im_link_broken = cst.PhotoImage(file=cst.IM_LINK_BROKEN, master=self)
-        self.im_folder_link = cst.PhotoImage(file=cst.IM_FOLDER_LINK, master=self)
-        self.im_new = cst.PhotoImage(file=cst.IM_NEW, master=self)
-        self.im_drive = cst.PhotoImage(file=cst.IM_DRIVE, master=self)
-        self.im_home = cst.PhotoImage(file=cst.IM_HOME, master=self)
-        self.im_recent = cst.PhotoImage(file=cst.IM_RECENT, master=self)
-        self.im_recent_24 = cst.PhotoImage(file=cst.IM_RECENT_24, master=self)
+
+        # ---  images, shared by the dialogs of the interpreter
+        icons = get_icons(self)
+        self.im_file = icons["file"]
+        self.im_folder = icons["folder"]
+        self.im_desktop = icons["desktop"]
+        self.im_file_link = icons["file_link"]
+        self.im_link_broken = icons["link_broken"]
+        self.im_folder_link = icons["folder_link"]
+        self.im_new = icons["new_folder"]
+        self.im_drive = icons["drive"]
+        self.im_home = icons["home"]
+        self.im_recent = icons["recent"]
+        self.im_recent_24 = icons["recent_24"]
 
         # ---  filetypes
         self.filetype = tk.StringVar(self)
-        self.filetypes = {}
+        self.filetypes = {}  # name -> FiletypeMatcher
         if filetypes:
             for name, exts in filetypes:
-                if name not in self.filetypes:
-                    self.filetypes[name] = []
-                self.filetypes[name] = r'%s$' % exts.strip().replace('.', '\.').replace('*', '.*')
+                self.filetypes[name] = FiletypeMatcher(exts)
             values = list(self.filetypes.keys())
             w = max([len(f) for f in values] + [5])
             b_filetype = ttk.Combobox(self, textvariable=self.filetype,
@@ -241,7 +305,7 @@ class FileBrowser(tk.Toplevel):
             except AttributeError:
                 self.filetype.trace('w', lambda *args: self._change_filetype())
         else:
-            self.filetypes[""] = r".*$"
+            self.filetypes[""] = ALL_FILES
 
         # ---  recent files
         self._recent_files = RecentFiles(cst.RECENT_FILES, 30)
@@ -409,10 +473,18 @@ class FileBrowser(tk.Toplevel):
         else:
             selectmode = "browse"
 
-        self.right_tree = ttk.Treeview(right_pane, selectmode=selectmode,
-                                       style="right.tkfilebrowser.Treeview",
-                                       columns=("location", "size", "date"),
-                                       displaycolumns=("size", "date"))
+        self._virtual_list = virtual_list
+        if virtual_list:
+            self.right_tree = VirtualTreeview(right_pane, stripes=("0", "1"),
+                                              selectmode=selectmode,
+                                              style="right.tkfilebrowser.Treeview",
+                                              columns=("location", "size", "date"),
+                                              displaycolumns=("size", "date"))
+        else:
+            self.right_tree = ttk.Treeview(right_pane, selectmode=selectmode,
+                                           style="right.tkfilebrowser.Treeview",
+                                           columns=("location", "size", "date"),
+                                           displaycolumns=("size", "date"))
         # headings
         self.right_tree.heading("#0", text=_("Name"), anchor="w",
                                 command=lambda: self._sort_files_by_name(True))
@@ -444,9 +516,9 @@ class FileBrowser(tk.Toplevel):
         self._scroll_h = AutoScrollbar(right_pane, orient='horizontal',
                                        command=self.right_tree.xview)
         self._scroll_h.grid(row=1, column=0, sticky='ew')
-        scroll_right = AutoScrollbar(right_pane, command=self.right_tree.yview)
-        scroll_right.grid(row=0, column=1, sticky="ns")
-        self.right_tree.configure(yscrollcommand=scroll_right.set,
+        self._scroll_v = AutoScrollbar(right_pane, command=self.right_tree.yview)
+        self._scroll_v.grid(row=0, column=1, sticky="ns")
+        self.right_tree.configure(yscrollcommand=self._on_yscroll,
                                   xscrollcommand=self._scroll_h.set)
 
         # ---  buttons
@@ -480,6 +552,8 @@ class FileBrowser(tk.Toplevel):
         if initialpath in self.right_tree.get_children(""):
             self.right_tree.see(initialpath)
             self.right_tree.selection_add(initialpath)
+        elif self._scanner is not None or self._listing_call is not None:
+            self._scan_selection = abspath(initialpath)
 
         # ---  bindings
         # filetype combobox
@@ -544,7 +618,14 @@ class FileBrowser(tk.Toplevel):
             self.entry.focus_set()
 
     def _right_tree_select_all(self, event):
-        if self.mode == "openpath":
+        if self._model.folder is not None:
+            if self.mode == "openpath":
+                items = self._model.select(BROKEN, 0, self.hide)
+            elif self.mode == 'opendir':
+                items = self._model.select(FOLDER | BROKEN, FOLDER, self.hide)
+            else:
+                items = self._model.select(FOLDER | BROKEN, 0, self.hide)
+        elif self.mode == "openpath":
             items = self.right_tree.tag_has('folder') + self.right_tree.tag_has('folder_link') \
                 + self.right_tree.tag_has('file') + self.right_tree.tag_has('file_link')
         elif self.mode == 'opendir':
@@ -586,7 +667,10 @@ class FileBrowser(tk.Toplevel):
         self.key_browse_entry.unbind("<Down>")
         deb = self.key_browse_entry.get().lower()
         if deb:
-            if self.mode == 'opendir':
+            if self.mode == 'opendir' and self._model.folder is not None:
+                children = self._model.select(FOLDER | BROKEN, FOLDER, self.hide)
+                children.sort()
+            elif self.mode == 'opendir':
                 children = list(self.right_tree.tag_has("folder"))
                 children.extend(self.right_tree.tag_has("folder_link"))
                 children.sort()
@@ -624,19 +708,17 @@ class FileBrowser(tk.Toplevel):
     # ---  column sorting
     def _sort_files_by_name(self, reverse):
         """Sort files and folders by (reversed) alphabetical order."""
-        files = list(self.right_tree.tag_has("file"))
-        files.extend(list(self.right_tree.tag_has("file_link")))
-        folders = list(self.right_tree.tag_has("folder"))
-        folders.extend(list(self.right_tree.tag_has("folder_link")))
-        files.sort(reverse=reverse)
-        folders.sort(reverse=reverse)
-
-        for index, item in enumerate(folders):
-            self.move_item(item, index)
-        l = len(folders)
-
-        for index, item in enumerate(files):
-            self.move_item(item, index + l)
+        if self._model.folder is not None:
+            self._reorder(self._model.sort("name", reverse, self.hide))
+        else:
+            # recent files
+            files = list(self.right_tree.tag_has("file"))
+            files.extend(list(self.right_tree.tag_has("file_link")))
+            folders = list(self.right_tree.tag_has("folder"))
+            folders.extend(list(self.right_tree.tag_has("folder_link")))
+            files.sort(reverse=reverse)
+            folders.sort(reverse=reverse)
+            self._reorder(folders + files)
         self.right_tree.heading("#0",
                                 command=lambda: self._sort_files_by_name(not reverse))
 
@@ -644,51 +726,68 @@ class FileBrowser(tk.Toplevel):
         """Sort files by location."""
         l = [(self.right_tree.set(k, "location"), k) for k in self.right_tree.get_children('')]
         l.sort(reverse=reverse)
-        for index, (val, k) in enumerate(l):
-            self.move_item(k, index)
+        self._reorder([k for val, k in l])
         self.right_tree.heading("location",
                                 command=lambda: self._sort_by_location(not reverse))
 
     def _sort_by_size(self, reverse):
         """Sort files by size."""
-        files = list(self.right_tree.tag_has("file"))
-        files.extend(list(self.right_tree.tag_has("file_link")))
-        nb_folders = len(self.right_tree.tag_has("folder"))
-        nb_folders += len(list(self.right_tree.tag_has("folder_link")))
-        files.sort(reverse=reverse, key=getsize)
-
-        for index, item in enumerate(files):
-            self.move_item(item, index + nb_folders)
+        if self._model.folder is not None:
+            if self._wait_stats(lambda: self._sort_by_size(reverse)):
+                return
+            self._reorder(self._model.sort("size", reverse, self.hide))
+        else:
+            # recent files
+            files = list(self.right_tree.tag_has("file"))
+            files.extend(list(self.right_tree.tag_has("file_link")))
+            folders = list(self.right_tree.tag_has("folder"))
+            folders.extend(list(self.right_tree.tag_has("folder_link")))
+            # keep folders in their current order
+            position = {item: i for i, item in enumerate(self.right_tree.get_children(""))}
+            folders.sort(key=position.get)
+            files.sort(reverse=reverse, key=getsize)
+            self._reorder(folders + files)
 
         self.right_tree.heading("size",
                                 command=lambda: self._sort_by_size(not reverse))
 
     def _sort_by_date(self, reverse):
         """Sort files and folders by modification date."""
-        files = list(self.right_tree.tag_has("file"))
-        files.extend(list(self.right_tree.tag_has("file_link")))
-        folders = list(self.right_tree.tag_has("folder"))
-        folders.extend(list(self.right_tree.tag_has("folder_link")))
-        l = len(folders)
-        folders.sort(reverse=reverse, key=getmtime)
-        files.sort(reverse=reverse, key=getmtime)
-
-        for index, item in enumerate(folders):
-            self.move_item(item, index)
-        for index, item in enumerate(files):
-            self.move_item(item, index + l)
+        if self._model.folder is not None:
+            if self._wait_stats(lambda: self._sort_by_date(reverse)):
+                return
+            self._reorder(self._model.sort("date", reverse, self.hide))
+        else:
+            # recent files
+            files = list(self.right_tree.tag_has("file"))
+            files.extend(list(self.right_tree.tag_has("file_link")))
+            folders = list(self.right_tree.tag_has("folder"))
+            folders.extend(list(self.right_tree.tag_has("folder_link")))
+            folders.sort(reverse=reverse, key=getmtime)
+            files.sort(reverse=reverse, key=getmtime)
+            self._reorder(folders + files)
 
         self.right_tree.heading("date",
                                 command=lambda: self._sort_by_date(not reverse))
 
     # ---  file selection
+    def _item_tag(self, item):
+        """Return the type of item: "folder", "folder_link", "file", "file_link" or "link_broken"."""
+        flags = self._model.flags(item)
+        if flags is not None:
+            return flags_tag(flags)
+        # recent files
+        for tag in self.right_tree.item(item, "tags"):
+            if tag in ("folder", "folder_link", "file", "file_link", "link_broken"):
+                return tag
+        return ""
+
     def _file_selection_save(self, event):
         """Save mode only: put selected file name in name_entry."""
         sel = self.right_tree.selection()
         if sel:
             sel = sel[0]
-            tags = self.right_tree.item(sel, "tags")
-            if ("file" in tags) or ("file_link" in tags):
+            if self._item_tag(sel) in ("file", "file_link"):
                 self.entry.delete(0, "end")
                 if self.path_bar.winfo_ismapped():
                     self.entry.insert(0, self.right_tree.item(sel, "text"))
@@ -715,8 +814,7 @@ class FileBrowser(tk.Toplevel):
         sel = self.right_tree.selection()
         if sel:
             for s in sel:
-                tags = self.right_tree.item(s, "tags")
-                if ("file" in tags) or ("file_link" in tags):
+                if self._item_tag(s) in ("file", "file_link"):
                     self.right_tree.selection_remove(s)
             sel = self.right_tree.selection()
             if len(sel) == 1 and self.entry.winfo_ismapped():
@@ -748,67 +846,50 @@ class FileBrowser(tk.Toplevel):
         self.right_tree.column("date", width=120)
         if self.foldercreation:
             self.b_new_folder.grid_remove()
-        extension = self.filetypes[self.filetype.get()]
+        self._stop_scan()
+        self._unwatch()
+        self._model.clear()
+        matcher = self.filetypes[self.filetype.get()]
         files = self._recent_files.get()
-        self.right_tree.delete(*self.right_tree.get_children(""))
-        i = 0
+        self._clear_tree()
+        # get the type, size and date of the files in parallel, without
+        # blocking more than self._stat_timeout on unreachable mounts
         if self.mode == "opendir":
-            paths = []
-            for p in files:
-                if isfile(p):
-                    p = dirname(p)
-                d, f = split(p)
-                tags = [str(i % 2)]
-                vals = ()
-                if f:
-                    if f[0] == ".":
-                        tags.append("hidden")
-                else:
-                    f = "/"
-                if isdir(p):
-                    if islink(p):
-                        tags.append("folder_link")
-                    else:
-                        tags.append("folder")
-                    vals = (p, "", get_modification_date(p))
-                if vals and p not in paths:
-                    i += 1
-                    paths.append(p)
-                    self.right_tree.insert("", "end", p, text=f, tags=tags,
-                                           values=vals)
+            func = _recent_folder_info
         else:
-            for p in files:
-                d, f = split(p)
-                tags = [str(i % 2)]
-                vals = ()
-                if f:
-                    if f[0] == ".":
-                        tags.append("hidden")
-                else:
-                    f = "/"
-                if islink(p):
-                    if isfile(p):
-                        if extension == r".*$" or search(extension, f):
-                            tags.append("file_link")
-                            stats = stat(p)
-                            vals = (p, display_size(stats.st_size),
-                                    display_modification_date(stats.st_mtime))
-                    elif isdir(p):
-                        tags.append("folder_link")
-                        vals = (p, "", get_modification_date(p))
-                elif isfile(p):
-                    if extension == r".*$" or search(extension, f):
-                        tags.append("file")
-                        stats = stat(p)
-                        vals = (p, display_size(stats.st_size),
-                                display_modification_date(stats.st_mtime))
-                elif isdir(p):
-                    tags.append("folder")
-                    vals = (p, "", get_modification_date(p))
-                if vals:
-                    i += 1
-                    self.right_tree.insert("", "end", p, text=f, tags=tags,
-                                           values=vals)
+            func = _recent_file_info
+        calls = [STAT_POOL.submit(func, p, timeout=self._stat_timeout) for p in files]
+        i = 0
+        rows = []
+        sizes = []
+        mtimes = []
+        paths = set()
+        for call in calls:
+            try:
+                p, tag, size, mtime = call.wait()
+            except StatTimeout:
+                p, tag, size, mtime = call.args[0], "link_broken", "??", "??"
+            if tag is None or p in paths:
+                continue
+            d, f = split(p)
+            if tag[:4] == "file" and not matcher(f):
+                continue
+            paths.add(p)
+            tags = [str(i % 2)]
+            if f:
+                if f[0] == ".":
+                    tags.append("hidden")
+            else:
+                f = "/"
+            tags.append(tag)
+            i += 1
+            rows.append((p, f, tags, [p]))
+            sizes.append("" if tag[:6] == "folder" else size)
+            mtimes.append(mtime)
+        for row, size, date in zip(rows, display_sizes(sizes),
+                                   display_modification_dates(mtimes)):
+            row[3].extend((size, date))
+        bulk.insert_rows(self.right_tree, rows)
 
     def _select(self, event):
         """display folder content on double click / Enter, validate if file."""
@@ -836,16 +917,15 @@ class FileBrowser(tk.Toplevel):
     def _change_filetype(self):
         """Update view on filetype change."""
         if self.path_bar.winfo_ismapped():
-            self.display_folder(self.history[self._hist_index])
+            self._filter_rows()
         else:
             self._display_recents()
         if self.mode == 'save':
             filename = self.entry.get()
-            new_ext = self.filetypes[self.filetype.get()]
-            if filename and not search(new_ext, filename):
+            matcher = self.filetypes[self.filetype.get()]
+            if filename and not matcher(filename):
                 old_ext = search(r'\..+$', filename).group()
-                exts = [e[2:].replace('\.', '.') for e in new_ext[:-1].split('|')]
-                exts = [e for e in exts if search(r'\.[^\*]+$', e)]
+                exts = matcher.extensions
                 if exts:
                     filename = filename.replace(old_ext, exts[0])
                 self.entry.delete(0, 'end')
@@ -905,13 +985,10 @@ class FileBrowser(tk.Toplevel):
                     l2 = []
                     if self.mode != "opendir":
                         files.sort(key=lambda n: n.lower())
-                        extension = self.filetypes[self.filetype.get()]
-                        if extension == r".*$":
-                            l2.extend([i.replace(" ", "\ ") for i in files if i[:len(f)] == f])
-                        else:
-                            for i in files:
-                                if search(extension, i) and i[:len(f)] == f:
-                                    l2.append(i.replace(" ", "\ "))
+                        files = [i for i in files if i[:len(f)] == f]
+                        matches = self.filetypes[self.filetype.get()].match_many(files)
+                        l2.extend([i.replace(" ", "\ ") for i, match in zip(files, matches)
+                                   if match])
                     l2.extend([i.replace(" ", "\ ") + "/" for i in dirs if i[:len(f)] == f])
 
                 except StopIteration:
@@ -1008,12 +1085,11 @@ class FileBrowser(tk.Toplevel):
             self.path_bar_buttons.append(b)
             b.grid(row=0, column=i + 2, sticky="ns")
 
-    def _display_folder_listdir(self, folder, reset=True, update_bar=True):
+    def _prepare_display(self, folder, reset=True, update_bar=True):
         """
-        Display the content of folder in self.right_tree.
-        Arguments:
-            * reset (boolean): forget all the part of the history right of self._hist_index
-            * update_bar (boolean): update the buttons in path bar
+        Update layout, history and path bar before displaying folder.
+
+        Return the absolute path of folder.
         """
         # remove trailing / if any
         folder = abspath(folder)
@@ -1041,254 +1117,609 @@ class FileBrowser(tk.Toplevel):
         self.path_var.set(folder)
         # disable new folder creation if no write access
         if self.foldercreation:
-            if access(folder, W_OK):
+            # the access is checked in the background, the button is enabled
+            # by _poll_access
+            self.b_new_folder.state(('disabled',))
+            self._access_call = STAT_POOL.submit(access, folder, W_OK,
+                                                 timeout=self._stat_timeout)
+            self._access_after_id = self.after(10, self._poll_access,
+                                               self._generation)
+        return folder
+
+    def _poll_access(self, generation):
+        """Enable the new folder button if the displayed folder is writable."""
+        self._access_after_id = None
+        call = self._access_call
+        if call is None or generation != self._generation:
+            return
+        if call.done():
+            self._access_call = None
+            if call.error is None and call.result:
                 self.b_new_folder.state(('!disabled',))
-            else:
-                self.b_new_folder.state(('disabled',))
-        # clear self.right_tree
-        self.right_tree.delete(*self.right_tree.get_children(""))
-        self.right_tree.delete(*self.hidden)
-        self.hidden = ()
-        root = folder
-        extension = self.filetypes[self.filetype.get()]
-        content = listdir(folder)
-        i = 0
-        for f in content:
-            p = join(root, f)
-            if f[0] == ".":
-                tags = ("hidden",)
-                if not self.hide:
-                    tags = (str(i % 2),)
-                    i += 1
-            else:
-                tags = (str(i % 2),)
-                i += 1
-            if isfile(p):
-                if extension == r".*$" or search(extension, f):
-                    if islink(p):
-                        tags = tags + ("file_link",)
-                    else:
-                        tags = tags + ("file",)
-                    try:
-                        stats = stat(p)
-                    except OSError:
-                        self.right_tree.insert("", "end", p, text=f, tags=tags,
-                                               values=("", "??", "??"))
-                    else:
-                        self.right_tree.insert("", "end", p, text=f, tags=tags,
-                                               values=("",
-                                                       display_size(stats.st_size),
-                                                       display_modification_date(stats.st_mtime)))
-            elif isdir(p):
-                if islink(p):
-                    tags = tags + ("folder_link",)
-                else:
-                    tags = tags + ("folder",)
-
-                self.right_tree.insert("", "end", p, text=f, tags=tags,
-                                       values=("", "", get_modification_date(p)))
-            else:  # broken link
-                tags = tags + ("link_broken",)
-                self.right_tree.insert("", "end", p, text=f, tags=tags,
-                                       values=("", "??", "??"))
-
-        items = self.right_tree.get_children("")
-        if items:
-            self.right_tree.focus_set()
-            self.right_tree.focus(items[0])
-        if self.hide:
-            self.hidden = self.right_tree.tag_has("hidden")
-            self.right_tree.detach(*self.right_tree.tag_has("hidden"))
-        self._sort_files_by_name(False)
+        elif call.expired():
+            # unreachable folder
+            self._access_call = None
+        else:
+            self._access_after_id = self.after(10, self._poll_access, generation)
 
-    def _display_folder_walk(self, folder, reset=True, update_bar=True):
+    def display_folder(self, folder, reset=True, update_bar=True):
         """
         Display the content of folder in self.right_tree.
+
+        The content is loaded in self._model, from the shared listing cache if
+        the folder did not change since it was last listed. With the
+        *background_scan* option, the folder is scanned in a background thread
+        and the rows are inserted by batches from the GUI thread so that the
+        dialog stays responsive. If the folder cannot be listed within
+        *stat_timeout*, the rows are inserted once the listing returns.
+
+        When the displayed folder is displayed again (e.g. after a folder
+        creation or a filetype change), only the rows that changed are updated.
+
         Arguments:
             * reset (boolean): forget all the part of the history right of self._hist_index
             * update_bar (boolean): update the buttons in path bar
         """
-        # remove trailing / if any
-        folder = abspath(folder)
-        # reorganize display if previous was 'recent'
-        if not self.path_bar.winfo_ismapped():
-            self.path_bar.grid()
-            self.right_tree.configure(displaycolumns=("size", "date"))
-            w = self.right_tree.winfo_width() - 205
-            if w < 0:
-                w = 250
-            self.right_tree.column("#0", width=w)
-            self.right_tree.column("size", stretch=False, width=85)
-            self.right_tree.column("date", width=120)
-            if self.foldercreation:
-                self.b_new_folder.grid()
-        # reset history
-        if reset:
-            if not self._hist_index == -1:
-                self.history = self.history[:self._hist_index + 1]
-                self._hist_index = -1
-            self.history.append(folder)
-        # update path bar
-        if update_bar:
-            self._update_path_bar(folder)
-        self.path_var.set(folder)
-        # disable new folder creation if no write access
-        if self.foldercreation:
-            if access(folder, W_OK):
-                self.b_new_folder.state(('!disabled',))
+        self._stop_scan()
+        folder = self._prepare_display(folder, reset, update_bar)
+        # the folder is listed once it is watched so that no change is missed,
+        # unless the watch does not return in time
+        deadline = time() + self._stat_timeout
+        call = self._watch(folder)
+        if call is not None:
+            try:
+                call.wait()
+            except OSError:
+                # timeout or watch error, handled by _poll_watcher
+                pass
+        timeout = max(0, deadline - time())
+        if folder == self._model.folder:
+            previous = self._model.displayed()
+        else:
+            previous = None
+        # the sort of the displayed folder is kept when it is displayed again
+        sorting = self._model.sorting
+        if not self._background_scan:
+            try:
+                self._model.load(folder, STAT_POOL, timeout)
+            except StatTimeout as e:
+                # slow file system: wait for the listing in the background
+                if previous is None:
+                    self._clear_tree()
+                    self._model.clear(folder)
+                else:
+                    # the displayed rows are updated once the folder is listed
+                    self._redisplay = (previous, sorting)
+                self._listing_call = e.call
+                self._scan_after_id = self.after(10, self._poll_listing,
+                                                 self._generation)
+                return
+            except FileNotFoundError:
+                self.display_folder(expanduser('~'), reset=True, update_bar=True)
+                return
+            except PermissionError as e:
+                self._clear_tree()
+                cst.showerror('PermissionError', str(e), master=self)
+                return
             else:
-                self.b_new_folder.state(('disabled',))
-        # clear self.right_tree
+                if previous is None:
+                    self._clear_tree()
+                    self._insert_rows(0)
+                else:
+                    self._update_rows(previous, sorting)
+                self._schedule_prefetch()
+                return
+        if previous is None:
+            self._clear_tree()
+        else:
+            # the displayed rows are updated once the folder is scanned
+            self._redisplay = (previous, sorting)
+        self._model.clear(folder)
+        self._scanner = FolderScanner(folder, generation=self._generation,
+                                      cache=self._model.cache,
+                                      backend=self._model.backend)
+        self._scanner.start()
+        self._scan_after_id = self.after(5, self._poll_scan, self._generation)
+
+    def _poll_listing(self, generation):
+        """Display the folder once its listing, that timed out, returns."""
+        self._scan_after_id = None
+        call = self._listing_call
+        if call is None or generation != self._generation:
+            # superseded listing
+            return
+        if not call.done():
+            self._scan_after_id = self.after(50, self._poll_listing, generation)
+            return
+        self._listing_call = None
+        redisplay = self._redisplay
+        self._redisplay = None
+        try:
+            self._model.load_call(call)
+        except FileNotFoundError:
+            self.display_folder(expanduser('~'), reset=True, update_bar=True)
+        except OSError as e:
+            self._clear_tree()
+            cst.showerror(e.__class__.__name__, str(e), master=self)
+        else:
+            if redisplay is None:
+                self._insert_rows(0)
+            else:
+                self._update_rows(*redisplay)
+            self._schedule_prefetch()
+
+    def _stop_scan(self):
+        """
+        Start a new navigation: cancel the current background scan.
+
+        The scanner thread stops enumerating and stat'ing the folder and
+        the rows that were not displayed yet are discarded.
+        """
+        self._generation += 1
+        self._cancel_prefetch()
+        if self._scan_after_id is not None:
+            self.after_cancel(self._scan_after_id)
+            self._scan_after_id = None
+        if self._scanner is not None:
+            self._scanner.cancel()
+            self._scanner = None
+        self._listing_call = None
+        self._redisplay = None
+        self._scan_selection = None
+        if self._access_after_id is not None:
+            self.after_cancel(self._access_after_id)
+            self._access_after_id = None
+        if self._access_call is not None:
+            self._access_call.cancel()
+            self._access_call = None
+        # pending stats
+        for after_id in (self._stat_after_id, self._stat_visible_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._stat_after_id = None
+        self._stat_visible_id = None
+        for call in self._stat_calls:
+            call.cancel()
+        self._stat_calls.clear()
+        self._stat_late = set()
+        self._stat_requested = set()
+        self._after_stats = None
+        self._stats_waited = set()
+
+    def _poll_scan(self, generation):
+        """Insert the rows produced by the background scanner."""
+        self._scan_after_id = None
+        scanner = self._scanner
+        if scanner is None or generation != self._generation \
+                or scanner.generation != generation:
+            # superseded scan
+            return
+        # do not block the event loop more than 20 ms
+        deadline = time() + 0.02
+        while time() < deadline:
+            try:
+                batch = scanner.get_batch()
+            except Empty:
+                break
+            if batch is None:
+                self._scanner = None
+                if self._redisplay is not None:
+                    redisplay = self._redisplay
+                    self._redisplay = None
+                    self._update_rows(*redisplay)
+                self._schedule_prefetch()
+                return
+            elif isinstance(batch, OSError):
+                self._scanner = None
+                self._redisplay = None
+                if isinstance(batch, FileNotFoundError):
+                    self.display_folder(expanduser('~'), reset=True, update_bar=True)
+                else:
+                    self._clear_tree()
+                    cst.showerror(batch.__class__.__name__, str(batch), master=self)
+                return
+            first = len(self._model)
+            self._model.extend(batch)
+            if self._redisplay is None:
+                self._insert_rows(first)
+        self._scan_after_id = self.after(10, self._poll_scan, generation)
+
+    def _clear_tree(self):
+        """Remove all the rows of self.right_tree."""
         self.right_tree.delete(*self.right_tree.get_children(""))
         self.right_tree.delete(*self.hidden)
+        self.right_tree.delete(*self._filtered)
         self.hidden = ()
-        try:
-            root, dirs, files = walk(folder).send(None)
-            # display folders first
-            dirs.sort(key=lambda n: n.lower())
-            i = 0
-            for d in dirs:
-                p = join(root, d)
-                if islink(p):
-                    tags = ("folder_link",)
-                else:
-                    tags = ("folder",)
-                if d[0] == ".":
-                    tags = tags + ("hidden",)
-                    if not self.hide:
-                        tags = tags + (str(i % 2),)
-                        i += 1
-                else:
-                    tags = tags + (str(i % 2),)
-                    i += 1
-                self.right_tree.insert("", "end", p, text=d, tags=tags,
-                                       values=("", "", get_modification_date(p)))
-            # display files
-            files.sort(key=lambda n: n.lower())
-            extension = self.filetypes[self.filetype.get()]
-            for f in files:
-                if extension == r".*$" or search(extension, f):
-                    p = join(root, f)
-                    if islink(p):
-                        tags = ("file_link",)
-                    else:
-                        tags = ("file",)
-                    try:
-                        stats = stat(p)
-                    except FileNotFoundError:
-                        stats = Stats(st_size="??", st_mtime="??")
-                        tags = ("link_broken",)
-                    if f[0] == ".":
-                        tags = tags + ("hidden",)
-                        if not self.hide:
-                            tags = tags + (str(i % 2),)
-                            i += 1
-                    else:
-                        tags = tags + (str(i % 2),)
-                        i += 1
+        self._filtered = set()
+        self._row_index = 0
+        self._stripes_dirty = False
+        self._striped = None
+
+    def _filter_rows(self):
+        """
+        Only display the files matching the current filetype.
+
+        The loaded entries are filtered in memory: the rows are detached or
+        reattached and the folder is not listed again.
+        """
+        model = self._model
+        shown, filtered = model.filter(self.filetypes[self.filetype.get()])
+        if not shown and not filtered:
+            return
+        tree = self.right_tree
+        filtered = model.paths(filtered)
+        self._filtered.update(filtered)
+        if self.hidden:
+            hidden = set(filtered)
+            self.hidden = tuple(i for i in self.hidden if i not in hidden)
+        # rows filtered out when they were loaded are inserted now
+        new = [row for row, path in zip(shown, model.paths(shown))
+               if path not in self._filtered]
+        self._filtered.difference_update(model.paths(shown))
+        if new:
+            bulk.insert_rows(tree, model.render(new))
+        if self.hide:
+            self.hidden = self.hidden + tuple(p for p in model.paths(shown)
+                                              if split(p)[1][:1] == ".")
+        if model.sorting is None:
+            order = model.paths(model.visible_rows(self.hide))
+        else:
+            order = model.sort(model.sorting[0], model.sorting[1], self.hide)
+        # detaches the filtered rows and restores the stripes in view
+        bulk.reorder(tree, order)
+        self._stripes_changed()
+        self._row_index = len(order)
+        self._schedule_stat_visible()
+
+    def _update_rows(self, previous, sorting=None):
+        """
+        Make self.right_tree display the entries of self._model.
+
+        previous is the {name: entry} dictionary of the entries displayed
+        so far: only the rows that changed are inserted, deleted, moved or
+        updated, so that the selection, focus and scroll position are kept.
+        If sorting is not None, the entries are sorted with the (key, reverse)
+        arguments of :meth:`model.DirectoryModel.sort`.
+        """
+        tree = self.right_tree
+        rows, hidden, self._row_index = \
+            self._model.rows(0, self.filetypes[self.filetype.get()], self.hide)
+        displayed = set(tree.get_children(""))
+        displayed.update(self.hidden)
+        displayed.update(self._filtered)
+        new = []
+        iids = set()
+        for row in rows:
+            iid, name, tags, values = row
+            iids.add(iid)
+            if iid not in displayed:
+                new.append(row)
+                continue
+            old = previous.get(name)
+            if old is None or old.tag != tags[0] \
+                    or old.size_str != values[1] or old.date_str != values[2]:
+                tree.item(iid, tags=tags, values=values)
+        removed = [iid for iid in displayed if iid not in iids]
+        if removed:
+            tree.delete(*removed)
+        if new:
+            bulk.insert_rows(tree, new)
+        if sorting is None:
+            hidden_set = set(hidden)
+            order = [row[0] for row in rows if row[0] not in hidden_set]
+        else:
+            order = self._model.sort(sorting[0], sorting[1], self.hide)
+        if removed or new or tree.get_children("") != tuple(order):
+            # also detaches the hidden rows and restores the stripes in view
+            bulk.reorder(tree, order)
+            self._stripes_changed()
+        self.hidden = tuple(hidden)
+        self._filtered = set()
+        self._schedule_stat_visible()
+
+    def _insert_rows(self, first):
+        """
+        Insert the entries of the current folder from index first in self.right_tree.
 
-                    self.right_tree.insert("", "end", p, text=f, tags=tags,
-                                           values=("",
-                                                   display_size(stats.st_size),
-                                                   display_modification_date(stats.st_mtime)))
+        The files that do not match the current filetype are skipped.
+        """
+        rows, hidden, row_index = \
+            self._model.rows(first, self.filetypes[self.filetype.get()],
+                             self.hide, self._row_index)
+        first_batch = self._row_index == 0
+        self._row_index = row_index
+        bulk.insert_rows(self.right_tree, rows)
+        if hidden:
+            self.right_tree.detach(*hidden)
+            self.hidden = self.hidden + tuple(hidden)
+        if first_batch:
             items = self.right_tree.get_children("")
             if items:
                 self.right_tree.focus_set()
                 self.right_tree.focus(items[0])
-            if self.hide:
-                self.hidden = self.right_tree.tag_has("hidden")
-                self.right_tree.detach(*self.right_tree.tag_has("hidden"))
-        except StopIteration:
-            self._display_folder_listdir(folder, reset, update_bar)
-        except PermissionError as e:
-            cst.showerror('PermissionError', str(e), master=self)
-
-    def _display_folder_scandir(self, folder, reset=True, update_bar=True):
+        if self._scan_selection and self.right_tree.exists(self._scan_selection):
+            self.right_tree.see(self._scan_selection)
+            self.right_tree.selection_add(self._scan_selection)
+            self._scan_selection = None
+        self._schedule_stat_visible()
+
+    # ---  lazy stat
+    def _on_yscroll(self, first, last):
         """
-        Display the content of folder in self.right_tree.
+        Update the scrollbar, restripe and stat the rows that came into view.
+        """
+        self._scroll_v.set(first, last)
+        if self._stripes_dirty:
+            bulk.restripe(self.right_tree)
+            first, last = float(first), float(last)
+            if self._striped is not None and first <= self._striped[1] \
+                    and last >= self._striped[0]:
+                first = min(first, self._striped[0])
+                last = max(last, self._striped[1])
+            self._striped = first, last
+            # all the rows have been restriped once they have all been in view
+            self._stripes_dirty = first > 0 or last < 1
+        self._schedule_stat_visible()
+
+    def _stripes_changed(self):
+        """
+        Record that the rows out of view may have the wrong stripe tag.
 
-        Arguments:
-            * reset (boolean): forget all the part of the history right of self._hist_index
-            * update_bar (boolean): update the buttons in path bar
+        They are restriped by :meth:`_on_yscroll` when they come into view.
         """
-        # remove trailing / if any
-        folder = abspath(folder)
-        # reorganize display if previous was 'recent'
-        if not self.path_bar.winfo_ismapped():
-            self.path_bar.grid()
-            self.right_tree.configure(displaycolumns=("size", "date"))
-            w = self.right_tree.winfo_width() - 205
-            if w < 0:
-                w = 250
-            self.right_tree.column("#0", width=w)
-            self.right_tree.column("size", stretch=False, width=85)
-            self.right_tree.column("date", width=120)
-            if self.foldercreation:
-                self.b_new_folder.grid()
-        # reset history
-        if reset:
-            if not self._hist_index == -1:
-                self.history = self.history[:self._hist_index + 1]
-                self._hist_index = -1
-            self.history.append(folder)
-        # update path bar
-        if update_bar:
-            self._update_path_bar(folder)
-        self.path_var.set(folder)
-        # disable new folder creation if no write access
-        if self.foldercreation:
-            if access(folder, W_OK):
-                self.b_new_folder.state(('!disabled',))
+        self._stripes_dirty = True
+        self._striped = None
+
+    def _visible_items(self):
+        """Return the items of self.right_tree that are in the view."""
+        tree = self.right_tree
+        if self._virtual_list:
+            return tree.visible_items()
+        item = ""
+        for y in range(0, 80, 4):
+            item = tree.identify_row(y)
+            if item:
+                break
+        items = []
+        while item and len(items) < 500 and tree.bbox(item):
+            items.append(item)
+            item = tree.next(item)
+        return items
+
+    def _schedule_stat_visible(self):
+        if self._model.nb_pending and self._stat_visible_id is None:
+            self._stat_visible_id = self.after(50, self._stat_visible)
+
+    def _stat_visible(self):
+        """Fetch the size and modification date of the visible rows."""
+        self._stat_visible_id = None
+        self._request_stats(self._model.pending(self._visible_items()))
+
+    def _request_stats(self, rows):
+        """Stat the given rows of self._model in the shared stat pool."""
+        rows = [row for row in rows if row not in self._stat_requested]
+        if not rows:
+            return
+        self._stat_requested.update(rows)
+        for path, row in zip(self._model.paths(rows), rows):
+            self._stat_calls.append(STAT_POOL.submit(stat_item, path,
+                                                     key=(self._generation, row),
+                                                     queue=self._stat_queue,
+                                                     timeout=self._stat_timeout))
+        if self._stat_after_id is None:
+            self._stat_after_id = self.after(10, self._poll_stats)
+
+    def _poll_stats(self):
+        """Display the size and modification date of the stat'ed rows."""
+        self._stat_after_id = None
+        deadline = time() + 0.02
+        while time() < deadline:
+            try:
+                call = self._stat_queue.get_nowait()
+            except Empty:
+                break
+            generation, row = call.key
+            if generation != self._generation:
+                continue
+            self._stat_late.discard(call)
+            if call.error is None:
+                self._set_stat(row, *call.result)
             else:
-                self.b_new_folder.state(('disabled',))
-        # clear self.right_tree
-        self.right_tree.delete(*self.right_tree.get_children(""))
-        self.right_tree.delete(*self.hidden)
-        self.hidden = ()
-        extension = self.filetypes[self.filetype.get()]
+                self._set_stat(row, None, None)
+        # display "??" for the calls that did not return in time, their
+        # actual values are displayed if they eventually return
+        now = time()
+        calls = self._stat_calls
+        while calls and (calls[0].done() or calls[0].expired(now)):
+            call = calls.popleft()
+            if not call.done():
+                self._set_stat(call.key[1], None, None)
+                self._stat_late.add(call)
+        if self._after_stats is not None and not self._stats_waited:
+            callback = self._after_stats
+            self._after_stats = None
+            callback()
+        if self._stat_calls or not self._stat_queue.empty():
+            self._stat_after_id = self.after(10, self._poll_stats)
+        elif self._stat_late:
+            # wait for the late calls at a lower rate
+            self._stat_after_id = self.after(250, self._poll_stats)
+
+    def _set_stat(self, row, size, mtime):
+        """Display the size and modification date of row."""
+        path, values = self._model.set_stat(row, size, mtime)
+        if self.right_tree.exists(path):
+            self.right_tree.item(path, values=values)
+        self._stats_waited.discard(row)
+
+    def _wait_stats(self, callback):
+        """
+        Stat all the displayed rows then call callback.
+
+        Return False (and do nothing) if all the rows are already stat'ed.
+        """
+        rows = self._model.pending_rows(self.hide)
+        if not rows:
+            return False
+        self._after_stats = callback
+        self._stats_waited = set(rows)
+        self._request_stats(rows)
+        return True
+
+    # ---  prefetch
+    def _cancel_prefetch(self):
+        if self._prefetch_after_id is not None:
+            self.after_cancel(self._prefetch_after_id)
+            self._prefetch_after_id = None
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+
+    def _schedule_prefetch(self, event=None):
+        """
+        (Re)start prefetching once the dialog is idle.
+
+        Any key or button press cancels the current prefetching round.
+        """
+        if self._prefetcher is None or self._model.folder is None:
+            return
+        self._cancel_prefetch()
+        self._prefetch_after_id = self.after(500, self._prefetch)
+
+    def _prefetch(self):
+        """List the folders the user is likely to open next."""
+        self._prefetch_after_id = None
+        if self._scanner is not None or self._listing_call is not None \
+                or self._stat_calls:
+            # do not compete with the display of the current folder
+            self._schedule_prefetch()
+            return
+        folder = self._model.folder
+        candidates = []
+        # history neighbours
+        i = self._hist_index
+        if i - 1 >= -len(self.history):
+            candidates.append(self.history[i - 1])
+        if i + 1 < 0:
+            candidates.append(self.history[i + 1])
+        candidates.append(dirname(folder))
+        candidates.extend(self._model.select(FOLDER | BROKEN, FOLDER, self.hide))
+        seen = set([folder])
+        folders = []
+        for path in candidates:
+            if path not in seen:
+                seen.add(path)
+                folders.append(path)
+        if not self._prefetcher.start(folders):
+            # the previous round is blocked in a file system call
+            self._schedule_prefetch()
+
+    # ---  live refresh
+    def _watch(self, folder):
+        """
+        Watch folder to keep its rows up to date.
+
+        The watch is set in a pool worker since it accesses the folder, the
+        changes are read by :meth:`_poll_watcher` once it is set. Return the
+        :class:`statpool.Call` of the watch, None if no watch was submitted.
+        """
+        if self._watcher is None:
+            return None
+        self._watch_changes = set()
+        call = self._watch_call
+        submitted = None
+        if call is not None and not call.done():
+            # the watcher is blocked on the previous folder, the folder is
+            # watched once the call returns, see _poll_watcher
+            pass
+        elif self._watcher.folder != folder:
+            submitted = self._watch_call = \
+                STAT_POOL.submit(self._watcher.watch, folder, timeout=self._stat_timeout)
+        if self._watch_after_id is None:
+            self._watch_after_id = self.after(250, self._poll_watcher)
+        return submitted
+
+    def _watch_failed(self, error, folder):
+        """Handle the failure of the watch of folder."""
+        if isinstance(error, WatcherError) and error.errno == ENOSPC \
+                and isinstance(self._watcher, InotifyWatcher):
+            # inotify watch limit reached: poll the folder instead
+            self._watcher.close()
+            self._watcher = PollingWatcher(self._model.names)
+            self._watch(folder)
+        else:
+            self._unwatch()
+
+    def _unwatch(self):
+        if self._watch_after_id is not None:
+            self.after_cancel(self._watch_after_id)
+            self._watch_after_id = None
+        call = self._watch_call
+        if self._watcher is not None and (call is None or call.done()):
+            self._watcher.unwatch()
+        self._watch_changes = set()
+
+    def _poll_watcher(self):
+        """Apply the changes of the displayed folder."""
+        self._watch_after_id = None
+        call = self._watch_call
+        if call is not None:
+            if not call.done():
+                # slow file system, the changes are read once the watch is set
+                self._watch_after_id = self.after(250, self._poll_watcher)
+                return
+            self._watch_call = None
+            folder = call.args[0]
+            if folder != self._model.folder:
+                # another folder was displayed meanwhile
+                if self._model.folder is not None:
+                    self._watch(self._model.folder)
+                return
+            if call.error is not None:
+                self._watch_failed(call.error, folder)
+                return
+        # the changes are read once the folder is listed
+        if self._scanner is None and self._listing_call is None:
+            names, reset = self._watcher.changes()
+            if reset:
+                # events were lost or the folder itself was deleted or moved
+                self._watcher.unwatch()
+                self.display_folder(self._model.folder, reset=False, update_bar=False)
+                return
+            self._watch_changes.update(names)
+            if self._watch_changes:
+                names = self._watch_changes
+                self._watch_changes = set()
+                self._apply_changes(names)
+        self._watch_after_id = self.after(250, self._poll_watcher)
+
+    def _apply_changes(self, names):
+        """Update the rows of the given items of the displayed folder."""
         try:
-            content = sorted(scandir(folder), key=key_sort_files)
-            i = 0
-            tags_array = [["folder", "folder_link"],
-                          ["file", "file_link"]]
-            for f in content:
-                b_file = f.is_file()
-                name = f.name
-                try:
-                    stats = f.stat()
-                    tags = (tags_array[b_file][f.is_symlink()],)
-                except FileNotFoundError:
-                    stats = Stats(st_size="??", st_mtime="??")
-                    tags = ("link_broken",)
-                if name[0] == '.':
-                    tags = tags + ("hidden",)
-                    if not self.hide:
-                        tags = tags + (str(i % 2),)
-                        i += 1
-                else:
-                    tags = tags + (str(i % 2),)
-                    i += 1
-                if b_file:
-                    if extension == r".*$" or search(extension, name):
-                        self.right_tree.insert("", "end", f.path, text=name, tags=tags,
-                                               values=("",
-                                                       display_size(stats.st_size),
-                                                       display_modification_date(stats.st_mtime)))
-                else:
-                    self.right_tree.insert("", "end", f.path, text=name, tags=tags,
-                                           values=("", "",
-                                                   display_modification_date(stats.st_mtime)))
-            items = self.right_tree.get_children("")
-            if items:
-                self.right_tree.focus_set()
-                self.right_tree.focus(items[0])
-            if self.hide:
-                self.hidden = self.right_tree.tag_has("hidden")
-                self.right_tree.detach(*self.right_tree.tag_has("hidden"))
-        except FileNotFoundError:
-            self._display_folder_scandir(expanduser('~'), reset=True, update_bar=True)
-        except PermissionError as e:
-            cst.showerror('PermissionError', str(e), master=self)
+            first, removed, updated = \
+                self._model.apply_changes(names, STAT_POOL, self._stat_timeout)
+        except StatTimeout:
+            # try again later
+            self._watch_changes.update(names)
+            return
+        tree = self.right_tree
+        removed = [path for path in removed if tree.exists(path)]
+        if removed:
+            self._filtered.difference_update(removed)
+            if self.hidden:
+                deleted = set(removed)
+                self.hidden = tuple(i for i in self.hidden if i not in deleted)
+            tree.delete(*removed)
+            self._row_index = len(tree.get_children(""))
+            self._restripe()
+        for path, values in updated:
+            if tree.exists(path):
+                tree.item(path, values=values)
+        if first is not None:
+            self._insert_rows(first)
+            # move the new rows from the end to their position in the order
+            for path, following in self._model.placements(first, self.hide):
+                tree.move(path, "", "end" if following is None else tree.index(following))
+            self._restripe()
 
     def create_folder(self, event=None):
         """Create new folder in current location."""
@@ -1322,13 +1753,31 @@ class FileBrowser(tk.Toplevel):
             e.bind("<FocusOut>", cancel)
             e.focus_set()
 
+    def _reorder(self, items):
+        """
+        Display items in the given order, in one operation.
+
+        The displayed items missing from items are put at the end.
+        """
+        listed = set(items)
+        others = [i for i in self.right_tree.get_children("") if i not in listed]
+        bulk.reorder(self.right_tree, list(items) + others)
+        self._stripes_changed()
+
+    def _restripe(self):
+        """
+        Restore dark/light line alternance.
+
+        Only the rows in view are restriped, the other ones are restriped
+        when they are scrolled into view.
+        """
+        bulk.restripe(self.right_tree)
+        self._stripes_changed()
+
     def move_item(self, item, index):
         """Move item to index and update dark/light line alternance."""
         self.right_tree.move(item, "", index)
-        tags = [t for t in self.right_tree.item(item, 'tags')
-                if t not in ['1', '0']]
-        tags.append(str(index % 2))
-        self.right_tree.item(item, tags=tags)
+        self._restripe()
 
     def toggle_path_entry(self, event):
         """Toggle visibility of path entry."""
@@ -1343,24 +1792,29 @@ class FileBrowser(tk.Toplevel):
         """Toggle the visibility of hidden files/folders."""
         if self.hide:
             self.hide = False
-            for item in reversed(self.hidden):
-                self.right_tree.move(item, "", 0)
+            # put hidden items back on top
+            self.right_tree.set_children("", *(tuple(self.hidden) + self.right_tree.get_children("")))
             self.hidden = ()
         else:
             self.hide = True
-            self.hidden = self.right_tree.tag_has("hidden")
-            self.right_tree.detach(*self.right_tree.tag_has("hidden"))
+            self.hidden = tuple(i for i in self.right_tree.tag_has("hidden")
+                                if i not in self._filtered)
+            self.right_tree.detach(*self.hidden)
         # restore color alternance
-        for i, item in enumerate(self.right_tree.get_children("")):
-            tags = [t for t in self.right_tree.item(item, 'tags')
-                    if t not in ['1', '0']]
-            tags.append(str(i % 2))
-            self.right_tree.item(item, tags=tags)
+        self._restripe()
 
     def get_result(self):
         """Return selection."""
         return self.result
 
+    def destroy(self):
+        """Stop background scanning and destroy dialog."""
+        self._stop_scan()
+        self._unwatch()
+        if self._watcher is not None:
+            self._watcher.close()
+        tk.Toplevel.destroy(self)
+
     def quit(self):
         """Destroy dialog."""
         self.destroy()
@@ -1416,8 +1870,7 @@ class FileBrowser(tk.Toplevel):
                 sel = self.right_tree.selection()
                 if len(sel) == 1:
                     path = sel[0]
-                    tags = self.right_tree.item(sel, "tags")
-                    if ("folder" in tags) or ("folder_link" in tags):
+                    if self._item_tag(path) in ("folder", "folder_link"):
                         rep = False
                         self.display_folder(path)
                     elif isfile(path):
@@ -1478,15 +1931,15 @@ class FileBrowser(tk.Toplevel):
         if self.mode == "openfile":
             if len(sel) == 1:
                 sel = sel[0]
-                tags = self.right_tree.item(sel, "tags")
-                if ("folder" in tags) or ("folder_link" in tags):
+                if self._item_tag(sel) in ("folder", "folder_link"):
                     self.display_folder(sel)
                 else:
                     self.result = (realpath(sel),)
                     self.quit()
             elif len(sel) > 1:
-                files = tuple(s for s in sel if "file" in self.right_tree.item(s, "tags"))
-                files = files + tuple(realpath(s) for s in sel if "file_link" in self.right_tree.item(s, "tags"))
+                tags = [self._item_tag(s) for s in sel]
+                files = tuple(s for s, t in zip(sel, tags) if t == "file")
+                files = files + tuple(realpath(s) for s, t in zip(sel, tags) if t == "file_link")
                 if files:
                     self.result = files
                     self.quit()
@@ -1505,8 +1958,7 @@ class FileBrowser(tk.Toplevel):
         if self.mode == "openfile":
             if len(sel) == 1:
                 sel = sel[0]
-                tags = self.right_tree.item(sel, "tags")
-                if ("folder" in tags) or ("folder_link" in tags):
+                if self._item_tag(sel) in ("folder", "folder_link"):
                     self.display_folder(sel)
                 else:
                     self.result = realpath(sel)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Filetype matching
+
+The filetype patterns ("*.png|*.jpg") are compiled once. Most of them are
+sets of suffixes, which are then matched with a set lookup of the file
+extension instead of a regular expression search.
+"""
+
+
+import re
+
+
+# characters with a special meaning in the regexps built from the patterns
+_SUFFIX = re.compile(r"\*(\.[^*?+()\[\]{}^$|\\]+)$")
+
+
+def _glob_regex(glob):
+    """Return the regexp corresponding to glob."""
+    return r'%s$' % glob.replace('.', r'\.').replace('*', '.*')
+
+
+class FiletypeMatcher(object):
+    """
+    Compiled filetype pattern.
+
+    A pattern is a "|" separated list of globs, e.g. "*.png|*.jpg". The
+    "*.ext" globs are matched with a set lookup of the extension of the file
+    name (or with str.endswith for extensions containing dots like
+    "*.tar.gz"), the other globs with precompiled regexps.
+
+    Attributes:
+        * pattern: filetype pattern
+        * ignorecase: whether the matching is case insensitive
+        * all: True if the pattern matches all the files
+        * extensions: list of the extensions of the "*.ext" globs, in the
+                      pattern order
+    """
+    def __init__(self, pattern="*", ignorecase=False):
+        """
+        Compile pattern.
+
+        Options:
+            * pattern: "|" separated list of globs
+            * ignorecase: match the file names case insensitively
+        """
+        self.pattern = pattern
+        self.ignorecase = ignorecase
+        self.extensions = []
+        self.all = False
+        suffixes = set()
+        ends = []
+        regexps = []
+        for glob in pattern.strip().split("|"):
+            glob = glob.strip()
+            if glob == "*":
+                self.all = True
+                continue
+            m = _SUFFIX.match(glob)
+            if m is None:
+                regexps.append(_glob_regex(glob))
+                continue
+            ext = m.group(1)
+            self.extensions.append(ext)
+            if ignorecase:
+                ext = ext.lower()
+            if "." in ext[1:]:
+                ends.append(ext)
+            else:
+                suffixes.add(ext)
+        self._suffixes = suffixes
+        self._ends = tuple(ends)
+        if regexps:
+            self._regex = re.compile("|".join(regexps),
+                                     re.IGNORECASE if ignorecase else 0)
+        else:
+            self._regex = None
+
+    @classmethod
+    def from_regex(cls, regex):
+        """Return a matcher using the regexp regex (e.g. r".*\\.png$")."""
+        matcher = cls("")
+        matcher.pattern = regex
+        if regex == r".*$":
+            matcher.all = True
+        else:
+            matcher._regex = re.compile(regex)
+        return matcher
+
+    def __repr__(self):
+        return "FiletypeMatcher(%r, %r)" % (self.pattern, self.ignorecase)
+
+    def __call__(self, name):
+        """Return whether the file name matches the pattern."""
+        if self.all:
+            return True
+        if self.ignorecase:
+            name = name.lower()
+        i = name.rfind(".")
+        if i >= 0 and name[i:] in self._suffixes:
+            return True
+        if self._ends and name.endswith(self._ends):
+            return True
+        return self._regex is not None and self._regex.search(name) is not None
+
+    def match_many(self, names):
+        """Return the list of the booleans telling whether each of names matches."""
+        if self.all:
+            return [True] * len(names)
+        suffixes = self._suffixes
+        ends = self._ends
+        search = self._regex.search if self._regex is not None else None
+        lower = self.ignorecase
+        result = []
+        append = result.append
+        for name in names:
+            if lower:
+                name = name.lower()
+            i = name.rfind(".")
+            append((i >= 0 and name[i:] in suffixes)
+                   or bool(ends and name.endswith(ends))
+                   or (search is not None and search(name) is not None))
+        return result
+
+
+# matches all files
+ALL_FILES = FiletypeMatcher("*")
+
+
+def get_matcher(extension):
+    """
+    Return the :class:`FiletypeMatcher` corresponding to extension.
+
+    extension is a :class:`FiletypeMatcher`, None (all files) or a regexp
+    as used by previous versions.
+    """
+    if extension is None:
+        return ALL_FILES
+    if isinstance(extension, FiletypeMatcher):
+        return extension
+    return FiletypeMatcher.from_regex(extension)
@@ -21,11 +21,20 @@ Functions
 """
 
 
-from tkfilebrowser.constants import _
-from tkfilebrowser.filebrowser import FileBrowser
+def _filebrowser(parent, default_title, title=None, **kwargs):
+    """
+    Create a :class:`FileBrowser` with title (default_title if it is None).
+
+    The filebrowser module is only imported when the first dialog is created.
+    """
+    from tkfilebrowser.constants import _
+    from tkfilebrowser.filebrowser import FileBrowser
+    if title is None:
+        title = _(default_title)
+    return FileBrowser(parent, title=title, **kwargs)
 
 
-def askopenpathname(parent=None, title=_("Open"), **kwargs):
+def askopenpathname(parent=None, title=None, **kwargs):
     """
     Return :obj:`''` or the absolute path of the chosen path (file or directory).
 
@@ -58,13 +67,13 @@ def askopenpathname(parent=None, title=_("Open"), **kwargs):
         foldercreation : bool
             enable the user to create new folders if True (default)
     """
-    dialog = FileBrowser(parent, mode="openpath", multiple_selection=False,
-                         title=title, **kwargs)
+    dialog = _filebrowser(parent, "Open", mode="openpath", multiple_selection=False,
+                          title=title, **kwargs)
     dialog.wait_window(dialog)
     return dialog.get_result()
 
 
-def askopenpathnames(parent=None, title=_("Open"), **kwargs):
+def askopenpathnames(parent=None, title=None, **kwargs):
     """
     Return :obj:`()` or the tuple of the absolute paths of the chosen paths (files and directories)
 
@@ -97,8 +106,8 @@ def askopenpathnames(parent=None, title=_("Open"), **kwargs):
         foldercreation : bool
             enable the user to create new folders if True (default)
     """
-    dialog = FileBrowser(parent, mode="openpath", multiple_selection=True,
-                         title=title, **kwargs)
+    dialog = _filebrowser(parent, "Open", mode="openpath", multiple_selection=True,
+                          title=title, **kwargs)
     dialog.wait_window(dialog)
     res = dialog.get_result()
     if not res:  # type consistency: always return a tuple
@@ -106,7 +115,7 @@ def askopenpathnames(parent=None, title=_("Open"), **kwargs):
     return res
 
 
-def askopendirname(parent=None, title=_("Open"), **kwargs):
+def askopendirname(parent=None, title=None, **kwargs):
     """
     Return :obj:`''` or the absolute path of the chosen directory.
 
@@ -139,13 +148,13 @@ def askopendirname(parent=None, title=_("Open"), **kwargs):
         foldercreation : bool
             enable the user to create new folders if True (default)
     """
-    dialog = FileBrowser(parent, mode="opendir", multiple_selection=False,
-                         title=title, **kwargs)
+    dialog = _filebrowser(parent, "Open", mode="opendir", multiple_selection=False,
+                          title=title, **kwargs)
     dialog.wait_window(dialog)
     return dialog.get_result()
 
 
-def askopendirnames(parent=None, title=_("Open"), **kwargs):
+def askopendirnames(parent=None, title=None, **kwargs):
     """
     Return :obj:`()` or the tuple of the absolute paths of the chosen directories
 
@@ -178,8 +187,8 @@ def askopendirnames(parent=None, title=_("Open"), **kwargs):
         foldercreation : bool
             enable the user to create new folders if True (default)
     """
-    dialog = FileBrowser(parent, mode="opendir", multiple_selection=True,
-                         title=title, **kwargs)
+    dialog = _filebrowser(parent, "Open", mode="opendir", multiple_selection=True,
+                          title=title, **kwargs)
     dialog.wait_window(dialog)
     res = dialog.get_result()
     if not res:  # type consistency: always return a tuple
@@ -187,7 +196,7 @@ def askopendirnames(parent=None, title=_("Open"), **kwargs):
     return res
 
 
-def askopenfilename(parent=None, title=_("Open"), **kwargs):
+def askopenfilename(parent=None, title=None, **kwargs):
     """
     Return :obj:`''` or the absolute path of the chosen file
 
@@ -220,13 +229,13 @@ def askopenfilename(parent=None, title=_("Open"), **kwargs):
         foldercreation : bool
             enable the user to create new folders if True (default)
     """
-    dialog = FileBrowser(parent, mode="openfile", multiple_selection=False,
-                         title=title, **kwargs)
+    dialog = _filebrowser(parent, "Open", mode="openfile", multiple_selection=False,
+                          title=title, **kwargs)
     dialog.wait_window(dialog)
     return dialog.get_result()
 
 
-def askopenfilenames(parent=None, title=_("Open"), **kwargs):
+def askopenfilenames(parent=None, title=None, **kwargs):
     """
     Return :obj:`()` or the tuple of the absolute paths of the chosen files
 
@@ -259,8 +268,8 @@ def askopenfilenames(parent=None, title=_("Open"), **kwargs):
         foldercreation : bool
             enable the user to create new folders if True (default)
     """
-    dialog = FileBrowser(parent, mode="openfile", multiple_selection=True,
-                         title=title, **kwargs)
+    dialog = _filebrowser(parent, "Open", mode="openfile", multiple_selection=True,
+                          title=title, **kwargs)
     dialog.wait_window(dialog)
     res = dialog.get_result()
     if not res:  # type consistency: always return a tuple
@@ -268,7 +277,7 @@ def askopenfilenames(parent=None, title=_("Open"), **kwargs):
     return res
 
 
-def asksaveasfilename(parent=None, title=_("Save As"), **kwargs):
+def asksaveasfilename(parent=None, title=None, **kwargs):
     """
     Return :obj:`''` or the chosen absolute path (the file might not exist)
 
@@ -304,6 +313,6 @@ def asksaveasfilename(parent=None, title=_("Save As"), **kwargs):
         foldercreation : bool
             enable the user to create new folders if True (default)
     """
-    dialog = FileBrowser(parent, mode="save", title=title, **kwargs)
+    dialog = _filebrowser(parent, "Save As", mode="save", title=title, **kwargs)
     dialog.wait_window(dialog)
     return dialog.get_result()
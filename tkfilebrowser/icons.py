@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+The icons are modified versions of icons from the elementary project
+(the xfce fork to be precise https://github.com/shimmerproject/elementary-xfce)
+Copyright 2007-2013 elementary LLC.
+
+
+Icons shared by the dialogs
+"""
+
+
+import tkfilebrowser.constants as cst
+from tkfilebrowser.registry import InterpreterRegistry
+
+
+# icon name -> image file
+ICON_FILES = {"file": cst.IM_FILE,
+              "folder": cst.IM_FOLDER,
+              "desktop": cst.IM_DESKTOP,
+              "file_link": cst.IM_FILE_LINK,
+              "link_broken": cst.IM_LINK_BROKEN,
+              "folder_link": cst.IM_FOLDER_LINK,
+              "new_folder": cst.IM_NEW,
+              "drive": cst.IM_DRIVE,
+              "home": cst.IM_HOME,
+              "recent": cst.IM_RECENT,
+              "recent_24": cst.IM_RECENT_24}
+
+
+class Icons(object):
+    """
+    Icons of a Tk interpreter.
+
+    Each icon is loaded the first time it is requested with icons[name]
+    and then shared by all the dialogs of the interpreter.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._images = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._images[name]
+        except KeyError:
+            image = cst.PhotoImage(file=ICON_FILES[name], master=self.root)
+            self._images[name] = image
+            return image
+
+    def __len__(self):
+        return len(self._images)
+
+    def clear(self):
+        self._images.clear()
+
+
+_REGISTRY = InterpreterRegistry(Icons, Icons.clear)
+
+
+def get_icons(widget):
+    """
+    Return the :class:`Icons` of the interpreter of widget.
+
+    They are released when the root window of the interpreter is destroyed.
+    """
+    return _REGISTRY.get(widget)
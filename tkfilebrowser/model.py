@@ -0,0 +1,786 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Folder content model
+
+This module does not depend on Tk: the folder listing can be profiled,
+cached and tested without a display. The FileBrowser renders the rows
+returned by :meth:`DirectoryModel.rows`.
+"""
+
+
+from os import stat, listdir, walk
+from os.path import join, isdir, islink, lexists, split
+from stat import S_ISDIR, S_ISREG
+from time import time
+try:
+    from os import scandir
+    SCANDIR = True
+except ImportError:
+    SCANDIR = False
+from tkfilebrowser.constants import key_sort_files, display_size, \
+    display_modification_date, display_modification_dates, display_sizes
+from tkfilebrowser.cache import LISTING_CACHE
+from tkfilebrowser.filetypes import get_matcher
+from tkfilebrowser.columns import ColumnStore, FILTERED, HIDDEN, FOLDER, \
+    BROKEN, PENDING, DELETED
+
+
+# displayed in the size and date columns until the item is stat'ed
+PLACEHOLDER = u"\u2026"
+
+
+class Entry(object):
+    """
+    Description of an item of a folder.
+
+    Attributes:
+        * name: item name
+        * tag: one of "folder", "folder_link", "file", "file_link", "link_broken"
+        * size: size in bytes (0 for folders, -1 for broken links)
+        * mtime: modification time (-1 if unknown, None if the item
+                 was not stat'ed yet)
+        * size_str, date_str: strings displayed in the size and date columns
+    """
+    __slots__ = ("name", "tag", "size", "mtime", "size_str", "date_str")
+
+    def __init__(self, name, tag, size=0, mtime=-1, size_str="", date_str=""):
+        self.name = name
+        self.tag = tag
+        self.size = size
+        self.mtime = mtime
+        self.size_str = size_str
+        self.date_str = date_str
+
+    def __repr__(self):
+        return "Entry(%r, %r, %r, %r, %r, %r)" % self.astuple()
+
+    def __eq__(self, other):
+        if not isinstance(other, Entry):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        if eq is NotImplemented:
+            return eq
+        return not eq
+
+    __hash__ = None
+
+    def astuple(self):
+        return (self.name, self.tag, self.size, self.mtime, self.size_str,
+                self.date_str)
+
+    @property
+    def hidden(self):
+        return self.name[:1] == "."
+
+    @property
+    def is_folder(self):
+        return self.tag[:6] == "folder"
+
+    @property
+    def is_file(self):
+        return self.tag[:4] == "file"
+
+
+def _broken(name):
+    return Entry(name, "link_broken", -1, -1, "??", "??")
+
+
+def _sorted_scandir(folder, cancel=None):
+    """Return the sorted directory entries of folder, None if cancelled."""
+    if cancel is None:
+        return sorted(scandir(folder), key=key_sort_files)
+    content = []
+    for i, f in enumerate(scandir(folder)):
+        if not i % 512 and cancel.is_set():
+            return None
+        content.append(f)
+    content.sort(key=key_sort_files)
+    return content
+
+
+def _scan_scandir(folder, cancel=None):
+    """Yield the entries of folder, folders first, using os.scandir."""
+    content = _sorted_scandir(folder, cancel)
+    if content is None:
+        return
+    tags_array = [["folder", "folder_link"],
+                  ["file", "file_link"]]
+    for f in content:
+        b_file = f.is_file()
+        try:
+            stats = f.stat()
+        except OSError:
+            yield _broken(f.name)
+            continue
+        tag = tags_array[b_file][f.is_symlink()]
+        if b_file:
+            size = stats.st_size
+            size_str = display_size(size)
+        else:
+            size = 0
+            size_str = ""
+        yield Entry(f.name, tag, size, stats.st_mtime, size_str,
+                    display_modification_date(stats.st_mtime))
+
+
+def _scan_scandir_lazy(folder, cancel=None):
+    """
+    Yield the entries of folder, folders first, using os.scandir without stat'ing them.
+
+    The item types come from the directory entries, only the symbolic links
+    are stat'ed. The size and modification time are left pending.
+    """
+    content = _sorted_scandir(folder, cancel)
+    if content is None:
+        return
+    for f in content:
+        if f.is_symlink():
+            if f.is_dir():
+                tag = "folder_link"
+            elif f.is_file():
+                tag = "file_link"
+            else:
+                yield _broken(f.name)
+                continue
+        else:
+            tag = "folder" if f.is_dir() else "file"
+        if tag[:4] == "file":
+            yield Entry(f.name, tag, None, None, PLACEHOLDER, PLACEHOLDER)
+        else:
+            yield Entry(f.name, tag, 0, None, "", PLACEHOLDER)
+
+
+def stat_item(path):
+    """Return the (size, mtime) of path, raise OSError if it cannot be stat'ed."""
+    st = stat(path)
+    return st.st_size, st.st_mtime
+
+
+def path_info(path):
+    """
+    Return the (tag, size, mtime) of path.
+
+    tag is None if path is neither a folder nor a file (or does not exist).
+    """
+    try:
+        st = stat(path)
+    except OSError:
+        return None, -1, -1
+    link = islink(path)
+    if S_ISDIR(st.st_mode):
+        return ("folder_link" if link else "folder"), 0, st.st_mtime
+    elif S_ISREG(st.st_mode):
+        return ("file_link" if link else "file"), st.st_size, st.st_mtime
+    return None, -1, -1
+
+
+def make_entries(folder, names):
+    """
+    Return {name: entry} for the given item names of folder.
+
+    entry is None if the item does not exist (anymore).
+    """
+    entries = {}
+    dated = []
+    files = []
+    for name in names:
+        path = join(folder, name)
+        tag, size, mtime = path_info(path)
+        if tag is None:
+            entries[name] = _broken(name) if lexists(path) else None
+            continue
+        if tag[:4] == "file":
+            entry = Entry(name, tag, size, mtime)
+            files.append(entry)
+        else:
+            entry = Entry(name, tag, 0, mtime, "")
+        entries[name] = entry
+        dated.append(entry)
+    dates = display_modification_dates([entry.mtime for entry in dated])
+    for entry, date in zip(dated, dates):
+        entry.date_str = date
+    sizes = display_sizes([entry.size for entry in files])
+    for entry, size in zip(files, sizes):
+        entry.size_str = size
+    return entries
+
+
+def _scan_names(folder, dirs, files):
+    """Yield the entries of folder from the sorted lists of folder and file names."""
+    for name in dirs:
+        p = join(folder, name)
+        tag = "folder_link" if islink(p) else "folder"
+        try:
+            mtime = stat(p).st_mtime
+        except OSError:
+            yield Entry(name, tag, 0, -1, "", "??")
+        else:
+            yield Entry(name, tag, 0, mtime, "", display_modification_date(mtime))
+    for name in files:
+        p = join(folder, name)
+        try:
+            stats = stat(p)
+        except OSError:
+            yield _broken(name)
+        else:
+            tag = "file_link" if islink(p) else "file"
+            yield Entry(name, tag, stats.st_size, stats.st_mtime,
+                        display_size(stats.st_size),
+                        display_modification_date(stats.st_mtime))
+
+
+def _scan_listdir(folder, cancel=None):
+    """Yield the entries of folder, folders first, using os.listdir."""
+    dirs = []
+    files = []
+    for name in listdir(folder):
+        if isdir(join(folder, name)):
+            dirs.append(name)
+        else:
+            files.append(name)
+    dirs.sort(key=str.lower)
+    files.sort(key=str.lower)
+    return _scan_names(folder, dirs, files)
+
+
+def _raise(error):
+    raise error
+
+
+def _scan_walk(folder, cancel=None):
+    """Yield the entries of folder, folders first, using os.walk."""
+    for root, dirs, files in walk(folder, onerror=_raise):
+        dirs.sort(key=str.lower)
+        files.sort(key=str.lower)
+        return _scan_names(folder, dirs, files)
+    return iter(())
+
+
+# enumeration backends: backend(folder, cancel=None) yields the entries
+# of folder, folders first, and stops as soon as the cancel Event is set
+BACKENDS = {"listdir": _scan_listdir, "walk": _scan_walk}
+if SCANDIR:
+    BACKENDS["scandir"] = _scan_scandir
+    BACKENDS["scandir_lazy"] = _scan_scandir_lazy
+    DEFAULT_BACKEND = "scandir"
+else:
+    DEFAULT_BACKEND = "walk"
+
+
+def get_backend(backend=None):
+    """
+    Return the enumeration function corresponding to backend.
+
+    backend is either None (default backend), the name of a backend
+    from BACKENDS or a function with the same signature.
+    """
+    if backend is None:
+        backend = DEFAULT_BACKEND
+    if callable(backend):
+        return backend
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError("Unknown backend %r, expected one of %s."
+                         % (backend, ", ".join(sorted(BACKENDS))))
+
+
+def backend_name(backend=None):
+    """Return the name of backend (see :func:`get_backend`), used in the cache keys."""
+    backend = get_backend(backend)
+    return getattr(backend, "__name__", repr(backend))
+
+
+def scan_folder(folder, cancel=None):
+    """
+    Yield the :class:`Entry` objects describing the content of folder, folders first.
+
+    The optional cancel argument is a threading.Event, the enumeration stops
+    as soon as it is set (the entries are stat'ed only when they are consumed).
+    """
+    return get_backend()(folder, cancel)
+
+
+def list_folder(folder, cache=LISTING_CACHE, backend=None):
+    """Return the entries of folder (see :func:`scan_folder`), using cache."""
+    t0 = time()
+    key, listing = cache.lookup(folder, backend_name(backend))
+    if listing is None:
+        listing = tuple(get_backend(backend)(folder))
+        cache.put(key, listing, folder, time() - t0)
+    return listing
+
+
+class DirectoryModel(object):
+    """
+    Content of the folder displayed in the FileBrowser.
+
+    The entries are enumerated by a pluggable backend (see
+    :func:`get_backend`) and kept in :attr:`entries`, in display order.
+    Their metadata is also stored in :attr:`columns` (see
+    :class:`columns.ColumnStore`), row i describing entries[i].
+    :attr:`order` is the list of the rows in the last sort order and
+    :attr:`sorting` the (key, reverse) arguments of this sort (both are None
+    if the folder was not sorted).
+
+    With a lazy backend, the size and modification time of the entries
+    are unknown (PENDING) until they are set with :meth:`set_stat`.
+
+    The changes of the folder content are applied with :meth:`apply_changes`:
+    the rows of the removed items are flagged DELETED and skipped, so the
+    rows of the other items stay valid.
+    """
+    def __init__(self, backend=None, cache=LISTING_CACHE):
+        """
+        Create a directory model.
+
+        Options:
+            * backend: enumeration backend, see :func:`get_backend`
+            * cache: ListingCache where the listings are looked up and stored
+        """
+        self.backend = get_backend(backend)
+        self.cache = cache
+        self.folder = None
+        self.entries = []
+        self.columns = ColumnStore()
+        self.order = None
+        self.sorting = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def nb_pending(self):
+        """Number of entries whose size and modification time are unknown."""
+        return self.columns.nb_pending
+
+    def clear(self, folder=None):
+        """Forget the current content and set the current folder."""
+        self.folder = folder
+        self.entries = []
+        self.columns.clear()
+        self.order = None
+        self.sorting = None
+
+    def load(self, folder, pool=None, timeout=None):
+        """
+        Load the content of folder and return the list of entries.
+
+        If pool (a :class:`statpool.StatPool`) is given, the folder is listed
+        in one of its workers and :class:`statpool.StatTimeout` is raised if
+        this takes more than timeout seconds. The model is then left unchanged
+        and the listing goes on in the call attribute of the exception, see
+        :meth:`load_call`.
+
+        Raise OSError if folder cannot be listed.
+        """
+        if pool is None:
+            listing = list_folder(folder, self.cache, self.backend)
+        else:
+            listing = pool.call(list_folder, folder, self.cache, self.backend,
+                                timeout=timeout)
+        self.clear(folder)
+        self.extend(listing)
+        return self.entries
+
+    def load_call(self, call):
+        """
+        Load the result of the :class:`statpool.Call` of a :meth:`load`
+        that timed out and return the list of entries.
+
+        Raise the OSError raised by the listing, if any.
+        """
+        listing = call.wait(0)
+        self.clear(call.args[0])
+        self.extend(listing)
+        return self.entries
+
+    def extend(self, entries):
+        """Add entries (e.g. produced by a background scan) to the content."""
+        if not isinstance(entries, (list, tuple)):
+            entries = list(entries)
+        start = len(self.entries)
+        self.entries.extend(entries)
+        self.columns.extend(entries)
+        if self.order is not None:
+            self.order.extend(range(start, len(self.entries)))
+
+    def apply_changes(self, names, pool=None, timeout=None):
+        """
+        Update the content after the items names were created, deleted,
+        renamed or modified.
+
+        The items are looked up on the disk, in a worker of pool if given
+        (see :meth:`load`). Return (first, removed, updated) where first is
+        the row of the first added entry (None if no entry was added),
+        removed the list of the paths of the removed items and updated the
+        list of the (path, values) of the modified items.
+        """
+        if pool is None:
+            new = make_entries(self.folder, names)
+        else:
+            new = pool.call(make_entries, self.folder, names, timeout=timeout)
+        columns = self.columns
+        removed = []
+        updated = []
+        added = []
+        for name in sorted(new, key=str.lower):
+            entry = new[name]
+            try:
+                row = columns.index(name)
+            except KeyError:
+                pass
+            else:
+                old = self.entries[row]
+                if entry is not None and entry.tag == old.tag:
+                    # the entry is updated in place, like in set_stat()
+                    old.size, old.mtime = entry.size, entry.mtime
+                    old.size_str, old.date_str = entry.size_str, entry.date_str
+                    columns.set_stat(row, entry.size, entry.mtime)
+                    updated.append((self.path(row), ("", old.size_str, old.date_str)))
+                    continue
+                columns.delete(row)
+                removed.append(self.path(row))
+            if entry is not None:
+                added.append(entry)
+        if not added:
+            return None, removed, updated
+        first = len(self.entries)
+        self.entries.extend(added)
+        self.columns.extend(added)
+        # the added rows are inserted at their position in the current order
+        order = self.order
+        if order is None:
+            order = self.order = list(range(first))
+        for row in range(first, len(self.entries)):
+            order.insert(self._position(row), row)
+        return first, removed, updated
+
+    def _sort_key(self, row):
+        """Return (group, value), the key of row in the current order."""
+        columns = self.columns
+        if self.sorting is None:
+            # order of the listings, see key_sort_files
+            return self.entries[row].is_file, columns.names[row].lower()
+        flags = columns.flags[row]
+        if flags & BROKEN:
+            # the broken links are not sorted
+            return 2, 0
+        group = 0 if flags & FOLDER else 1
+        key = self.sorting[0]
+        if key == "name":
+            return group, columns.names[row]
+        elif key == "date":
+            return group, columns.mtimes[row]
+        elif group:
+            return group, columns.sizes[row]
+        # the folders are not sorted by size
+        return group, 0
+
+    def _position(self, row):
+        """Return the index of self.order where row goes, after its equals."""
+        group, value = self._sort_key(row)
+        reverse = self.sorting is not None and self.sorting[1]
+        order = self.order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            g, v = self._sort_key(order[mid])
+            if g < group or g == group and (v >= value if reverse else v <= value):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def placements(self, first, hide=False):
+        """
+        Return where to move the displayed rows from first, rendered at the
+        end of the view, so that the view follows the current order.
+
+        Return the list of (path, following) where following is the path of
+        the displayed row path goes before (None if it goes at the end). The
+        list starts with the last row in the current order so that the rows
+        that follow a row are already in place when it is moved.
+        """
+        order = self.order
+        if order is None:
+            return []
+        flags = self.columns.flags
+        exclude = FILTERED | HIDDEN | DELETED if hide else FILTERED | DELETED
+        indexes = []
+        for row in range(first, len(self.entries)):
+            if flags[row] & exclude:
+                continue
+            i = self._position(row) - 1
+            while order[i] != row:
+                i -= 1
+            indexes.append(i)
+        indexes.sort(reverse=True)
+        placements = []
+        n = len(order)
+        for i in indexes:
+            j = i + 1
+            while j < n and flags[order[j]] & exclude:
+                j += 1
+            placements.append((self.path(order[i]),
+                               self.path(order[j]) if j < n else None))
+        return placements
+
+    def displayed(self):
+        """Return the {name: entry} dictionary of the rendered entries."""
+        flags = self.columns.flags
+        return {entry.name: entry for i, entry in enumerate(self.entries)
+                if not flags[i] & (FILTERED | DELETED)}
+
+    def names(self):
+        """Return the set of the names of the items of the folder."""
+        flags = self.columns.flags
+        return {name for i, name in enumerate(self.columns.names)
+                if not flags[i] & DELETED}
+
+    def path(self, row):
+        """Return the path of the item described by the given row."""
+        return join(self.folder, self.columns.names[row])
+
+    def paths(self, rows):
+        prefix = join(self.folder, "")
+        names = self.columns.names
+        return [prefix + names[i] for i in rows]
+
+    def row(self, path):
+        """Return the row describing path, raise KeyError if there is none."""
+        folder, name = split(path)
+        if folder != self.folder:
+            raise KeyError(path)
+        return self.columns.index(name)
+
+    def flags(self, path, default=None):
+        """Return the flags (see :mod:`columns`) of path or default."""
+        try:
+            return self.columns.flags[self.row(path)]
+        except KeyError:
+            return default
+
+    def pending(self, paths):
+        """Return the rows of the PENDING items among paths."""
+        rows = []
+        flags = self.columns.flags
+        for path in paths:
+            try:
+                row = self.row(path)
+            except KeyError:
+                continue
+            if flags[row] & PENDING:
+                rows.append(row)
+        return rows
+
+    def pending_rows(self, hide=False):
+        """Return the rows of the displayed items that are PENDING."""
+        exclude = FILTERED | HIDDEN if hide else FILTERED
+        return self.columns.select(PENDING, PENDING, exclude)
+
+    def set_stat(self, row, size, mtime):
+        """
+        Set the size and modification time of the entry of the given row.
+
+        size and mtime are None if the item could not be stat'ed.
+        Return the path of the item and its values in the Treeview.
+
+        The entry is updated in place, so the cached listing is completed too.
+        A failure is only stored in :attr:`columns`: the entry stays pending
+        so that the item is stat'ed again when the folder is loaded again.
+        """
+        entry = self.entries[row]
+        if mtime is None:
+            self.columns.set_stat(row, -1 if entry.is_file else entry.size, -1)
+            return self.path(row), self._values(row, entry)
+        if entry.is_file:
+            entry.size, entry.size_str = size, display_size(size)
+        entry.mtime = mtime
+        entry.date_str = display_modification_date(mtime)
+        self.columns.set_stat(row, entry.size, entry.mtime)
+        return self.path(row), ("", entry.size_str, entry.date_str)
+
+    def _values(self, row, entry):
+        """Return the Treeview values of the entry of row."""
+        if entry.mtime is None and not self.columns.flags[row] & PENDING:
+            # could not be stat'ed, see set_stat()
+            return ("", "??" if entry.is_file else entry.size_str, "??")
+        return ("", entry.size_str, entry.date_str)
+
+    def select(self, mask, value=None, hide=False):
+        """
+        Return the paths of the displayed items whose flags match mask and value.
+
+        See :meth:`columns.ColumnStore.select`.
+        """
+        exclude = FILTERED | HIDDEN if hide else FILTERED
+        return self.paths(self.columns.select(mask, value, exclude))
+
+    def sort(self, key, reverse=False, hide=False):
+        """
+        Sort the displayed items and return their paths in the new order.
+
+        Arguments:
+            * key: "name", "size" or "date"
+            * reverse: sort in descending order
+            * hide: whether hidden items are hidden
+
+        Folders come first, then files and broken links. When sorting by
+        size, the folders keep their current order.
+        """
+        columns = self.columns
+        exclude = FILTERED | HIDDEN | DELETED if hide else FILTERED | DELETED
+        folders = []
+        files = []
+        broken = []
+        for row, flags in enumerate(columns.flags):
+            if flags & exclude:
+                continue
+            elif flags & BROKEN:
+                broken.append(row)
+            elif flags & FOLDER:
+                folders.append(row)
+            else:
+                files.append(row)
+        if key == "name":
+            folders = columns.sort(folders, "names", reverse)
+            files = columns.sort(files, "names", reverse)
+        elif key == "size":
+            if folders and self.order is not None:
+                # rows that were not displayed come first
+                position = {row: i for i, row in enumerate(self.order)}
+                folders.sort(key=lambda row: position.get(row, -1))
+            files = columns.sort(files, "sizes", reverse)
+        elif key == "date":
+            folders = columns.sort(folders, "mtimes", reverse)
+            files = columns.sort(files, "mtimes", reverse)
+        else:
+            raise ValueError("Unknown sort key %r." % key)
+        self.order = folders + files + broken
+        self.sorting = (key, reverse)
+        return self.paths(self.order)
+
+    def filter(self, extension=None):
+        """
+        Flag FILTERED the files that do not match extension (see
+        :meth:`rows`), without listing the folder again.
+
+        Return (shown, filtered): the lists of the rows that are no longer
+        FILTERED and of the rows that became FILTERED.
+        """
+        matcher = get_matcher(extension)
+        flags = self.columns.flags
+        entries = self.entries
+        matches = matcher.match_many(self.columns.names)
+        shown = []
+        filtered = []
+        for i, match in enumerate(matches):
+            f = flags[i]
+            if f & DELETED:
+                continue
+            if match or entries[i].tag[:4] != "file":
+                if f & FILTERED:
+                    flags[i] = f & ~FILTERED
+                    shown.append(i)
+            elif not f & FILTERED:
+                flags[i] = f | FILTERED
+                filtered.append(i)
+        return shown, filtered
+
+    def visible_rows(self, hide=False):
+        """Return the displayed rows, in the current order."""
+        exclude = FILTERED | HIDDEN | DELETED if hide else FILTERED | DELETED
+        flags = self.columns.flags
+        if self.order is None:
+            return [i for i, f in enumerate(flags) if not f & exclude]
+        return [i for i in self.order if not flags[i] & exclude]
+
+    def render(self, rows):
+        """
+        Return the Treeview rows (see :meth:`rows`) of the given rows.
+
+        The rows are not striped.
+        """
+        prefix = join(self.folder, "")
+        items = []
+        for i in rows:
+            entry = self.entries[i]
+            name = entry.name
+            if name[0] == ".":
+                tags = (entry.tag, "hidden")
+            else:
+                tags = (entry.tag,)
+            items.append((prefix + name, name, tags, self._values(i, entry)))
+        return items
+
+    def rows(self, first=0, extension=None, hide=False, start=0):
+        """
+        Return the Treeview rows corresponding to the entries from first.
+
+        The files that do not match extension are flagged FILTERED in
+        :attr:`columns`.
+
+        Arguments:
+            * first: index of the first entry to render
+            * extension: :class:`filetypes.FiletypeMatcher` the file names have
+                         to match (a regexp is also accepted), None for all files
+            * hide: whether hidden items are hidden
+            * start: number of visible rows already displayed, for the
+                     "0"/"1" stripes
+
+        Return (rows, hidden, nb_visible) where rows is the list of
+        (iid, text, tags, values) tuples to insert, hidden is the list of the
+        iids of the hidden rows and nb_visible the updated number of visible rows.
+        """
+        matcher = get_matcher(extension)
+        folder = self.folder
+        flags = self.columns.flags
+        not_filtered = ~FILTERED & 0xff
+        rows = []
+        hidden = []
+        index = start
+        matches = matcher.match_many(self.columns.names[first:])
+        for i, match in enumerate(matches, first):
+            if flags[i] & DELETED:
+                continue
+            entry = self.entries[i]
+            name = entry.name
+            tag = entry.tag
+            if not (match or tag[:4] != "file"):
+                flags[i] |= FILTERED
+                continue
+            flags[i] &= not_filtered
+            path = join(folder, name)
+            if name[0] == ".":
+                tags = (tag, "hidden")
+                if hide:
+                    hidden.append(path)
+                else:
+                    tags = tags + (str(index % 2),)
+                    index += 1
+            else:
+                tags = (tag, str(index % 2))
+                index += 1
+            rows.append((path, name, tags, self._values(i, entry)))
+        return rows, hidden, index
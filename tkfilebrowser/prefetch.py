@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Speculative listing of the folders the user is likely to open next
+"""
+
+
+from threading import Thread, Event
+from time import time
+from tkfilebrowser.cache import LISTING_CACHE
+from tkfilebrowser.model import get_backend, backend_name
+
+
+class Prefetcher(object):
+    """
+    List folders in a background thread to warm the listing cache.
+
+    The folders are listed one at a time, in the given order, until the
+    budget (number of entries) is spent. A round is cancelled as soon as
+    :meth:`cancel` is called: the folder being listed is then discarded.
+    A new round is not started while the thread of the previous one is
+    still blocked in a file system call, so that at most one prefetching
+    call is made at a time.
+    """
+    def __init__(self, budget=20000, cache=LISTING_CACHE, backend=None):
+        """
+        Create a prefetcher.
+
+        Options:
+            * budget: maximum number of entries listed in a round
+            * cache: ListingCache where the listings are stored
+            * backend: enumeration backend, see :func:`model.get_backend`
+        """
+        self.budget = budget
+        self.cache = cache
+        self.backend = get_backend(backend)
+        self.listed = []  # folders listed during the last round
+        self._cancel = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, folders):
+        """
+        Cancel the current round and list folders in a new one.
+
+        Return False (and do nothing) if the previous round is not over.
+        """
+        self.cancel()
+        if self.running:
+            return False
+        self._cancel = Event()
+        self.listed = []
+        self._thread = Thread(target=self._run, args=(list(folders), self._cancel))
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    def wait(self, timeout=None):
+        """Wait for the end of the current round."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, folders, cancel):
+        budget = self.budget
+        for folder in folders:
+            if cancel.is_set() or budget <= 0:
+                return
+            try:
+                t0 = time()
+                key, listing = self.cache.lookup(folder, backend_name(self.backend))
+                if listing is not None:
+                    continue
+                entries = []
+                for entry in self.backend(folder, cancel):
+                    entries.append(entry)
+                    if len(entries) > budget or cancel.is_set():
+                        break
+            except OSError:
+                continue
+            budget -= len(entries)
+            if budget >= 0 and not cancel.is_set():
+                self.cache.put(key, entries, folder, time() - t0)
+                self.listed.append(folder)
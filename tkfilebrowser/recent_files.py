@@ -26,6 +26,9 @@ Recent files management
 """
 
 
+import os
+
+
 class RecentFiles:
     """Recent files manager."""
     def __init__(self, filename, nbmax=30):
@@ -59,6 +62,9 @@ class RecentFiles:
             self._files.remove(file)
             self._files.insert(0, file)
         try:
+            folder = os.path.dirname(self._filename)
+            if folder and not os.path.isdir(folder):
+                os.makedirs(folder)
             with open(self._filename, 'w') as file:
                 file.write('\n'.join(self._files))
         except Exception:
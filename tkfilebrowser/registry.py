@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+Values shared by the dialogs of a Tk interpreter
+"""
+
+
+class InterpreterRegistry(object):
+    """
+    Values shared by the widgets of each Tk interpreter.
+
+    The value of an interpreter is created the first time it is requested
+    and released when the root window of the interpreter is destroyed.
+    """
+    def __init__(self, factory, release=None):
+        """
+        Create a registry.
+
+        Arguments:
+            * factory: function creating the value of a Tk root window
+            * release: function called with the value once its root window
+                       is destroyed, or None
+        """
+        self.factory = factory
+        self.release = release
+        self._values = {}  # Tk root -> value
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, root):
+        return root in self._values
+
+    def __getitem__(self, root):
+        return self._values[root]
+
+    def get(self, widget):
+        """Return the value of the interpreter of widget."""
+        root = widget._root()
+        try:
+            return self._values[root]
+        except KeyError:
+            pass
+        value = self._values[root] = self.factory(root)
+
+        def on_destroy(event):
+            if event.widget is root:
+                self.pop(root)
+
+        # all the widgets of the root window have the root bindtag
+        root.bind("<Destroy>", on_destroy, add=True)
+        return value
+
+    def pop(self, root):
+        """Forget the value of root and release it."""
+        value = self._values.pop(root, None)
+        if value is not None and self.release is not None:
+            self.release(value)
+        return value
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Background folder scanning
+"""
+
+
+from threading import Thread, Event
+from time import time
+try:
+    from queue import Queue, Empty
+except ImportError:
+    from Queue import Queue, Empty
+from tkfilebrowser.cache import LISTING_CACHE
+from tkfilebrowser.model import get_backend, backend_name
+
+
+class FolderScanner(Thread):
+    """
+    Enumerate and stat the content of a folder in a background thread.
+
+    The entries (see :func:`model.scan_folder`) are sent to the GUI thread
+    through :attr:`queue` by batches: each item of the queue is either a list of
+    entries, an :class:`OSError` if the folder could not be listed, or
+    ``None`` once the scan is over.
+
+    The scan can be stopped with :meth:`cancel`, e.g. when the user
+    navigates to another folder: the enumeration and stat calls stop at
+    once and the pending batches are discarded.
+    """
+    def __init__(self, folder, batchsize=1000, firstbatch=50,
+                 cache=LISTING_CACHE, generation=0, backend=None):
+        """
+        Create a folder scanner.
+
+        Options:
+            * folder: folder to scan
+            * batchsize: number of entries per batch
+            * firstbatch: number of entries in the first batch, keep it small
+                          so that the first rows are displayed quickly
+            * cache: ListingCache where the listing is looked up and stored
+            * generation: id of the navigation that started the scan
+            * backend: enumeration backend, see :func:`model.get_backend`
+        """
+        Thread.__init__(self)
+        self.daemon = True
+        self.folder = folder
+        self.batchsize = batchsize
+        self.firstbatch = firstbatch
+        self.cache = cache
+        self.generation = generation
+        self.backend = get_backend(backend)
+        self.queue = Queue()
+        self._cancel = Event()
+
+    def cancel(self):
+        """Stop the scan and discard the rows that were not consumed yet."""
+        self._cancel.set()
+        try:
+            while True:
+                self.queue.get_nowait()
+        except Empty:
+            pass
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def get_batch(self):
+        """Return the next item of the queue or raise queue.Empty."""
+        return self.queue.get_nowait()
+
+    def run(self):
+        try:
+            t0 = time()
+            key, listing = self.cache.lookup(self.folder, backend_name(self.backend))
+            if listing is None:
+                rows = self.backend(self.folder, self._cancel)
+                listing = []
+            else:
+                rows = listing
+                key = None
+            batch = []
+            size = self.firstbatch
+            for row in rows:
+                if self._cancel.is_set():
+                    return
+                batch.append(row)
+                if len(batch) >= size:
+                    self.queue.put(batch)
+                    if key is not None:
+                        listing.extend(batch)
+                    batch = []
+                    size = self.batchsize
+            if self._cancel.is_set():
+                return
+            if batch:
+                self.queue.put(batch)
+                if key is not None:
+                    listing.extend(batch)
+            if key is not None:
+                self.cache.put(key, listing, self.folder, time() - t0)
+        except OSError as e:
+            self.queue.put(e)
+        self.queue.put(None)
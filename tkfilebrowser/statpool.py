@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Deadline-bounded file system calls
+
+On network mounts a stat() call can block for minutes when the server is
+unreachable. The calls are therefore made in a pool of worker threads and
+the caller only waits until the call deadline.
+"""
+
+
+from errno import ETIMEDOUT, ECANCELED
+from threading import Thread, Event, Lock, Condition
+from time import time
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
+class StatTimeout(OSError):
+    """
+    The file system call did not return before its deadline.
+
+    The call goes on in its worker, it is stored in the call attribute.
+    """
+    def __init__(self, path, call=None):
+        OSError.__init__(self, ETIMEDOUT, "Timed out while accessing", path)
+        self.call = call
+
+
+class StatCancelled(OSError):
+    """The file system call was cancelled before it started."""
+    def __init__(self, path):
+        OSError.__init__(self, ECANCELED, "Cancelled access", path)
+
+
+# protects the start and the cancellation of the calls
+_CALL_LOCK = Lock()
+
+
+class Call(object):
+    """File system call submitted to a :class:`StatPool`."""
+    __slots__ = ("func", "args", "key", "queue", "deadline", "result",
+                 "error", "cancelled", "_started", "_done")
+
+    def __init__(self, func, args, key, queue, deadline):
+        self.func = func
+        self.args = args
+        self.key = key
+        self.queue = queue
+        self.deadline = deadline
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._started = False
+        self._done = Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        """
+        Do not make the call if it has not started yet.
+
+        The call is then done with a :class:`StatCancelled` error. Return
+        whether it was cancelled.
+        """
+        with _CALL_LOCK:
+            if self._started or self._done.is_set():
+                return False
+            self.cancelled = True
+            self.error = StatCancelled(self.args[0] if self.args else None)
+        self._done.set()
+        return True
+
+    def _start(self):
+        """Return whether the call can be made, i.e. it was not cancelled."""
+        with _CALL_LOCK:
+            if self.cancelled:
+                return False
+            self._started = True
+            return True
+
+    def expired(self, now=None):
+        """Return whether the deadline passed without the call returning."""
+        if now is None:
+            now = time()
+        return now > self.deadline and not self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the call to return (at most until its deadline by default)
+        and return its result.
+
+        Raise :class:`StatTimeout` if it did not return in time, or the
+        exception raised by the call.
+        """
+        if timeout is None:
+            timeout = max(0, self.deadline - time())
+        if not self._done.wait(timeout):
+            raise StatTimeout(self.args[0] if self.args else None, self)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class StatPool(object):
+    """
+    Pool of worker threads making file system calls with a deadline.
+
+    The workers are started on demand, up to max_workers. A call that
+    blocks only holds its worker, the other calls go on.
+
+    A worker whose call is past its deadline is considered hung: it no
+    longer counts in max_workers and a new worker is started if calls are
+    waiting, so that a dead mount does not starve the pool. At most
+    max_hung workers are left behind this way, then the hung calls count
+    again in max_workers. A hung worker that eventually returns rejoins
+    the pool, or stops if the pool is full.
+    """
+    def __init__(self, max_workers=8, timeout=5.0, max_hung=32):
+        """
+        Create a pool.
+
+        Options:
+            * max_workers: maximum number of worker threads
+            * timeout: default deadline of the calls, in seconds
+            * max_hung: maximum number of hung worker threads replaced
+        """
+        self.max_workers = max_workers
+        self.max_hung = max_hung
+        self.timeout = timeout
+        self._tasks = Queue()
+        self._lock = Lock()
+        self._cond = Condition(self._lock)
+        self._nb_workers = 0
+        self._nb_idle = 0
+        self._running = {}  # worker token -> running call
+        self._hung = set()  # tokens of the hung workers
+        self._monitor = None
+
+    @property
+    def nb_workers(self):
+        """Number of workers, hung workers excluded."""
+        return self._nb_workers
+
+    @property
+    def nb_hung(self):
+        return len(self._hung)
+
+    def _start_worker(self):
+        # the lock must be held
+        self._nb_workers += 1
+        self._nb_idle += 1
+        worker = Thread(target=self._work, args=(object(),))
+        worker.daemon = True
+        worker.start()
+        if self._monitor is None:
+            self._monitor = Thread(target=self._watch_deadlines)
+            self._monitor.daemon = True
+            self._monitor.start()
+
+    def submit(self, func, *args, **kw):
+        """
+        Call func(*args) in a worker thread and return the :class:`Call`.
+
+        Keyword arguments:
+            * timeout: deadline of the call (default is self.timeout)
+            * queue: queue where the call is put once it returns
+            * key: any value identifying the call, stored in :attr:`Call.key`
+        """
+        timeout = kw.pop("timeout", None)
+        if timeout is None:
+            timeout = self.timeout
+        call = Call(func, args, kw.pop("key", None), kw.pop("queue", None),
+                    time() + timeout)
+        if kw:
+            raise TypeError("Unexpected keyword arguments %s" % ", ".join(kw))
+        with self._lock:
+            if self._nb_idle <= 0 and self._nb_workers < self.max_workers:
+                self._start_worker()
+            self._nb_idle -= 1
+        self._tasks.put(call)
+        return call
+
+    def call(self, func, *args, **kw):
+        """
+        Return func(*args), computed in a worker thread.
+
+        Raise :class:`StatTimeout` if the call does not return before the
+        deadline (keyword argument timeout, default is self.timeout).
+        """
+        return self.submit(func, *args, **kw).wait()
+
+    def _watch_deadlines(self):
+        """Replace the workers whose call is past its deadline."""
+        with self._cond:
+            while True:
+                now = time()
+                deadline = None
+                for token, call in self._running.items():
+                    if token in self._hung:
+                        continue
+                    if call.deadline >= now:
+                        if deadline is None or call.deadline < deadline:
+                            deadline = call.deadline
+                    elif len(self._hung) < self.max_hung:
+                        self._hung.add(token)
+                        self._nb_workers -= 1
+                        if self._nb_idle < 0 and self._nb_workers < self.max_workers:
+                            # calls are waiting
+                            self._start_worker()
+                self._cond.wait(None if deadline is None else deadline - now)
+
+    def _work(self, token):
+        while True:
+            call = self._tasks.get()
+            if call._start():
+                with self._cond:
+                    self._running[token] = call
+                    self._cond.notify()
+                try:
+                    call.result = call.func(*call.args)
+                except Exception as e:
+                    call.error = e
+                call._done.set()
+                if call.queue is not None:
+                    call.queue.put(call)
+            with self._lock:
+                self._running.pop(token, None)
+                if token in self._hung:
+                    self._hung.discard(token)
+                    if self._nb_workers >= self.max_workers:
+                        # replaced meanwhile
+                        return
+                    self._nb_workers += 1
+                self._nb_idle += 1
+
+
+# shared by all the FileBrowser instances
+STAT_POOL = StatPool()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+ttk styles of the dialogs
+
+The ttk style settings belong to the current theme of the interpreter, so
+the "*.tkfilebrowser.*" styles are registered once per interpreter and
+theme, and registered again only when the theme changes.
+"""
+
+
+from tkfilebrowser.constants import ttk
+from tkfilebrowser.registry import InterpreterRegistry
+
+
+_TREEITEM_LAYOUT = [('Treeitem.padding',
+                     {'children':
+                         [('Treeitem.image', {'side': 'left', 'sticky': ''}),
+                          ('Treeitem.focus',
+                           {'children':
+                               [('Treeitem.text',
+                                 {'side': 'left', 'sticky': ''})],
+                            'side': 'left',
+                            'sticky': ''})],
+                      'sticky': 'nswe'})]
+
+
+def _register(style):
+    """Configure the tkfilebrowser styles in the current theme and return its colors."""
+    bg = style.lookup("TFrame", "background")
+    style.layout("right.tkfilebrowser.Treeview.Item", _TREEITEM_LAYOUT)
+    style.layout("left.tkfilebrowser.Treeview.Item", _TREEITEM_LAYOUT)
+    style.configure("right.tkfilebrowser.Treeview", font="TkDefaultFont")
+    style.configure("right.tkfilebrowser.Treeview.Item", padding=2)
+    style.configure("right.tkfilebrowser.Treeview.Heading",
+                    font="TkDefaultFont")
+    style.configure("left.tkfilebrowser.Treeview.Heading",
+                    font="TkDefaultFont")
+    style.configure("left.tkfilebrowser.Treeview.Item", padding=2)
+    style.configure("listbox.tkfilebrowser.TFrame", background="white", relief="sunken")
+    colors = {"bg": bg,
+              "field_bg": style.lookup("TEntry", "fieldbackground", default='white'),
+              "tree_field_bg": style.lookup("ttk.Treeview", "fieldbackground",
+                                            default='white'),
+              "fg": style.lookup('TLabel', 'foreground', default='black'),
+              "active_bg": style.lookup('TButton', 'background', ('active',)),
+              "sel_bg": style.lookup('Treeview', 'background', ('selected',)),
+              "sel_fg": style.lookup('Treeview', 'foreground', ('selected',))}
+    style.map('types.tkfilebrowser.TCombobox', foreground=[], fieldbackground=[])
+    style.configure('types.tkfilebrowser.TCombobox', lightcolor=bg,
+                    fieldbackground=bg)
+    style.configure('types.tkfilebrowser.TCombobox.Item', background='red')
+    style.configure("left.tkfilebrowser.Treeview", background=colors["active_bg"],
+                    font="TkDefaultFont",
+                    fieldbackground=colors["active_bg"])
+    # path button style
+    style.configure("path.tkfilebrowser.TButton", padding=2)
+    selected_bg = style.lookup("TButton", "background", ("pressed",))
+    map_bg = style.map("TButton", "background")
+    map_bg.append(("selected", selected_bg))
+    style.map("path.tkfilebrowser.TButton",
+              background=map_bg,
+              font=[("selected", "TkDefaultFont 9 bold")])
+    # tooltip style
+    style.configure('tooltip.tkfilebrowser.TLabel', background='black',
+                    foreground='white')
+    return colors
+
+
+# Tk root -> [current theme, {theme: colors}]
+_REGISTRY = InterpreterRegistry(lambda root: [None, {}])
+
+
+def setup_styles(widget):
+    """
+    Register the tkfilebrowser styles in the interpreter of widget.
+
+    The styles are only configured the first time this function is called
+    for the current theme of the interpreter. Return the dictionary of the
+    theme colors used by the dialogs: "bg", "fg", "field_bg",
+    "tree_field_bg", "active_bg", "sel_bg" and "sel_fg".
+    """
+    root = widget._root()
+    style = ttk.Style(root)
+    theme = style.theme_use()
+    entry = _REGISTRY.get(root)
+    current, themes = entry
+    colors = themes.get(theme)
+    if colors is None:
+        colors = themes[theme] = _register(style)
+    if theme != current:
+        # the option database does not depend on the theme
+        root.option_add('*TCombobox*Listbox.selectBackground', colors["sel_bg"])
+        root.option_add('*TCombobox*Listbox.selectForeground', colors["sel_fg"])
+        entry[0] = theme
+    return colors
@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Treeview that only creates the items that are visible
+"""
+
+
+from tkfilebrowser.constants import tk, ttk
+
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    Flat Treeview keeping its items in a Python model.
+
+    Only the rows visible in the widget are created as Tk items, the
+    scrollbar is driven by the number of rows in the model. The methods
+    used to manipulate top-level items (insert, delete, move, detach, item,
+    set, selection, focus, see, ...) work on the model so the widget can be
+    used like a regular Treeview with a single level of items.
+    """
+    def __init__(self, master=None, stripes=None, **kw):
+        """
+        Create a VirtualTreeview.
+
+        Options:
+            * master: parent widget
+            * stripes: pair of tags alternated between consecutive rows,
+                       e.g. ("0", "1"), applied when the rows are displayed
+            * all ttk.Treeview options
+        """
+        self._yscrollcommand = kw.pop('yscrollcommand', None)
+        ttk.Treeview.__init__(self, master, **kw)
+        self._stripes = stripes
+        self._columns = self.tk.splitlist(ttk.Treeview.cget(self, 'columns'))
+        self._data = {}         # item -> insert options (text, tags, values, ...)
+        self._order = []        # attached items, in display order
+        self._positions = None  # item -> index in self._order, computed lazily
+        self._selection = []    # selected items
+        self._selected = set()
+        self._focus = ''
+        self._first = 0         # index of the first displayed row
+        self._shown = []        # items that currently exist in Tk
+        self._nb_rows = 40      # number of rows that fit in the widget
+        self._rowheight = 0
+        self._render_id = None
+        self._iid_count = 0
+
+        # bindings processed before the class ones
+        self._bindtag = 'VirtualTreeview%s' % id(self)
+        self.bindtags((self._bindtag,) + self.bindtags())
+        self.bind_class(self._bindtag, '<Configure>', self._on_configure)
+        self.bind_class(self._bindtag, '<<TreeviewSelect>>', self._on_select)
+        self.bind_class(self._bindtag, '<ButtonPress-1>', self._on_press)
+        self.bind_class(self._bindtag, '<MouseWheel>', self._on_mousewheel)
+        self.bind_class(self._bindtag, '<Button-4>',
+                        lambda e: self._scroll_event(-5))
+        self.bind_class(self._bindtag, '<Button-5>',
+                        lambda e: self._scroll_event(5))
+        self.bind_class(self._bindtag, '<Up>', lambda e: self._on_arrow(-1))
+        self.bind_class(self._bindtag, '<Down>', lambda e: self._on_arrow(1))
+        self.bind_class(self._bindtag, '<Prior>',
+                        lambda e: self._scroll_event(-self._nb_rows))
+        self.bind_class(self._bindtag, '<Next>',
+                        lambda e: self._scroll_event(self._nb_rows))
+
+    def destroy(self):
+        if self._render_id is not None:
+            self.after_cancel(self._render_id)
+            self._render_id = None
+        ttk.Treeview.destroy(self)
+
+    def configure(self, cnf=None, **kw):
+        if cnf and 'yscrollcommand' in cnf:
+            cnf = dict(cnf)
+            kw['yscrollcommand'] = cnf.pop('yscrollcommand')
+        if 'yscrollcommand' in kw:
+            self._yscrollcommand = kw.pop('yscrollcommand')
+            self._update_scrollbar()
+            if not kw and not cnf:
+                return
+        if 'columns' in kw:
+            self._columns = tuple(kw['columns'])
+        return ttk.Treeview.configure(self, cnf, **kw)
+
+    config = configure
+
+    # ---  model
+    @staticmethod
+    def _flatten(items):
+        """Accept both f(a, b) and f((a, b)) like ttk.Treeview."""
+        if len(items) == 1 and isinstance(items[0], (tuple, list)):
+            return tuple(items[0])
+        return items
+
+    def _get_positions(self):
+        if self._positions is None:
+            self._positions = {item: i for i, item in enumerate(self._order)}
+        return self._positions
+
+    def _order_changed(self):
+        self._positions = None
+        self._schedule_render()
+
+    def _check(self, item):
+        if item not in self._data:
+            raise tk.TclError('Item %s not found' % item)
+
+    def insert(self, parent, index, iid=None, **kw):
+        """Insert a new top-level item and return its identifier."""
+        if parent:
+            raise tk.TclError('VirtualTreeview items cannot have children')
+        if iid is None:
+            self._iid_count += 1
+            iid = 'I%03X' % self._iid_count
+            while iid in self._data:
+                self._iid_count += 1
+                iid = 'I%03X' % self._iid_count
+        elif iid in self._data:
+            raise tk.TclError('Item %s already exists' % iid)
+        if 'tags' in kw:
+            kw['tags'] = self._tags_tuple(kw['tags'])
+        self._data[iid] = kw
+        if index == 'end':
+            self._order.append(iid)
+            if self._positions is not None:
+                self._positions[iid] = len(self._order) - 1
+            self._schedule_render()
+        else:
+            self._order.insert(int(index), iid)
+            self._order_changed()
+        return iid
+
+    def insert_rows(self, rows):
+        """Insert rows, (iid, text, tags, values) tuples, at the end."""
+        data = self._data
+        order = self._order
+        for iid, text, tags, values in rows:
+            if iid in data:
+                raise tk.TclError('Item %s already exists' % iid)
+            data[iid] = {'text': text, 'tags': self._tags_tuple(tags),
+                         'values': values}
+            order.append(iid)
+        self._order_changed()
+
+    def delete(self, *items):
+        """Delete items and their data."""
+        items = self._flatten(items)
+        if not items:
+            return
+        dead = set(items)
+        for item in items:
+            self._check(item)
+        for item in items:
+            del self._data[item]
+        gone = [i for i in self._shown if i in dead]
+        if gone:
+            ttk.Treeview.delete(self, *gone)
+            self._shown = [i for i in self._shown if i not in dead]
+        self._order = [i for i in self._order if i not in dead]
+        if self._selected & dead:
+            self._selection = [i for i in self._selection if i not in dead]
+            self._selected.difference_update(dead)
+        if self._focus in dead:
+            self._focus = ''
+        self._order_changed()
+
+    def detach(self, *items):
+        """Remove items from the display without deleting them."""
+        items = self._flatten(items)
+        if not items:
+            return
+        detached = set(items)
+        for item in items:
+            self._check(item)
+        self._order = [i for i in self._order if i not in detached]
+        self._order_changed()
+
+    def move(self, item, parent, index):
+        """Move (or reattach) item to index."""
+        self._check(item)
+        if parent:
+            raise tk.TclError('VirtualTreeview items cannot have children')
+        positions = self._get_positions()
+        if item in positions:
+            del self._order[positions[item]]
+        if index == 'end':
+            self._order.append(item)
+        else:
+            self._order.insert(int(index), item)
+        self._order_changed()
+
+    reattach = move
+
+    def set_children(self, item, *newchildren):
+        """Replace the displayed items by newchildren, in this order."""
+        if item:
+            raise tk.TclError('VirtualTreeview items cannot have children')
+        newchildren = self._flatten(newchildren)
+        for child in newchildren:
+            self._check(child)
+        self._order = list(newchildren)
+        self._order_changed()
+
+    def get_children(self, item=None):
+        """Return the displayed items, in display order."""
+        if item:
+            return ()
+        return tuple(self._order)
+
+    def exists(self, item):
+        return item in self._data
+
+    def index(self, item):
+        self._check(item)
+        return self._get_positions().get(item, 0)
+
+    def tag_has(self, tagname, item=None):
+        """Return the displayed items having tagname (or whether item has it)."""
+        if item is not None:
+            self._check(item)
+            return tagname in self._data[item].get('tags', ())
+        data = self._data
+        return tuple(i for i in self._order if tagname in data[i].get('tags', ()))
+
+    @staticmethod
+    def _tags_tuple(tags):
+        if isinstance(tags, str):
+            return (tags,)
+        return tuple(str(t) for t in tags)
+
+    def item(self, item, option=None, **kw):
+        """Query or modify the options of item."""
+        if isinstance(item, tuple) and len(item) == 1:
+            item = item[0]
+        self._check(item)
+        data = self._data[item]
+        if option is not None:
+            if option == 'tags':
+                return data.get('tags', ())
+            elif option == 'values':
+                return tuple(data.get('values', ()))
+            return data.get(option, '')
+        if not kw:
+            res = {'text': '', 'image': '', 'values': '', 'open': 0, 'tags': ''}
+            res.update(data)
+            return res
+        if 'tags' in kw:
+            kw['tags'] = self._tags_tuple(kw['tags'])
+        data.update(kw)
+        if item in self._shown:
+            if 'tags' in kw:
+                index = self._first + self._shown.index(item)
+                kw['tags'] = self._stripe(kw['tags'], index)
+            ttk.Treeview.item(self, item, **kw)
+
+    def set(self, item, column=None, value=None):
+        """Query or set the value of item in given column."""
+        self._check(item)
+        values = list(self._data[item].get('values', ()))
+        values += [''] * (len(self._columns) - len(values))
+        if column is None:
+            return dict(zip(self._columns, values))
+        i = self._columns.index(column)
+        if value is None:
+            return values[i]
+        values[i] = value
+        self.item(item, values=values)
+
+    # ---  selection and focus
+    def selection(self, *args):
+        """Return the selected items."""
+        if args:
+            # old style selection(selop, items)
+            selop, items = args[0], args[1:]
+            return getattr(self, 'selection_' + selop)(*items)
+        return tuple(self._selection)
+
+    def _set_selection(self, items):
+        selection = []
+        selected = set()
+        for item in items:
+            self._check(item)
+            if item not in selected:
+                selected.add(item)
+                selection.append(item)
+        if selection == self._selection:
+            return
+        self._selection = selection
+        self._selected = selected
+        if not self._apply_selection():
+            self.event_generate('<<TreeviewSelect>>', when='tail')
+
+    def selection_set(self, *items):
+        self._set_selection(self._flatten(items))
+
+    def selection_add(self, *items):
+        self._set_selection(self._selection + list(self._flatten(items)))
+
+    def selection_remove(self, *items):
+        removed = set(self._flatten(items))
+        self._set_selection([i for i in self._selection if i not in removed])
+
+    def selection_toggle(self, *items):
+        items = self._flatten(items)
+        toggled = set(items)
+        selection = [i for i in self._selection if i not in toggled]
+        selection.extend(i for i in items if i not in self._selected)
+        self._set_selection(selection)
+
+    def _apply_selection(self):
+        """
+        Reflect the selection of the model on the displayed items.
+
+        Return True if the Tk selection changed.
+        """
+        wanted = [i for i in self._shown if i in self._selected]
+        current = self.tk.splitlist(self.tk.call(self._w, 'selection'))
+        if set(current) != set(wanted):
+            self.tk.call(self._w, 'selection', 'set', wanted)
+            return True
+        return False
+
+    def _on_select(self, event):
+        """Report the changes of the Tk selection in the model."""
+        current = self.tk.splitlist(self.tk.call(self._w, 'selection'))
+        selected = set(current)
+        shown = set(self._shown)
+        selection = [i for i in self._selection
+                     if i not in shown or i in selected]
+        selection.extend(i for i in current if i not in self._selected)
+        self._selection = selection
+        self._selected = set(selection)
+
+    def _on_press(self, event):
+        """Forget hidden selected items on click without modifier."""
+        if not event.state & 0x0005:  # neither Shift nor Control
+            shown = set(self._shown)
+            self._selection = [i for i in self._selection if i in shown]
+            self._selected = set(self._selection)
+
+    def focus(self, item=None):
+        """Return or set the focus item."""
+        if item is None:
+            focus = self.tk.call(self._w, 'focus')
+            if focus:
+                return str(focus)
+            return self._focus
+        self._check(item)
+        self._focus = item
+        if item in self._shown:
+            ttk.Treeview.focus(self, item)
+
+    # ---  scrolling
+    def see(self, item):
+        """Scroll so that item is visible (it is reattached if detached)."""
+        self._check(item)
+        positions = self._get_positions()
+        if item not in positions:
+            self._order.append(item)
+            self._order_changed()
+            positions = self._get_positions()
+        index = positions[item]
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + self._nb_rows:
+            self._first = index - self._nb_rows + 1
+        self._render()
+
+    def yview(self, *args):
+        """Query or change the vertical position of the view."""
+        if not args:
+            return self._fractions()
+        if args[0] == 'moveto':
+            self._first = int(float(args[1]) * len(self._order))
+        elif args[0] == 'scroll':
+            nb, what = int(args[1]), args[2]
+            if what == 'pages':
+                nb *= self._nb_rows
+            self._first += nb
+        self._render()
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def _scroll_event(self, nb):
+        self.yview('scroll', nb, 'units')
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        delta = event.delta
+        if abs(delta) >= 120:
+            delta //= 120
+        return self._scroll_event(-delta)
+
+    def _on_arrow(self, delta):
+        """Display the next row when the keyboard focus reaches an edge."""
+        focus = self.tk.call(self._w, 'focus')
+        if not self._shown or not focus:
+            return
+        focus = str(focus)
+        if delta < 0 and focus == self._shown[0] and self._first > 0:
+            self._first -= 1
+            self._render()
+        elif delta > 0 and focus == self._shown[-1] \
+                and self._first + len(self._shown) < len(self._order):
+            self._first += 1
+            self._render()
+
+    def visible_items(self):
+        """Return the items that are currently displayed."""
+        return list(self._shown)
+
+    def _fractions(self):
+        nb = len(self._order)
+        if not nb:
+            return 0.0, 1.0
+        return self._first / float(nb), (self._first + len(self._shown)) / float(nb)
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(*self._fractions())
+
+    # ---  rendering
+    def _stripe(self, tags, index):
+        """Return tags with the stripe tag corresponding to the row index."""
+        if not self._stripes:
+            return tags
+        return tuple(t for t in tags if t not in self._stripes) + (self._stripes[index % 2],)
+
+    def _schedule_render(self):
+        if self._render_id is None:
+            self._render_id = self.after_idle(self._render)
+
+    def _render(self):
+        """Create the Tk items of the rows that are in the view."""
+        if self._render_id is not None:
+            self.after_cancel(self._render_id)
+            self._render_id = None
+        nb = len(self._order)
+        self._first = max(0, min(self._first, nb - self._nb_rows))
+        wanted = self._order[self._first:self._first + self._nb_rows]
+        shown = self._shown
+        if wanted != shown:
+            focus = self.tk.call(self._w, 'focus')
+            if focus:
+                self._focus = str(focus)
+            keep = set(wanted)
+            old = [i for i in shown if i not in keep]
+            if old:
+                ttk.Treeview.delete(self, *old)
+            existing = set(shown)
+            for index, item in enumerate(wanted):
+                kw = dict(self._data[item])
+                if self._stripes:
+                    kw['tags'] = self._stripe(kw.get('tags', ()), self._first + index)
+                if item in existing:
+                    ttk.Treeview.move(self, item, '', index)
+                    if self._stripes:
+                        ttk.Treeview.item(self, item, tags=kw['tags'])
+                else:
+                    ttk.Treeview.insert(self, '', index, item, **kw)
+            self._shown = wanted
+            if self._focus in keep:
+                ttk.Treeview.focus(self, self._focus)
+            self._apply_selection()
+            self._measure()
+        self._update_scrollbar()
+
+    def _measure(self):
+        """Update the number of rows that fit in the widget."""
+        if not self._shown:
+            return
+        bbox = ttk.Treeview.bbox(self, self._shown[0])
+        if not bbox:
+            return
+        x, y, w, h = bbox
+        self._rowheight = h
+        nb_rows = max(1, (self.winfo_height() - y) // h)
+        if nb_rows != self._nb_rows:
+            self._nb_rows = nb_rows
+            self._schedule_render()
+
+    def _on_configure(self, event):
+        self.after_idle(self._measure)
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+tkfilebrowser - Alternative to filedialog for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkfilebrowser is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkfilebrowser is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Folder watchers
+
+A watcher reports the names of the items of a folder that changed since
+the last call to :meth:`changes` so that only the corresponding rows are
+updated. :class:`InotifyWatcher` is notified by the Linux kernel,
+:class:`PollingWatcher` works everywhere by polling the folder.
+"""
+
+
+import os
+import struct
+from errno import EAGAIN, EINTR
+from threading import Thread, Lock, Event
+from time import time
+from tkfilebrowser.cache import folder_key
+try:
+    import ctypes
+    import ctypes.util
+except ImportError:
+    ctypes = None
+try:
+    from os import fsencode, fsdecode
+except ImportError:
+    # python 2
+    def fsencode(path):
+        return path if isinstance(path, bytes) else path.encode("utf-8")
+
+    def fsdecode(name):
+        return name
+
+
+# inotify constants, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+IN_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO \
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+_libc = None
+
+
+def _get_libc():
+    """Return the C library with the inotify functions, or None."""
+    global _libc
+    if _libc is None:
+        _libc = False
+        if ctypes is None:
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                               use_errno=True)
+            init = libc.inotify_init1
+            add = libc.inotify_add_watch
+            rm = libc.inotify_rm_watch
+        except (OSError, AttributeError):
+            return None
+        init.argtypes = [ctypes.c_int]
+        init.restype = ctypes.c_int
+        add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        add.restype = ctypes.c_int
+        rm.argtypes = [ctypes.c_int, ctypes.c_int]
+        rm.restype = ctypes.c_int
+        _libc = libc
+    return _libc or None
+
+
+def inotify_available():
+    return _get_libc() is not None
+
+
+class WatcherError(OSError):
+    """The folder cannot be watched."""
+    pass
+
+
+class InotifyWatcher(object):
+    """
+    Watch a folder with Linux inotify.
+
+    The events are read without blocking, from the GUI thread, by
+    :meth:`changes`.
+    """
+    interval = 0.25
+
+    def __init__(self):
+        libc = _get_libc()
+        if libc is None:
+            raise WatcherError("inotify is not available")
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise WatcherError(errno, os.strerror(errno))
+        self._wd = -1
+        self.folder = None
+        # watch() and unwatch() are called from a worker thread while
+        # changes() is called from the GUI thread
+        self._lock = Lock()
+
+    def watch(self, folder):
+        """Watch folder instead of the previously watched one."""
+        # not locked: on a slow file system the call blocks
+        wd = self._libc.inotify_add_watch(self._fd, fsencode(folder), IN_MASK)
+        if wd < 0:
+            # e.g. ENOSPC when the limit of watches is reached
+            errno = ctypes.get_errno()
+            self.unwatch()
+            raise WatcherError(errno, os.strerror(errno), folder)
+        with self._lock:
+            old = self._wd
+            self._wd = wd
+            self.folder = folder
+        if old >= 0 and old != wd:
+            # the same folder keeps its watch descriptor
+            self._libc.inotify_rm_watch(self._fd, old)
+
+    def unwatch(self):
+        with self._lock:
+            wd = self._wd
+            self._wd = -1
+            self.folder = None
+        if wd >= 0:
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def close(self):
+        if self._fd >= 0:
+            self.unwatch()
+            with self._lock:
+                os.close(self._fd)
+                self._fd = -1
+
+    def _read(self):
+        """Return the pending events as a list of (wd, mask, name)."""
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno == EINTR:
+                    continue
+                if e.errno == EAGAIN:
+                    break
+                raise
+            if not data:
+                break
+            i = 0
+            while i < len(data):
+                wd, mask, cookie, length = _EVENT.unpack_from(data, i)
+                i += _EVENT.size
+                name = data[i:i + length].rstrip(b"\0")
+                i += length
+                events.append((wd, mask, fsdecode(name)))
+        return events
+
+    def changes(self):
+        """
+        Return (names, reset) where names is the set of the names of the
+        items that were created, deleted, renamed or modified since the last
+        call and reset is True if the whole folder has to be listed again
+        (events lost or watched folder deleted or moved).
+        """
+        names = set()
+        reset = False
+        with self._lock:
+            if self._fd < 0:
+                return names, reset
+            current = self._wd
+            events = self._read()
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                reset = True
+            elif wd != current:
+                continue
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                reset = True
+            elif name:
+                names.add(name)
+        return names, reset
+
+
+class PollingWatcher(object):
+    """
+    Watch a folder by polling it, where inotify is not available or not
+    reliable (network and FUSE file systems, watch limit reached, ...).
+
+    The folder is stat'ed in a background thread and only listed again when
+    its (st_dev, st_ino, st_mtime_ns) key changes. The new listing is then
+    compared, by :meth:`changes`, with the names returned by known() to find
+    the items that were created, deleted or renamed. Changing the content of
+    a file does not change the key of the folder and is not reported.
+
+    The polling interval grows while the folder does not change and with
+    the time taken to list it, so that large or idle folders are polled
+    less often.
+    """
+    def __init__(self, known, min_interval=0.5, max_interval=10.):
+        """
+        Create a polling watcher.
+
+        Arguments:
+            * known: function returning the set of the names of the items
+                     that are displayed, called from :meth:`changes`
+            * min_interval, max_interval: bounds of the polling interval, in seconds
+        """
+        self.known = known
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.folder = None
+        self._key = None
+        self._listing = None  # names in the folder if its key changed
+        self._reset = False
+        self._idle = 0        # number of polls since the last change
+        self._cost = 0.       # duration of the last listing
+        self._lock = Lock()
+        self._wake = Event()
+        self._closed = False
+        self._thread = None
+
+    def watch(self, folder):
+        """Watch folder instead of the previously watched one."""
+        try:
+            key = folder_key(folder)
+        except OSError as e:
+            raise WatcherError(e.errno, e.strerror, folder)
+        with self._lock:
+            self.folder = folder
+            self._key = key
+            self._listing = None
+            self._reset = False
+            self._idle = 0
+            self._cost = 0.
+            self.interval = self.min_interval
+        if self._thread is None:
+            self._thread = Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def unwatch(self):
+        with self._lock:
+            self.folder = None
+            self._key = None
+            self._listing = None
+            self._reset = False
+
+    def close(self):
+        self.unwatch()
+        self._closed = True
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            if self._closed:
+                return
+            self.poll()
+
+    def poll(self):
+        """Check the watched folder once and list it again if its key changed."""
+        with self._lock:
+            folder, key = self.folder, self._key
+        if folder is None:
+            return
+        t0 = time()
+        listing = None
+        reset = False
+        try:
+            new_key = folder_key(folder)
+            if new_key != key:
+                listing = set(os.listdir(folder))
+        except OSError:
+            # folder deleted or no longer accessible
+            reset = True
+        with self._lock:
+            if folder != self.folder or key != self._key:
+                # watch() was called in the meantime
+                return
+            if reset:
+                self._reset = True
+                self._idle += 1
+            elif listing is None:
+                self._idle += 1
+            else:
+                self._key = new_key
+                self._listing = listing
+                self._idle = 0
+                self._cost = time() - t0
+            self.interval = min(self.max_interval,
+                                max(self.min_interval * 1.5 ** min(self._idle, 10),
+                                    20 * self._cost))
+
+    def changes(self):
+        """
+        Return (names, reset) where names is the set of the names of the
+        items that were created, deleted or renamed since the last call and
+        reset is True if the whole folder has to be listed again (watched
+        folder deleted or no longer accessible).
+        """
+        with self._lock:
+            listing, reset = self._listing, self._reset
+            self._listing = None
+            self._reset = False
+        if listing is None:
+            return set(), reset
+        return listing.symmetric_difference(self.known()), reset